@@ -3,6 +3,8 @@ import sys
 from .container import Container
 from .series import Series
 from .style_frame import StyleFrame
+from .sheet_writer import SheetWriter
+from .workbook_builder import WorkbookBuilder
 from .styler import Styler
 from .command_line.commandline import CommandLineInterface
 from .version import _version_, _versions_, _openpyxl_version_, _pandas_version_, _python_version_
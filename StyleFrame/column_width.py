@@ -0,0 +1,401 @@
+# coding:utf-8
+import math
+import sys
+
+import numpy as np
+import pandas as pd
+
+from collections import namedtuple
+
+PY2 = sys.version_info[0] == 2
+
+# Python 2
+if PY2:
+    # noinspection PyUnresolvedReferences
+    from style_matrix import infer_dtype
+    # noinspection PyUnresolvedReferences
+    from styler import Styler
+# Python 3
+else:
+    from StyleFrame.style_matrix import infer_dtype
+    from StyleFrame.styler import Styler
+
+str_type = basestring if PY2 else str
+unicode_type = unicode if PY2 else str
+
+try:
+    SparseDtype = pd.SparseDtype
+except AttributeError:
+    # older pandas versions
+    SparseDtype = None
+
+# values of these inferred types format the same if they are equal, so only the distinct values are formatted
+DEDUPLICATED_INFERRED_TYPES = frozenset(('string', 'unicode', 'bytes', 'date', 'time'))
+
+# floats are formatted without an exponent below this magnitude, so integral floats are formatted as ints with '.0'
+MAX_POSITIONAL_FLOAT = 1e16
+
+NANOSECONDS_PER_DAY = 24 * 60 * 60 * 10 ** 9
+# the remainders that decide the precision pandas formats datetime64 values with, from the finest to the coarsest
+DATETIME_PRECISIONS = (1000, 10 ** 6, 10 ** 9, NANOSECONDS_PER_DAY)
+
+
+def _get_ints_max_length(values):
+    """The longest int is either the smallest or the largest one"""
+
+    return max(len(unicode_type(values.min())), len(unicode_type(values.max())))
+
+
+def _get_bools_max_length(values):
+    return len('False') if not np.all(values) else len('True')
+
+
+def _get_floats_max_length(values):
+    lengths = [0]
+    finite = np.isfinite(values)
+    if not finite.all():
+        lengths.append(len('nan') if np.isnan(values).any() else 0)
+        lengths.append(len('-inf') if (values == -np.inf).any() else len('inf'))
+        values = values[finite]
+    if values.size:
+        if (np.abs(values) < MAX_POSITIONAL_FLOAT).all() and (values == np.round(values)).all():
+            lengths.append(_get_ints_max_length(values.astype(np.int64)) + len('.0'))
+            if np.signbit(values[values == 0]).any():
+                lengths.append(len('-0.0'))
+        else:
+            # numpy formats floats as python does, without creating a float object for every value
+            lengths.append(np.char.str_len(pd.unique(values).astype(unicode_type)).max())
+    return int(max(lengths))
+
+
+def _get_finest_position(nanoseconds, positions):
+    """Returns the position of the first datetime that needs the finest precision
+
+    :param numpy.ndarray nanoseconds: The datetimes as nanoseconds since the epoch
+    :param numpy.ndarray positions: The positions of the datetimes that are not NaT
+    :rtype: int
+    """
+
+    for precision in DATETIME_PRECISIONS:
+        finer_positions = np.flatnonzero(nanoseconds[positions] % precision)
+        if len(finer_positions):
+            return positions[finer_positions[0]]
+    return positions[0]
+
+
+def _get_datetimes_max_length(series):
+    """pandas formats all the datetime64 values of a column with the finest precision any of them needs, and
+    without times if none of them has one, so only the value that needs the finest precision is formatted
+    """
+
+    # the precision is decided by the local times
+    local_series = series.dt.tz_localize(None) if getattr(series.dtype, 'tz', None) is not None else series
+    nanoseconds = local_series.values.view(np.int64)
+    positions = np.flatnonzero(series.notnull().values)
+    lengths = [len('NaT') if len(positions) < len(series) else 0]
+    if len(positions):
+        position = _get_finest_position(nanoseconds, positions)
+        lengths.append(len(series.iloc[position:position + 1].astype(unicode_type).iloc[0]))
+    return max(lengths)
+
+
+def _get_datetime_objects_max_length(values):
+    """Timestamp and datetime objects are formatted with the precision each of them needs, so the longest one is
+    the one that needs the finest precision. Returns None if the values can't be converted to datetime64.
+    """
+
+    try:
+        datetimes = pd.DatetimeIndex(values)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    positions = np.flatnonzero(datetimes.notnull())
+    lengths = [len('NaT') if len(positions) < len(datetimes) else 0]
+    if len(positions):
+        lengths.append(len(unicode_type(values[_get_finest_position(datetimes.asi8, positions)])))
+    return max(lengths)
+
+
+def _get_objects_max_length(values):
+    try:
+        inferred_type = infer_dtype(values, skipna=False)
+    except TypeError:
+        # older pandas versions
+        inferred_type = infer_dtype(values)
+    if inferred_type == 'integer':
+        return _get_ints_max_length(values)
+    if inferred_type == 'boolean':
+        return _get_bools_max_length(values.astype(bool))
+    if inferred_type == 'floating':
+        floats = np.array(values.tolist())
+        if floats.dtype.kind == 'f':
+            return _get_floats_max_length(floats)
+    elif inferred_type == 'datetime':
+        length = _get_datetime_objects_max_length(values)
+        if length is not None:
+            return length
+        values = pd.unique(values)
+    elif inferred_type in DEDUPLICATED_INFERRED_TYPES:
+        values = pd.unique(values)
+        if inferred_type in ('string', 'unicode'):
+            return max(len(value) for value in values)
+    return max(len(unicode_type(value)) for value in values)
+
+
+def get_max_length(series):
+    """Returns the length of the longest value of the series as series.astype(str) formats it.
+    The length is computed from the values array by the rules pandas and python format each dtype with, so only
+    a few representative values are formatted: the smallest and largest ints, the datetime with the finest
+    precision and the distinct strings and floats.
+
+    :param pandas.Series series: Raw (non-Container) values
+    :rtype: int
+    """
+
+    if series.empty:
+        return 0
+    dtype = series.dtype
+    if SparseDtype is not None and isinstance(dtype, SparseDtype):
+        # sparse values are formatted as their dense values are
+        return get_max_length(series.sparse.to_dense())
+    kind = getattr(dtype, 'kind', None)
+    if isinstance(dtype, np.dtype):
+        values = series.values
+        if kind == 'b':
+            return _get_bools_max_length(values)
+        if kind in 'iu':
+            return _get_ints_max_length(values)
+        if kind == 'f':
+            return _get_floats_max_length(values)
+        if kind == 'O':
+            return _get_objects_max_length(values)
+    if kind == 'M':
+        return _get_datetimes_max_length(series)
+    # timedelta, categorical and other extension dtypes are formatted by their distinct values
+    return int(series.drop_duplicates().astype(unicode_type).str.len().max())
+
+
+# The advance widths of the characters ' ' to '~', in 1/1000 of the font size, (regular, bold) for every font.
+# Arial, Times New Roman and Courier New have the metrics of Helvetica, Times and Courier, Calibri's are approximate.
+GLYPH_WIDTHS = {
+    'arial': (
+        (278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+         556, 556, 556, 556, 556, 556, 556, 556, 556, 556,
+         278, 278, 584, 584, 584, 556, 1015,
+         667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833,
+         722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611,
+         278, 278, 278, 469, 556, 333,
+         556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833,
+         556, 556, 556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500,
+         334, 260, 334, 584),
+        (278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+         556, 556, 556, 556, 556, 556, 556, 556, 556, 556,
+         333, 333, 584, 584, 584, 611, 975,
+         722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833,
+         722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611,
+         333, 278, 333, 584, 556, 333,
+         556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889,
+         611, 611, 611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500,
+         389, 280, 389, 584)),
+    'calibri': (
+        (226, 326, 401, 498, 507, 715, 682, 221, 303, 303, 498, 498, 250, 306, 252, 386,
+         507, 507, 507, 507, 507, 507, 507, 507, 507, 507,
+         268, 268, 498, 498, 498, 463, 894,
+         579, 544, 533, 615, 488, 459, 631, 623, 252, 319, 520, 420, 855,
+         646, 662, 517, 673, 543, 459, 487, 642, 567, 890, 519, 487, 468,
+         307, 386, 307, 498, 498, 291,
+         479, 525, 423, 525, 498, 305, 471, 525, 230, 239, 455, 230, 799,
+         525, 527, 525, 525, 349, 391, 335, 525, 452, 715, 433, 453, 395,
+         314, 460, 314, 498),
+        (226, 326, 438, 498, 507, 729, 705, 233, 312, 312, 498, 498, 258, 306, 267, 430,
+         507, 507, 507, 507, 507, 507, 507, 507, 507, 507,
+         276, 276, 498, 498, 498, 463, 898,
+         606, 561, 529, 630, 488, 459, 637, 631, 267, 331, 547, 423, 874,
+         659, 676, 532, 686, 563, 473, 495, 653, 591, 906, 551, 520, 478,
+         325, 430, 325, 498, 498, 300,
+         494, 537, 418, 537, 503, 316, 474, 537, 246, 255, 480, 246, 813,
+         537, 538, 537, 537, 355, 399, 347, 537, 473, 745, 459, 474, 397,
+         331, 460, 331, 498)),
+    'times new roman': (
+        (250, 333, 408, 500, 500, 833, 778, 180, 333, 333, 500, 564, 250, 333, 250, 278,
+         500, 500, 500, 500, 500, 500, 500, 500, 500, 500,
+         278, 278, 564, 564, 564, 444, 921,
+         722, 667, 667, 722, 611, 556, 722, 722, 333, 389, 722, 611, 889,
+         722, 722, 556, 722, 667, 556, 611, 722, 722, 944, 722, 722, 611,
+         333, 278, 333, 469, 500, 333,
+         444, 500, 444, 500, 444, 333, 500, 500, 278, 278, 500, 278, 778,
+         500, 500, 500, 500, 333, 389, 278, 500, 500, 722, 500, 500, 444,
+         480, 200, 480, 541),
+        (250, 333, 555, 500, 500, 1000, 833, 278, 333, 333, 500, 570, 250, 333, 250, 278,
+         500, 500, 500, 500, 500, 500, 500, 500, 500, 500,
+         333, 333, 570, 570, 570, 500, 930,
+         722, 667, 722, 722, 667, 611, 778, 778, 389, 500, 778, 667, 944,
+         722, 778, 611, 778, 722, 556, 667, 722, 722, 1000, 722, 722, 667,
+         333, 278, 333, 581, 500, 333,
+         500, 556, 444, 556, 444, 333, 500, 556, 278, 333, 556, 278, 833,
+         556, 500, 556, 556, 444, 389, 333, 556, 500, 722, 500, 500, 444,
+         394, 220, 394, 520)),
+    'courier new': ((600,) * 95, (600,) * 95),
+}
+
+# fonts with the same metrics as one of the fonts in GLYPH_WIDTHS
+FONT_ALIASES = {'helvetica': 'arial', 'liberation sans': 'arial', 'arimo': 'arial', 'carlito': 'calibri',
+                'times': 'times new roman', 'liberation serif': 'times new roman', 'tinos': 'times new roman',
+                'courier': 'courier new', 'liberation mono': 'courier new', 'cousine': 'courier new'}
+
+# the metrics of fonts that are not in GLYPH_WIDTHS, StyleFrame's default font
+DEFAULT_METRICS_FONT = 'arial'
+
+FIRST_GLYPH = ord(' ')
+
+# east asian characters, which are as wide as the font size
+WIDE_GLYPH_WIDTH = 1000
+WIDE_CODE_POINT_RANGES = ((0x1100, 0x1160), (0x2E80, 0xA4D0), (0xAC00, 0xD7A4), (0xF900, 0xFB00), (0xFE30, 0xFE50),
+                          (0xFF00, 0xFF61), (0xFFE0, 0xFFE7), (0x20000, 0x3FFFE))
+
+# Excel measures columns width in the width of the digits of the workbook's default font (Calibri 11 in openpyxl),
+# which is 7 pixels, and adds 5 pixels of padding to every column
+MAX_DIGIT_WIDTH_PIXELS = 7
+CELL_PADDING_PIXELS = 5
+PIXELS_PER_POINT = 96 / 72.0
+
+# the font size Excel uses for fonts without a size
+DEFAULT_FONT_SIZE = 11
+
+# the number of characters the text widths are computed for at a time
+TEXT_CHUNK_SIZE = 1 << 22
+
+# inferred types of object columns whose values are measured as digits rather than as text
+NON_TEXT_INFERRED_TYPES = frozenset(('empty', 'integer', 'floating', 'mixed-integer-float', 'decimal', 'complex',
+                                     'boolean', 'datetime64', 'datetime', 'date', 'time', 'timedelta64', 'timedelta',
+                                     'period'))
+
+GlyphWidths = namedtuple('GlyphWidths', ('ascii', 'other', 'wide', 'digit'))
+
+_glyph_widths_cache = {}
+
+
+def get_font(style):
+    """Returns the (font name, font size, bold) a cell is written with
+
+    :param style: Styler or openpyxl style object
+    :rtype: tuple
+    """
+
+    font = getattr(style, 'font', None)
+    if isinstance(font, str_type):
+        return font, style.font_size, style.bold
+    if hasattr(font, 'name'):
+        return font.name, font.sz, font.b
+    default_style = Styler()
+    return default_style.font, default_style.font_size, default_style.bold
+
+
+def get_glyph_widths(font, size, bold):
+    """Returns the widths in pixels of the characters of a font, cached per (font, size, bold)
+
+    :param str font: Font name. Fonts without known metrics are measured as DEFAULT_METRICS_FONT
+    :param None|float size: Font size in points
+    :param bool bold:
+    :rtype: GlyphWidths
+    """
+
+    key = (font, size, bold)
+    try:
+        return _glyph_widths_cache[key]
+    except KeyError:
+        pass
+    font_name = (font or '').lower()
+    font_name = FONT_ALIASES.get(font_name, font_name)
+    regular_widths, bold_widths = GLYPH_WIDTHS.get(font_name, GLYPH_WIDTHS[DEFAULT_METRICS_FONT])
+    scale = (size or DEFAULT_FONT_SIZE) * PIXELS_PER_POINT / 1000.0
+    ascii_widths = np.zeros(128)
+    ascii_widths[FIRST_GLYPH:FIRST_GLYPH + len(regular_widths)] = np.array(bold_widths if bold else regular_widths) * scale
+    glyph_widths = _glyph_widths_cache[key] = GlyphWidths(
+        ascii=ascii_widths,
+        # other characters are measured as the average lowercase letter
+        other=ascii_widths[ord('a'):ord('z') + 1].mean(),
+        wide=WIDE_GLYPH_WIDTH * scale,
+        digit=ascii_widths[ord('0'):ord('9') + 1].max())
+    return glyph_widths
+
+
+def get_text_widths(strings, glyph_widths):
+    """Returns the widths in pixels of the strings, computed for many strings at a time from arrays of their
+    characters' code points
+
+    :param list|numpy.ndarray strings:
+    :param GlyphWidths glyph_widths:
+    :rtype: numpy.ndarray
+    """
+
+    lengths = np.array([len(string) for string in strings], dtype=np.int64)
+    # the strings are measured from the shortest to the longest, so the strings of a chunk are padded to similar lengths
+    order = np.argsort(lengths, kind='mergesort')
+    sorted_lengths = lengths[order]
+    widths = np.zeros(len(strings))
+    start = 0
+    while start < len(order):
+        stop = min(len(order), start + max(1, TEXT_CHUNK_SIZE // max(1, sorted_lengths[start])))
+        while stop - start > 1 and (stop - start) * sorted_lengths[stop - 1] > TEXT_CHUNK_SIZE:
+            stop = start + max(1, TEXT_CHUNK_SIZE // sorted_lengths[stop - 1])
+        positions = order[start:stop]
+        start = stop
+        if not sorted_lengths[stop - 1]:
+            continue
+        chunk = np.array([strings[position] for position in positions], dtype=np.unicode_)
+        code_points = chunk.view(np.uint32).reshape(len(chunk), -1)
+        chars_widths = np.where(code_points < 128, glyph_widths.ascii[np.minimum(code_points, 127)], glyph_widths.other)
+        for first, end in WIDE_CODE_POINT_RANGES:
+            chars_widths[(code_points >= first) & (code_points < end)] = glyph_widths.wide
+        widths[positions] = chars_widths.sum(axis=1)
+    return widths
+
+
+def get_max_text_width(series, glyph_widths):
+    """Returns the width in pixels of the widest value of the series as series.astype(str) formats it.
+    Strings are measured by the widths of their characters, only once for every distinct string. Numbers, dates and
+    other values that are formatted with digits are measured as digits, by the length get_max_length returns.
+
+    :param pandas.Series series: Raw (non-Container) values
+    :param GlyphWidths glyph_widths:
+    :rtype: float
+    """
+
+    if series.empty:
+        return 0.0
+    strings = None
+    if series.dtype == object:
+        values = series.values
+        try:
+            inferred_type = infer_dtype(values, skipna=False)
+        except TypeError:
+            # older pandas versions
+            inferred_type = infer_dtype(values)
+        if inferred_type in ('string', 'unicode'):
+            strings = pd.unique(values)
+        elif inferred_type not in NON_TEXT_INFERRED_TYPES:
+            # distinct values may be formatted differently (1 and True), so the formatted values are deduplicated
+            strings = pd.unique(np.array([unicode_type(value) for value in values], dtype=object))
+    elif not isinstance(series.dtype, np.dtype) and getattr(series.dtype, 'kind', None) != 'M':
+        # extension values are measured as the same values in an object column are, missing values included
+        values = np.asarray(series.values, dtype=object)
+        try:
+            inferred_type = infer_dtype(values, skipna=False)
+        except TypeError:
+            # older pandas versions
+            inferred_type = infer_dtype(values)
+        if inferred_type not in NON_TEXT_INFERRED_TYPES:
+            strings = series.drop_duplicates().astype(unicode_type).values
+    if strings is None:
+        return get_max_length(series) * glyph_widths.digit
+    return float(get_text_widths(strings, glyph_widths).max())
+
+
+def get_column_width(text_width):
+    """Converts the width in pixels of a column's widest value to Excel's column width
+
+    :param float text_width:
+    :rtype: float
+    """
+
+    return math.ceil((text_width + CELL_PADDING_PIXELS) / MAX_DIGIT_WIDTH_PIXELS * 256) / 256.0
@@ -2,13 +2,19 @@ import argparse
 import json
 import jsonschema
 import inspect
+import multiprocessing
+import numpy as np
+import os
 import pandas as pd
 import sys
+import time
 
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from copy import deepcopy
 from pprint import pprint
 
 from .. import StyleFrame, Container, Styler, version
+from .json_stream import JsonStreamReader
 from .tests.json_schema import commandline_json_schema
 
 PY2 = sys.version_info[0] == 2
@@ -20,21 +26,133 @@ else:
     styler_kwargs = set(inspect.signature(Styler).parameters.keys())
 
 
+def _get_style_key(style):
+    """Returns a hashable key of a style dict that is the same for all the equal dicts"""
+
+    return tuple(sorted(style.items()))
+
+
+VALIDATION_MODES = ('full', 'sample', 'none')
+
+# the number of cells of every column that are validated in 'sample' validation mode
+VALIDATION_SAMPLE_SIZE = 100
+
+JSON_TYPES = {'string': (str, unicode) if PY2 else (str,),
+              'boolean': (bool,),
+              'number': (int, long, float) if PY2 else (int, float)}
+
+STYLE_TYPES = {name: JSON_TYPES[definition['type']]
+               for name, definition in commandline_json_schema['definitions']['Style']['properties'].items()}
+
+CELL_KEYS = frozenset(commandline_json_schema['definitions']['Cell']['properties'])
+
+_validators = {}
+
+
+def _get_validator(name):
+    """Returns a compiled validator, created on first use. The cells are not validated by any of them but by
+    _validate_cell.
+
+    :param str name: 'sheets' for the whole json, 'Sheet' and 'Column' for a single sheet and a single column without
+        their columns and cells (when the json is streamed), or 'Cell'
+    """
+
+    try:
+        return _validators[name]
+    except KeyError:
+        pass
+    schema = deepcopy(commandline_json_schema)
+    definitions = schema['definitions']
+    del definitions['Column']['properties']['cells']['items']
+    if name == 'Sheet':
+        definitions['Sheet']['required'] = ['sheet_name']
+    elif name == 'Column':
+        definitions['Column']['required'] = ['col_name']
+    if name != 'sheets':
+        schema = {'$schema': schema['$schema'],
+                  'definitions': definitions,
+                  '$ref': '#/definitions/{}'.format(name)}
+    validator = _validators[name] = jsonschema.validators.validator_for(schema)(schema)
+    return validator
+
+
+def _validate(name, instance):
+    """Validates the instance with the validator of the given name (see _get_validator)"""
+
+    try:
+        _get_validator(name).validate(instance)
+    except jsonschema.ValidationError as validation_error:
+        raise ValueError(validation_error)
+
+
+def _is_valid_style(style):
+    if type(style) is not dict:
+        return False
+    for key, value in style.items():
+        types = STYLE_TYPES.get(key)
+        if types is None or not isinstance(value, types) or (type(value) is bool and types is not JSON_TYPES['boolean']):
+            return False
+    return True
+
+
+def _validate_cell(cell):
+    """Validates a cell with a structural check that is much faster than the schema's validator, which is only used
+    to describe the error of invalid cells
+    """
+
+    if not (type(cell) is dict and 'value' in cell and all(key in CELL_KEYS for key in cell)
+            and ('style' not in cell or _is_valid_style(cell['style']))):
+        _validate('Cell', cell)
+
+
 class CommandLineInterface(object):
-    def __init__(self, input_path=None, output_path=None, input_json=None):
+    def __init__(self, input_path=None, output_path=None, input_json=None, stream=False, validate='full',
+                 direct_xml=False):
+        """
+        :param bool stream: If True the json is parsed and validated incrementally, one sheet and column at a time,
+            and each sheet is written in write-only mode as soon as it is parsed, so memory usage depends on the size
+            of the largest sheet rather than on the size of the json. The StyleFrame objects of the sheets are not
+            kept as attributes in this mode.
+        :param str validate: 'full' validates the whole json against the schema, 'sample' validates everything but
+            the cells, of which only the first VALIDATION_SAMPLE_SIZE cells of every column are validated, and 'none'
+            skips the validation. 'sample' and 'none' are meant for trusted, machine-generated json, since invalid
+            json may fail with less clear errors.
+        :param bool direct_xml: If True the sheets are written with StyleFrame.to_excel's direct_xml in stream mode,
+            rather than with openpyxl cells. Ignored when stream is False.
+        """
+
+        if validate not in VALIDATION_MODES:
+            raise ValueError('validate must be one of {}, got {} instead'.format(VALIDATION_MODES, validate))
         self.input_path = input_path
         self.input_json = input_json
-        self.excel_writer = StyleFrame.ExcelWriter(output_path)
+        self.stream = stream
+        self.validate = validate
+        self.direct_xml = direct_xml
+        # the number of cells of every column to validate, None for all of them
+        self._cells_to_validate = {'full': None, 'sample': VALIDATION_SAMPLE_SIZE, 'none': 0}[validate]
+        self.output_path = output_path
+        # created once the json was parsed (or its first sheet, when streamed), since newer pandas versions create
+        # the output file along with the ExcelWriter
+        self.excel_writer = None
         self.col_names_to_width = defaultdict(dict)
+        # style key -> the (frozen) Styler of all the cells with that style
+        self._stylers = {}
 
     def parse_as_json(self):
         try:
-            self._load_from_json()
+            self._parse()
         except (TypeError, ValueError) as ex:
+            self._discard()
             print('Got the following error:\n{}.'.format(ex))
             return
         self._save()
 
+    def _parse(self):
+        if self.stream:
+            self._stream_from_json()
+        else:
+            self._load_from_json()
+
     def _load_from_json(self):
         if self.input_json:
             sheets = json.loads(self.input_json)
@@ -44,10 +162,12 @@ class CommandLineInterface(object):
         else:
             raise TypeError('Neither --json nor --json_path were provided.')
 
-        try:
-            jsonschema.validate(sheets, commandline_json_schema)
-        except jsonschema.ValidationError as validation_error:
-            raise ValueError(validation_error)
+        if self.validate != 'none':
+            _validate('sheets', sheets)
+            for sheet in sheets:
+                for col in sheet['columns']:
+                    for cell in col['cells'][:self._cells_to_validate]:
+                        _validate_cell(cell)
 
         for sheet in sheets:
             self._load_sheet(sheet)
@@ -61,22 +181,153 @@ class CommandLineInterface(object):
             col_width = col.get('width')
             if col_width:
                 self.col_names_to_width[sheet_name][col_name] = col_width
+            # the style of the cells that have none of their own, only looked up if there are such cells
+            col_styler = None
             for cell in col['cells']:
-                provided_style = cell.get('style') or col.get('style') or default_cell_style or {}
-                unrecognized_styler_kwargs = set(provided_style.keys()) - styler_kwargs
-                if unrecognized_styler_kwargs:
-                    raise TypeError('Styler dict {} contains unexpected argument: {}.\n'
-                                    'Expected arguments: {}'.format(provided_style, unrecognized_styler_kwargs,
-                                                                    styler_kwargs))
+                cell_style = cell.get('style')
+                if cell_style:
+                    styler = self._get_styler(cell_style)
                 else:
-                    data[col_name].append(Container(cell['value'], Styler(**provided_style)))
-        sf = StyleFrame(pd.DataFrame(data=data))
+                    if col_styler is None:
+                        col_styler = self._get_styler(col.get('style') or default_cell_style or {})
+                    styler = col_styler
+                data[col_name].append(Container(cell['value'], styler))
+        sf = StyleFrame(pd.DataFrame(data=data), share_styles=True)
 
         self._apply_headers_style(sf, sheet)
         self._apply_cols_and_rows_dimensions(sf, sheet)
-        sf.to_excel(excel_writer=self.excel_writer, sheet_name=sheet_name, **sheet.get('extra_features', {}))
+        sf.to_excel(excel_writer=self._get_excel_writer(), sheet_name=sheet_name, **sheet.get('extra_features', {}))
         setattr(self, '{}_sf'.format(sheet_name), sf)
 
+    def _stream_from_json(self):
+        if self.input_json:
+            self._stream_sheets(JsonStreamReader(text=self.input_json))
+        elif self.input_path:
+            with open(self.input_path) as f:
+                self._stream_sheets(JsonStreamReader(f))
+        else:
+            raise TypeError('Neither --json nor --json_path were provided.')
+
+    def _stream_sheets(self, reader):
+        sheets_count = 0
+        for _ in reader.iter_array():
+            self._stream_sheet(reader)
+            sheets_count += 1
+        reader.check_end()
+        if not sheets_count:
+            raise ValueError('[] is too short')
+
+    def _stream_sheet(self, reader):
+        """Parses a single sheet, one column and cell at a time, and writes it.
+        The cells are kept as raw values and ids of their distinct styles until the whole sheet is parsed, since the
+        keys of the sheet that decide the styles may come after its columns.
+        """
+
+        sheet = {}
+        # column name -> (values, style keys ids, column style)
+        columns = OrderedDict()
+        columns_width = {}
+        # cell style -> id, the style of a cell that has none is decided by its column and the sheet
+        style_keys = OrderedDict([(None, 0)])
+        for key in reader.iter_object():
+            if key != 'columns':
+                sheet[key] = reader.decode_value()
+                continue
+            sheet[key] = True
+            for _ in reader.iter_array():
+                col, values, cell_style_ids = self._stream_column(reader, style_keys)
+                if col['col_name'] in columns:
+                    columns[col['col_name']][0].extend(values)
+                    columns[col['col_name']][1].extend(cell_style_ids)
+                else:
+                    columns[col['col_name']] = (values, cell_style_ids, col.get('style'))
+                if col.get('width'):
+                    columns_width[col['col_name']] = col['width']
+        if 'columns' not in sheet:
+            raise ValueError("'columns' is a required property")
+        if not columns:
+            raise ValueError('[] is too short')
+        del sheet['columns']
+        if self.validate != 'none':
+            _validate('Sheet', sheet)
+
+        sheet_name = sheet['sheet_name']
+        self.col_names_to_width[sheet_name].update(columns_width)
+        default_cell_style = sheet.get('default_styles', {}).get('cells')
+        sf = StyleFrame(pd.DataFrame(OrderedDict((col_name, column[0]) for col_name, column in columns.items())),
+                        columnar=True)
+        table = sf._styles.table
+        for col_index, (values, cell_style_ids, col_style) in enumerate(columns.values()):
+            table_ids = []
+            for style_key in style_keys:
+                provided_style = dict(style_key) if style_key else col_style or default_cell_style or {}
+                table_ids.append(table.add(self._get_styler(provided_style)))
+            sf._styles.cells[:, col_index] = np.array(table_ids)[np.array(cell_style_ids, dtype=np.intp)]
+        columns.clear()
+
+        self._apply_headers_style(sf, sheet)
+        self._apply_cols_and_rows_dimensions(sf, sheet)
+        to_excel_kwargs = {'direct_xml': self.direct_xml}
+        to_excel_kwargs.update(sheet.get('extra_features', {}))
+        sf.to_excel(excel_writer=self._get_excel_writer(), sheet_name=sheet_name, write_only=True, **to_excel_kwargs)
+
+    def _get_styler(self, provided_style):
+        """Returns the Styler of a style dict. Every distinct style is validated and built once, and the same (frozen)
+        Styler object is shared by all the cells with that style.
+
+        :param dict provided_style: Styler arguments
+        :rtype: Styler
+        """
+
+        style_key = _get_style_key(provided_style)
+        try:
+            return self._stylers[style_key]
+        except KeyError:
+            pass
+        unrecognized_styler_kwargs = set(provided_style.keys()) - styler_kwargs
+        if unrecognized_styler_kwargs:
+            raise TypeError('Styler dict {} contains unexpected argument: {}.\n'
+                            'Expected arguments: {}'.format(provided_style, unrecognized_styler_kwargs, styler_kwargs))
+        styler = self._stylers[style_key] = Styler(**provided_style).freeze()
+        return styler
+
+    def _stream_column(self, reader, style_keys):
+        """Parses a single column, one cell at a time
+
+        :return: The column without its cells, the values of the cells and the ids of their styles in style_keys
+        :rtype: tuple
+        """
+
+        col = {}
+        values = []
+        cell_style_ids = []
+        for key in reader.iter_object():
+            if key != 'cells':
+                col[key] = reader.decode_value()
+                continue
+            col[key] = True
+            cells_to_validate = self._cells_to_validate
+            for _ in reader.iter_array():
+                cell = reader.decode_value()
+                if cells_to_validate is None:
+                    _validate_cell(cell)
+                elif cells_to_validate:
+                    _validate_cell(cell)
+                    cells_to_validate -= 1
+                values.append(cell['value'])
+                style = cell.get('style')
+                style_key = _get_style_key(style) if style else None
+                try:
+                    cell_style_ids.append(style_keys[style_key])
+                except KeyError:
+                    cell_style_ids.append(style_keys.setdefault(style_key, len(style_keys)))
+        if 'cells' not in col:
+            raise ValueError("'cells' is a required property")
+        del col['cells']
+        if self.validate != 'none':
+            _validate('Column', col)
+        return col, values, cell_style_ids
+
     def _apply_headers_style(self, sf, sheet):
         default_headers_style = sheet.get('default_styles', {}).get('headers')
         if default_headers_style:
@@ -88,8 +339,134 @@ class CommandLineInterface(object):
         if row_heights:
             sf.set_row_height_dict(row_heights)
 
+    def _get_excel_writer(self):
+        if self.excel_writer is None:
+            self.excel_writer = StyleFrame.ExcelWriter(self.output_path, write_only=self.stream)
+        return self.excel_writer
+
     def _save(self):
-        self.excel_writer.save()
+        self._get_excel_writer().save()
+
+    def _discard(self):
+        """Removes the output file of a json that failed to parse or to be written, if the ExcelWriter created it"""
+
+        excel_writer, self.excel_writer = self.excel_writer, None
+        # newer pandas versions open the output file as soon as the ExcelWriter is created, older ones only save it
+        handles = getattr(excel_writer, 'handles', None)
+        if handles is None:
+            return
+        handles.close()
+        try:
+            os.remove(self.output_path)
+        except OSError:
+            pass
+
+
+def get_batch_specs(batch_path, output_dir=None):
+    """Returns the json path and the output path of every spec of a batch
+
+    :param str batch_path: A directory, whose .json files are the specs, or a manifest: a json list of json paths or
+        of {"json_path": ..., "output_path": ...} objects. Relative paths in a manifest are relative to its directory.
+    :param None|str output_dir: The directory of the output files that are not given by the manifest. Defaults to the
+        directory of each json file. Output files are named after their json files.
+    :rtype: list[tuple[str, str]]
+    """
+
+    def get_output_path(json_path):
+        output_name = os.path.splitext(os.path.basename(json_path))[0] + '.xlsx'
+        return os.path.join(output_dir or os.path.dirname(json_path), output_name)
+
+    if os.path.isdir(batch_path):
+        json_paths = [os.path.join(batch_path, name) for name in sorted(os.listdir(batch_path))
+                      if name.lower().endswith('.json')]
+        return [(json_path, get_output_path(json_path)) for json_path in json_paths]
+
+    with open(batch_path) as f:
+        manifest = json.load(f)
+    if not isinstance(manifest, list):
+        raise ValueError('The manifest must be a list of json paths or of objects, got {} instead'
+                         .format(type(manifest).__name__))
+    manifest_dir = os.path.dirname(batch_path)
+    specs = []
+    for spec in manifest:
+        if isinstance(spec, dict):
+            json_path, output_path = spec.get('json_path'), spec.get('output_path')
+        else:
+            json_path, output_path = spec, None
+        if not json_path:
+            raise ValueError('Every spec in the manifest must have a json path, got {} instead'.format(spec))
+        json_path = os.path.join(manifest_dir, json_path)
+        specs.append((json_path, os.path.join(manifest_dir, output_path) if output_path
+                      else get_output_path(json_path)))
+    return specs
+
+
+def _render_spec(task):
+    """Renders a single spec of a batch. Runs in the worker processes.
+
+    :return: The json path, the output path, the number of seconds it took and the error if it failed
+    :rtype: tuple
+    """
+
+    json_path, output_path, stream, validate, direct_xml = task
+    start = time.time()
+    cli = None
+    try:
+        cli = CommandLineInterface(input_path=json_path, output_path=output_path, stream=stream, validate=validate,
+                                   direct_xml=direct_xml)
+        cli._parse()
+        cli._save()
+    except Exception as ex:
+        if cli is not None:
+            cli._discard()
+        return json_path, output_path, time.time() - start, '{}: {}'.format(type(ex).__name__, ex)
+    return json_path, output_path, time.time() - start, None
+
+
+def render_batch(specs, processes=None, stream=False, validate='full', out=None, direct_xml=False):
+    """Renders the specs of a batch with a pool of worker processes, so the imports and the set up of every worker
+    are paid for once rather than once for every spec. Every spec is reported as soon as it is rendered, along with
+    the time it took or the error it failed with.
+
+    :param list[tuple[str, str]] specs: The json path and the output path of every spec (see get_batch_specs)
+    :param None|int processes: The number of worker processes. Defaults to the number of CPUs. With a single
+        process the specs are rendered by the calling process.
+    :param bool stream: See CommandLineInterface
+    :param str validate: See CommandLineInterface
+    :param out: A file object the report is written to. Defaults to sys.stdout
+    :param bool direct_xml: See CommandLineInterface
+    :return: The result of every spec, in the order of the specs: the json path, the output path, the number of
+        seconds it took and the error if it failed (None otherwise)
+    :rtype: list[tuple]
+    """
+
+    if processes is not None and processes < 1:
+        raise ValueError('processes must be None or a positive integer, got {} instead'.format(processes))
+    out = out or sys.stdout
+    start = time.time()
+    tasks = [(json_path, output_path, stream, validate, direct_xml) for json_path, output_path in specs]
+    processes = min(processes or multiprocessing.cpu_count(), len(tasks))
+    pool = multiprocessing.Pool(processes) if processes > 1 else None
+    try:
+        results = pool.imap_unordered(_render_spec, tasks, chunksize=1) if pool else (_render_spec(task)
+                                                                                      for task in tasks)
+        results_by_spec = {}
+        for json_path, output_path, seconds, error in results:
+            results_by_spec[json_path, output_path] = (json_path, output_path, seconds, error)
+            if error is None:
+                out.write('{} -> {}: {:.2f}s\n'.format(json_path, output_path, seconds))
+            else:
+                # validation errors go on to describe the schema, only their first line is reported
+                out.write('{}: failed after {:.2f}s: {}\n'.format(json_path, seconds, error.splitlines()[0]))
+            out.flush()
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    failures = sum(1 for result in results_by_spec.values() if result[3] is not None)
+    out.write('Rendered {} of {} files in {:.2f}s, {} failed\n'.format(len(tasks) - failures, len(tasks),
+                                                                         time.time() - start, failures))
+    return [results_by_spec[spec] for spec in specs]
 
 
 def get_cli_args():
@@ -102,13 +479,36 @@ def get_cli_args():
     group.add_argument('--json', help='json string which defines the Excel file')
     group.add_argument('--show-schema', action='store_true', help='Print the JSON schema used for validation and exit',
                        default=False)
-    parser.add_argument('--output_path', help='path of output Excel file, defaults to output.xlsx',
-                        default='output.xlsx')
+    group.add_argument('--batch', help='directory of json files, or a manifest (a json list of json paths or of '
+                                       '{"json_path": ..., "output_path": ...} objects), to render in a single run')
+    parser.add_argument('--output_path', help='path of output Excel file, defaults to output.xlsx. With --batch, the '
+                                              'directory of the output files, defaults to the directory of each json '
+                                              'file')
+    parser.add_argument('--stream', action='store_true', default=False,
+                        help='parse the json one sheet and column at a time and write each sheet as soon as it is '
+                             'parsed, for json files that are too large to load at once')
+    parser.add_argument('--direct-xml', action='store_true', default=False,
+                        help='with --stream, write the rows as xml generated directly from the values and styles '
+                             'rather than with openpyxl cells, which is faster')
+    parser.add_argument('--validate', choices=VALIDATION_MODES, default='full',
+                        help="'full' validates the whole json against the schema (the default), 'sample' validates "
+                             "only the first {} cells of every column and 'none' skips the validation, for trusted "
+                             "json".format(VALIDATION_SAMPLE_SIZE))
+    parser.add_argument('--no-validate', dest='validate', action='store_const', const='none',
+                        help='the same as --validate none')
+    parser.add_argument('--processes', type=int,
+                        help='number of worker processes that render the json files of --batch, defaults to the number '
+                             'of CPUs')
 
     cli_args = parser.parse_args()
 
-    if not any((cli_args.version, cli_args.show_schema)) and not any((cli_args.json_path, cli_args.json)):
-        parser.error('Either --json_path or --json are required when not using -v.')
+    if not any((cli_args.version, cli_args.show_schema)) and not any((cli_args.json_path, cli_args.json,
+                                                                      cli_args.batch)):
+        parser.error('Either --json_path, --json or --batch are required when not using -v.')
+    if cli_args.processes is not None and cli_args.processes < 1:
+        parser.error('--processes must be a positive integer.')
+    if cli_args.direct_xml and not cli_args.stream:
+        parser.error('--direct-xml requires --stream.')
 
     return cli_args
 
@@ -121,8 +521,15 @@ def execute_from_command_line():
     if cli_args.show_schema:
         pprint(commandline_json_schema)
         return
+    if cli_args.batch:
+        results = render_batch(get_batch_specs(cli_args.batch, cli_args.output_path), cli_args.processes,
+                               cli_args.stream, cli_args.validate, direct_xml=cli_args.direct_xml)
+        if any(error is not None for _, _, _, error in results):
+            sys.exit(1)
+        return
     CommandLineInterface(input_path=cli_args.json_path, input_json=cli_args.json,
-                         output_path=cli_args.output_path).parse_as_json()
+                         output_path=cli_args.output_path or 'output.xlsx', stream=cli_args.stream,
+                         validate=cli_args.validate, direct_xml=cli_args.direct_xml).parse_as_json()
 
 
 if __name__ == '__main__':
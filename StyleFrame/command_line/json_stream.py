@@ -0,0 +1,130 @@
+# coding:utf-8
+import json
+import re
+
+BUFFER_SIZE = 1 << 16
+
+NON_WHITESPACE = re.compile(r'\S')
+
+
+class JsonStreamReader(object):
+    """
+    Parses a json document incrementally, reading it from a file object a buffer at a time. Arrays and objects are
+    iterated item by item and only the values that are requested are decoded as a whole, so memory usage depends
+    on the size of those values rather than on the size of the document.
+    """
+
+    def __init__(self, fp=None, text='', buffer_size=BUFFER_SIZE):
+        """
+        :param fp: A file object opened in text mode. If not provided the whole document is text
+        :param str text: The beginning of the document
+        :param int buffer_size: The number of characters that are read at a time
+        """
+
+        self._fp = fp
+        self._buffer = text
+        self._position = 0
+        # the position in the document of the beginning of the buffer
+        self._offset = 0
+        self._buffer_size = buffer_size
+        self._decoder = json.JSONDecoder()
+        self._eof = fp is None
+
+    def _read(self, size=None):
+        """Reads more of the document into the buffer, dropping the consumed part of the buffer.
+        Returns False if the whole document was already read.
+        """
+
+        if self._eof:
+            return False
+        data = self._fp.read(size or self._buffer_size)
+        if not data:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._position:] + data
+        self._offset += self._position
+        self._position = 0
+        return True
+
+    def _peek(self):
+        """Skips whitespace and returns the next character without consuming it, or '' at the end of the document"""
+
+        while True:
+            match = NON_WHITESPACE.search(self._buffer, self._position)
+            if match is not None:
+                self._position = match.start()
+                return self._buffer[self._position]
+            self._position = len(self._buffer)
+            if not self._read():
+                return ''
+
+    def _expect(self, chars):
+        """Consumes the next character, which must be one of the given characters, and returns it"""
+
+        char = self._peek()
+        if not char or char not in chars:
+            raise ValueError('Expecting {} at position {}, got {} instead'.format(
+                ' or '.join(repr(expected) for expected in chars), self._offset + self._position,
+                repr(char) if char else 'the end of the document'))
+        self._position += 1
+        return char
+
+    def decode_value(self):
+        """Decodes the next value as a whole
+
+        :return: The decoded value, as json.loads returns it
+        """
+
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except ValueError:
+                # the value may continue past the end of the buffer. The buffer grows at least twice as large on every
+                # attempt so a large value is not decoded over and over
+                if self._read(max(self._buffer_size, len(self._buffer))):
+                    continue
+                raise
+            # a number that ends with the buffer may continue in the next buffer
+            if end == len(self._buffer) and self._read():
+                continue
+            self._position = end
+            return value
+
+    def iter_array(self):
+        """Yields once for every item of the next value, which must be an array.
+        The caller must consume the item (with decode_value, iter_array or iter_object) before resuming.
+        """
+
+        self._expect('[')
+        if self._peek() == ']':
+            self._position += 1
+            return
+        while True:
+            yield
+            if self._expect(',]') == ']':
+                return
+
+    def iter_object(self):
+        """Yields the keys of the next value, which must be an object.
+        The caller must consume the value of every key (with decode_value, iter_array or iter_object) before resuming.
+        """
+
+        self._expect('{')
+        if self._peek() == '}':
+            self._position += 1
+            return
+        while True:
+            if self._peek() != '"':
+                self._expect('"')
+            key = self.decode_value()
+            self._expect(':')
+            yield key
+            if self._expect(',}') == '}':
+                return
+
+    def check_end(self):
+        """Makes sure nothing but whitespace is left in the document"""
+
+        if self._peek():
+            raise ValueError('Extra data at position {}'.format(self._offset + self._position))
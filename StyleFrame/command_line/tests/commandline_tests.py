@@ -1,7 +1,15 @@
+import io
+import json
+import shutil
+import sys
+import tempfile
 import unittest
 import os
 
-from StyleFrame import CommandLineInterface, Styler, utils
+from StyleFrame import CommandLineInterface, StyleFrame, Styler, utils
+from StyleFrame.command_line import commandline
+from StyleFrame.command_line.commandline import get_batch_specs, render_batch
+from StyleFrame.command_line.json_stream import JsonStreamReader
 from StyleFrame.command_line.tests import TEST_JSON_FILE, TEST_JSON_STRING_FILE
 from StyleFrame.tests import TEST_FILENAME
 
@@ -42,3 +50,123 @@ class CommandlineInterfaceTest(unittest.TestCase):
         self.assertEqual(cli.Sheet1_sf.iloc[0, loc_col_a].style.to_openpyxl_style(), self.sheet_1_col_a_style)
         self.assertEqual(cli.Sheet1_sf.iloc[1, loc_col_a].style.to_openpyxl_style(), self.sheet_1_col_a_cell_2_style)
         self.assertEqual(cli.Sheet1_sf.iloc[1, loc_col_b].style.to_openpyxl_style(), self.sheet_1_col_b_cell_4_style)
+
+    # noinspection PyUnresolvedReferences
+    def test_parse_as_json_shares_styles(self):
+        cli = CommandLineInterface(input_json=json.dumps([{
+            'sheet_name': 'Sheet1',
+            'columns': [{'col_name': 'col_a', 'style': {'bold': True},
+                         'cells': [{'value': 1}, {'value': 2}, {'value': 3, 'style': {'font_size': 20, 'bold': True}}]},
+                        {'col_name': 'col_b',
+                         'cells': [{'value': 4, 'style': {'bold': True}}, {'value': 5},
+                                   {'value': 6, 'style': {'bold': True, 'font_size': 20}}]}]}]),
+            output_path=TEST_FILENAME)
+        cli.parse_as_json()
+        styles = [[value.style for value in row] for row in cli.Sheet1_sf.data_df.values]
+        self.assertIs(styles[0][0], styles[1][0])
+        self.assertIs(styles[0][0], styles[0][1])
+        self.assertIs(styles[2][0], styles[2][1])
+        self.assertEqual(styles[2][0], Styler(bold=True, font_size=20))
+        self.assertEqual(styles[1][1], Styler())
+
+    def test_parse_as_json_stream(self):
+        CommandLineInterface(TEST_JSON_FILE, TEST_FILENAME).parse_as_json()
+        sf = StyleFrame.read_excel(TEST_FILENAME, read_style=True, header=5)
+        for direct_xml in (False, True):
+            CommandLineInterface(TEST_JSON_FILE, TEST_FILENAME, stream=True, direct_xml=direct_xml).parse_as_json()
+            streamed_sf = StyleFrame.read_excel(TEST_FILENAME, read_style=True, header=5)
+            self.assertEqual(streamed_sf.data_df.values.tolist(), sf.data_df.values.tolist())
+            self.assertTrue(all(streamed_sf.iloc[row, col].style == sf.iloc[row, col].style
+                                for row in range(len(sf)) for col in range(len(sf.columns))))
+            self.assertEqual([column.style for column in streamed_sf.columns], [column.style for column in sf.columns])
+
+    def test_parse_as_json_failure_leaves_no_file(self):
+        valid_sheet = {'sheet_name': 'Sheet1', 'columns': [{'col_name': 'col_a', 'cells': [{'value': 1}]}]}
+        for sheets in ([{'sheet_name': 'Sheet1'}], [valid_sheet, {'sheet_name': 'Sheet2'}]):
+            for stream in (False, True):
+                with open(os.devnull, 'w') as out:
+                    stdout, sys.stdout = sys.stdout, out
+                    try:
+                        CommandLineInterface(input_json=json.dumps(sheets), output_path=TEST_FILENAME,
+                                             stream=stream).parse_as_json()
+                    finally:
+                        sys.stdout = stdout
+                self.assertFalse(os.path.exists(TEST_FILENAME))
+
+    def test_json_stream_reader(self):
+        def read_sheets(reader):
+            sheets = []
+            for _ in reader.iter_array():
+                sheets.append({key: reader.decode_value() for key in reader.iter_object()})
+            reader.check_end()
+            return sheets
+
+        with io.open(TEST_JSON_FILE, encoding='utf-8') as f:
+            json_string = f.read()
+        with io.open(TEST_JSON_FILE, encoding='utf-8') as f:
+            self.assertEqual(read_sheets(JsonStreamReader(f, buffer_size=3)), json.loads(json_string))
+        self.assertEqual(read_sheets(JsonStreamReader(text=json_string)), json.loads(json_string))
+        for invalid_json in ('[{"a": 1} 2]', '[{"a": 1}] 2', '[{"a" 1}]', '[{"a": tru}]', '[1]'):
+            with self.assertRaises(ValueError):
+                read_sheets(JsonStreamReader(text=invalid_json))
+
+    def test_render_batch(self):
+        batch_dir = tempfile.mkdtemp()
+        try:
+            shutil.copy(TEST_JSON_FILE, os.path.join(batch_dir, 'a.json'))
+            shutil.copy(TEST_JSON_STRING_FILE, os.path.join(batch_dir, 'b.json'))
+            with open(os.path.join(batch_dir, 'c.json'), 'w') as f:
+                f.write('[{"sheet_name": "Sheet1"}]')
+            specs = get_batch_specs(batch_dir)
+            self.assertEqual(specs, [(os.path.join(batch_dir, name + '.json'), os.path.join(batch_dir, name + '.xlsx'))
+                                     for name in ('a', 'b', 'c')])
+            with open(os.devnull, 'w') as out:
+                results = render_batch(specs, processes=2, out=out)
+            self.assertEqual([(json_path, output_path) for json_path, output_path, _, _ in results], specs)
+            self.assertEqual([error is None for _, _, _, error in results], [True, True, False])
+            self.assertTrue(os.path.exists(specs[0][1]) and os.path.exists(specs[1][1]))
+            self.assertFalse(os.path.exists(specs[2][1]))
+
+            manifest_path = os.path.join(batch_dir, 'manifest.json')
+            with open(manifest_path, 'w') as f:
+                json.dump(['a.json', {'json_path': 'b.json', 'output_path': 'b_2.xlsx'}], f)
+            self.assertEqual(get_batch_specs(manifest_path),
+                             [(os.path.join(batch_dir, 'a.json'), os.path.join(batch_dir, 'a.xlsx')),
+                              (os.path.join(batch_dir, 'b.json'), os.path.join(batch_dir, 'b_2.xlsx'))])
+            with self.assertRaises(ValueError):
+                render_batch(specs, processes=0)
+        finally:
+            shutil.rmtree(batch_dir, ignore_errors=True)
+
+    # noinspection PyUnresolvedReferences
+    def test_validate_modes(self):
+        def get_json(invalid_cell):
+            return json.dumps([{'sheet_name': 'Sheet1',
+                                'columns': [{'col_name': 'col_a',
+                                             'cells': [{'value': 1, 'style': {'bold': True, 'font_size': 10}},
+                                                       {'value': 2}, invalid_cell]}]}])
+
+        for invalid_cell in ({'value': 3, 'style': {'bold': 1}}, {'value': 3, 'style': {'font_size': True}},
+                             {'value': 3, 'style': {'color': 'red'}}, {'value': 3, 'other': 1}, {'style': {}}, 3):
+            for stream in (False, True):
+                cli = CommandLineInterface(input_json=get_json(invalid_cell), output_path=TEST_FILENAME, stream=stream)
+                with self.assertRaises(ValueError):
+                    cli._parse()
+
+        sample_size = commandline.VALIDATION_SAMPLE_SIZE
+        commandline.VALIDATION_SAMPLE_SIZE = 2
+        try:
+            for stream in (False, True):
+                for validate in ('sample', 'none'):
+                    cli = CommandLineInterface(input_json=get_json({'value': 3, 'style': {'bold': 1}}),
+                                               output_path=TEST_FILENAME, stream=stream, validate=validate)
+                    cli._parse()
+                    cli._save()
+                cli = CommandLineInterface(input_json=get_json({'value': 3, 'style': {'bold': 1}}).replace('10', '"10"'),
+                                           output_path=TEST_FILENAME, stream=stream, validate='sample')
+                with self.assertRaises(ValueError):
+                    cli._parse()
+        finally:
+            commandline.VALIDATION_SAMPLE_SIZE = sample_size
+        with self.assertRaises(ValueError):
+            CommandLineInterface(output_path=TEST_FILENAME, validate='partial')
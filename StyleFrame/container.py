@@ -9,10 +9,10 @@ PY2 = sys.version_info[0] == 2
 
 # Python 2
 if PY2:
-    from styler import Styler
+    from styler import Styler, LazyStyler
 # Python 3
 else:
-    from StyleFrame.styler import Styler
+    from StyleFrame.styler import Styler, LazyStyler
 try:
     pd_timestamp = pd.Timestamp
 except AttributeError:
@@ -38,6 +38,18 @@ class Container(object):
         else:
             self.style = styler
 
+    @property
+    def style(self):
+        style = self._style
+        # styles read with lazy_style=True are only converted to Styler objects when they are first accessed
+        if type(style) is LazyStyler:
+            style = self._style = style.resolve()
+        return style
+
+    @style.setter
+    def style(self, style):
+        self._style = style
+
     def __hash__(self):
         return hash(self.value)
 
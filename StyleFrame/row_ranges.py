@@ -0,0 +1,171 @@
+# coding:utf-8
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+
+from itertools import islice
+
+import numpy as np
+from openpyxl import Workbook
+from openpyxl.utils.indexed_list import IndexedList
+
+try:
+    from openpyxl.worksheet._writer import WorksheetWriter
+except ImportError:
+    # older openpyxl versions stream write-only sheets without a reusable writer
+    WorksheetWriter = None
+
+PY2 = sys.version_info[0] == 2
+
+# Python 2
+if PY2:
+    # noinspection PyUnresolvedReferences
+    from styler import Styler
+    # noinspection PyUnresolvedReferences
+    from xml_writer import SHEET_DATA_END, SHEET_DATA_START, TAIL_SIZE, get_written_styles, insert_rows, register_styles
+# Python 3
+else:
+    from StyleFrame.styler import Styler
+    from StyleFrame.xml_writer import (SHEET_DATA_END, SHEET_DATA_START, TAIL_SIZE, get_written_styles, insert_rows,
+                                       register_styles)
+
+# ranges smaller than this are not worth the cost of sending them to a worker process
+MIN_ROWS_PER_RANGE = 10000
+
+COPY_BUFFER_SIZE = 1 << 20
+
+
+def split_rows(rows_count, ranges_count):
+    """Splits the rows into up to ranges_count ranges of similar size, none smaller than MIN_ROWS_PER_RANGE
+
+    :rtype: list[tuple[int, int]]
+    """
+
+    ranges_count = max(1, min(ranges_count, rows_count // MIN_ROWS_PER_RANGE))
+    bounds = np.linspace(0, rows_count, ranges_count + 1).astype(int).tolist()
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _render_row_range(task):
+    """Writes the sheetData element of a range of rows to a file, with the rows numbered as in the whole sheet.
+    Returns None if the range needed styles that were not registered in advance, since their ids would not match.
+    Runs in the worker processes.
+    """
+
+    sf, first_row, rows_height, index, leading_columns, best_fit, value_format, cell_styles, style_arrays, path = task
+    book = Workbook(write_only=True)
+    book._cell_styles = IndexedList(cell_styles)
+    sheet = book.create_sheet()
+    for row, height in rows_height.items():
+        sheet.row_dimensions[row].height = height
+    get_value = sf._get_value_converter(*value_format)
+
+    rows = sf._iter_write_only_rows(sheet, False, index, leading_columns, best_fit, get_value, None,
+                                    Styler.get_workbook_cache(book), style_arrays, {})
+    # the same as WriteOnlyWorksheet does when rows are appended, only starting from first_row
+    writer = WorksheetWriter(sheet, out=path)
+    xf = writer.xf.send(True)
+    with xf.element('sheetData'):
+        for row_index, row in enumerate(rows, first_row):
+            writer.write_row(xf, sheet._values_to_row(row, row_index), row_index)
+    writer.xf.send(None)
+    writer.close()
+    if len(book._cell_styles) != len(cell_styles):
+        return None
+    return path
+
+
+def _copy_sheet_data(path, out):
+    """Copies the rows inside the sheetData element of a file written by _render_row_range"""
+
+    size = os.path.getsize(path)
+    with open(path, 'rb') as source:
+        start = source.read(COPY_BUFFER_SIZE).index(SHEET_DATA_START) + len(SHEET_DATA_START)
+        source.seek(max(start, size - TAIL_SIZE))
+        tail = source.read()
+        end = size - len(tail) + tail.rindex(SHEET_DATA_END)
+        source.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            data = source.read(min(COPY_BUFFER_SIZE, remaining))
+            out.write(data)
+            remaining -= len(data)
+
+
+def is_supported(sheet):
+    """Returns whether the installed openpyxl version has the write-only internals the ranges of rows are written
+    with, which are not part of its public API
+
+    :param sheet: openpyxl WriteOnlyWorksheet object
+    :rtype: bool
+    """
+
+    return (WorksheetWriter is not None and hasattr(sheet.parent, '_cell_styles')
+            and all(hasattr(sheet, name) for name in ('_values_to_row', '_get_writer', '_write_rows', '_rows')))
+
+
+def append_rows_in_parallel(sf, sheet, rows, processes, startrow, header, index, leading_columns, best_fit,
+                            value_format, index_header_style, style_cache, style_arrays):
+    """Writes the rows of a StyleFrame to a write-only sheet. The calling process writes the headers and the first
+    range of rows while the other ranges are written by worker processes, and their rows are then inserted into the
+    sheet as they are. The styles are registered in advance in the order a single process would register them, so
+    the sheet is identical to one written by a single process. All the rows are written by openpyxl's serializer.
+    Returns False without writing any row if the sheet can't be written this way.
+
+    :param StyleFrame sf:
+    :param sheet: openpyxl WriteOnlyWorksheet object that no rows were appended to
+    :param rows: The rows generator returned by sf._iter_write_only_rows for the sheet
+    :param None|int processes: The number of processes, including the calling process
+    :param int startrow: The number of empty rows to write before the rows of the StyleFrame
+    :param tuple value_format: na_rep, float_format and inf_rep
+    :rtype: bool
+    """
+
+    if not is_supported(sheet):
+        return False
+    ranges = split_rows(len(sf), processes or multiprocessing.cpu_count())
+    if len(ranges) < 2:
+        return False
+    get_value = sf._get_value_converter(*value_format)
+    styles = get_written_styles(sf, header, index, best_fit, get_value, index_header_style)
+    if styles is None:
+        return False
+    register_styles(sf, sheet, styles, style_cache, style_arrays)
+    cell_styles = list(sheet.parent._cell_styles)
+    first_row = startrow + (2 if header else 1)
+
+    temp_dir = tempfile.mkdtemp()
+    pool = None
+    try:
+        tasks = []
+        for range_index, (start, stop) in enumerate(ranges[1:], 1):
+            rows_height = {row: dimension.height for row, dimension in sheet.row_dimensions.items()
+                           if first_row + start <= row < first_row + stop}
+            tasks.append((sf._take_rows(start, stop), first_row + start, rows_height, index, leading_columns,
+                          best_fit, value_format, cell_styles, style_arrays,
+                          os.path.join(temp_dir, '{}.xml'.format(range_index))))
+        pool = multiprocessing.Pool(len(tasks))
+        result = pool.map_async(_render_row_range, tasks, chunksize=1)
+
+        for _ in range(startrow):
+            sheet.append([])
+        for row in islice(rows, ranges[0][1] + (1 if header else 0)):
+            sheet.append(row)
+        paths = result.get()
+        if all(paths):
+            def write_rows(out):
+                for path in paths:
+                    _copy_sheet_data(path, out)
+
+            insert_rows(sheet, write_rows)
+        else:
+            for row in rows:
+                sheet.append(row)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return True
@@ -0,0 +1,95 @@
+# coding:utf-8
+from openpyxl.xml.constants import SHEET_MAIN_NS
+from openpyxl.xml.functions import iterparse
+
+COL_TAG = '{%s}col' % SHEET_MAIN_NS
+ROW_TAG = '{%s}row' % SHEET_MAIN_NS
+SHEET_DATA_TAG = '{%s}sheetData' % SHEET_MAIN_NS
+
+
+def get_sheet_source(sheet):
+    """Opens the xml source of a read-only worksheet. Must be closed after use
+
+    :param sheet: openpyxl ReadOnlyWorksheet object
+    """
+
+    try:
+        return sheet._get_source()
+    except AttributeError:
+        # older openpyxl versions
+        return sheet.xml_source
+
+
+class SheetDimensionsReader(object):
+    """
+    Streams the columns width and rows height of a worksheet opened in openpyxl's read-only mode, which does not
+    read them. The rows are parsed as they are requested and released right away, so memory usage does not grow with
+    the size of the sheet.
+    """
+
+    def __init__(self, sheet):
+        """
+        :param sheet: openpyxl ReadOnlyWorksheet object
+        """
+
+        self._source = get_sheet_source(sheet)
+        self._events = iterparse(self._source, events=('start', 'end'))
+        self._sheet_data = None
+        self._row_index = 0
+        # the row that was parsed past the last requested row
+        self._pending = None
+        self.columns_width = {}
+        self._read_columns_width()
+        self._rows_height = self._iter_rows_height()
+
+    def _read_columns_width(self):
+        # the columns are defined before the rows, so only the beginning of the sheet is parsed here
+        for event, element in self._events:
+            if event == 'start' and element.tag == SHEET_DATA_TAG:
+                self._sheet_data = element
+                return
+            if event == 'end' and element.tag == COL_TAG and element.get('width') is not None:
+                width = float(element.get('width'))
+                for column_index in range(int(element.get('min')), int(element.get('max')) + 1):
+                    self.columns_width[column_index] = width
+
+    def _iter_rows_height(self):
+        if self._sheet_data is None:
+            return
+        for event, element in self._events:
+            if event != 'end':
+                continue
+            if element.tag == SHEET_DATA_TAG:
+                return
+            if element.tag == ROW_TAG:
+                row_index = element.get('r')
+                self._row_index = int(row_index) if row_index is not None else self._row_index + 1
+                height = element.get('ht')
+                # releasing the parsed rows and their cells
+                self._sheet_data.clear()
+                if height is not None:
+                    yield self._row_index, float(height)
+
+    def rows_height_until(self, last_row):
+        """Returns the height of the rows that have one, up to the given row (including).
+        Rows must be requested in increasing order.
+
+        :param int last_row: Excel row index (starts from 1)
+        :rtype: dict
+        """
+
+        rows_height = {}
+        if self._pending is not None:
+            if self._pending[0] > last_row:
+                return rows_height
+            rows_height[self._pending[0]] = self._pending[1]
+            self._pending = None
+        for row_index, height in self._rows_height:
+            if row_index > last_row:
+                self._pending = (row_index, height)
+                break
+            rows_height[row_index] = height
+        return rows_height
+
+    def close(self):
+        self._source.close()
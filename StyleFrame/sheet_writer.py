@@ -0,0 +1,194 @@
+# coding:utf-8
+import sys
+
+from openpyxl.utils import get_column_letter
+
+PY2 = sys.version_info[0] == 2
+
+# Python 2
+if PY2:
+    # noinspection PyUnresolvedReferences
+    from style_frame import StyleFrame, str_type, unicode_type
+    # noinspection PyUnresolvedReferences
+    from styler import Styler
+# Python 3
+else:
+    from StyleFrame.style_frame import StyleFrame, str_type, unicode_type
+    from StyleFrame.styler import Styler
+
+
+class SheetWriter(object):
+    """
+    Writes a single sheet incrementally, one batch of rows at a time. The sheet is written with openpyxl's write-only
+    mode, so the rows of every batch are flushed to disk as soon as they are appended and memory usage depends only
+    on the size of a single batch.
+    Can be used as a context manager that closes the writer on exit.
+    """
+
+    def __init__(self, excel_writer='output.xlsx', sheet_name='Sheet1', header=True, index=False,
+                 allow_protection=False, right_to_left=False, columns_to_hide=None, row_to_add_filters=None,
+                 columns_and_rows_to_freeze=None, best_fit=None, na_rep='', float_format=None, inf_rep='inf',
+                 font_metrics=False):
+        """
+        :param str|pandas.ExcelWriter excel_writer: File path or an ExcelWriter created with
+            StyleFrame.ExcelWriter(path, write_only=True). If a file path is provided, the file is saved when the
+            writer is closed.
+        :param str sheet_name: Name of the sheet to write
+        :param bool header: If True the headers of the first batch are written before its rows
+        :param bool index: If True the index of every batch is written as the first column
+
+        See StyleFrame.to_excel documentation about the other arguments.
+        Since openpyxl writes the columns before the rows, columns width, best_fit and columns_to_hide are decided
+        by the first batch. Filters and conditional formatting are added when the writer is closed and cover all the
+        appended rows.
+        """
+
+        if isinstance(excel_writer, (str_type, unicode_type)):
+            excel_writer = StyleFrame.ExcelWriter(excel_writer, write_only=True)
+            self._save_on_close = True
+        elif not excel_writer.book.write_only:
+            raise ValueError('{} requires an ExcelWriter created by StyleFrame.ExcelWriter(path, write_only=True)'
+                             .format(type(self).__name__))
+        else:
+            self._save_on_close = False
+        if columns_and_rows_to_freeze is not None:
+            if not isinstance(columns_and_rows_to_freeze, (str_type, unicode_type)) or len(columns_and_rows_to_freeze) < 2:
+                raise TypeError("columns_and_rows_to_freeze must be a str for example: 'C3'")
+        if row_to_add_filters is not None:
+            try:
+                row_to_add_filters = int(row_to_add_filters)
+            except (TypeError, ValueError):
+                raise TypeError("row must be an index and not {}".format(type(row_to_add_filters)))
+
+        self.excel_writer = excel_writer
+        self.sheet = excel_writer.book.create_sheet(sheet_name)
+        # older pandas versions keep track of the sheets themselves
+        excel_writer.sheets[sheet_name] = self.sheet
+        self.header = header
+        self.index = index
+        self.columns_to_hide = columns_to_hide
+        self.row_to_add_filters = row_to_add_filters
+        if best_fit is not None and not isinstance(best_fit, (list, set, tuple)):
+            best_fit = [best_fit]
+        self.best_fit = best_fit
+        self.font_metrics = font_metrics
+        # the number of rows written to the sheet so far, including the headers row
+        self.rows_count = 0
+        self.closed = False
+
+        self.sheet.sheet_view.rightToLeft = right_to_left
+        # the sheet views are written before the first row
+        if columns_and_rows_to_freeze is not None:
+            self.sheet.freeze_panes = columns_and_rows_to_freeze
+        if allow_protection:
+            self.sheet.protection.autoFilter = False
+            self.sheet.protection.enable()
+
+        self._startcol = 1 if index else 0
+        self._columns = None
+        self._columns_letters = None
+        self._cond_formatting = []
+        self._get_value = StyleFrame._get_value_converter(na_rep, float_format, inf_rep)
+        self._style_cache = Styler.get_workbook_cache(excel_writer.book)
+        self._style_arrays = {}
+        self._derived_styles = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def append(self, obj, styler_obj=None):
+        """Writes the rows of a batch to the sheet.
+
+        :param StyleFrame|pandas.DataFrame|dict|list obj: The batch to write. Anything that is not a StyleFrame is
+            wrapped in a (columnar) StyleFrame. All batches must have the same number of columns.
+        :param None|Styler styler_obj: The style of the batch's cells, used only if obj is not a StyleFrame.
+        :return: self
+        :rtype: SheetWriter
+        """
+
+        if self.closed:
+            raise ValueError('Can not append to a closed {}'.format(type(self).__name__))
+        if isinstance(obj, StyleFrame):
+            sf = obj
+        else:
+            sf = StyleFrame(obj, styler_obj, columnar=True)
+
+        write_header = False
+        if self._columns is None:
+            write_header = self.header
+            self._set_up_columns(sf)
+        elif len(sf.columns) != len(self._columns):
+            raise ValueError('All batches must have {} columns, got {} instead'.format(len(self._columns),
+                                                                                       len(sf.columns)))
+
+        index_header_style = sf._index_header_style
+        if write_header and not sf._has_custom_headers_style:
+            sf.apply_headers_style(Styler.default_header_style())
+
+        # openpyxl looks the rows height up when it writes each row, so they are only kept until the batch is written
+        rows_offset = self.rows_count if write_header else self.rows_count - 1
+        rows_height = {rows_offset + row: height for row, height in sf._rows_height.items()
+                       if row > 1 or write_header}
+        for row, height in rows_height.items():
+            self.sheet.row_dimensions[row].height = height
+
+        for row in sf._iter_write_only_rows(self.sheet, write_header, self.index, 0, self.best_fit, self._get_value,
+                                            index_header_style, self._style_cache, self._style_arrays,
+                                            self._derived_styles):
+            self.sheet.append(row)
+            self.rows_count += 1
+
+        for row in rows_height:
+            del self.sheet.row_dimensions[row]
+        return self
+
+    def _set_up_columns(self, sf):
+        """Sets the columns width and hidden columns according to the first batch, before any row is written"""
+
+        self._columns = list(sf.columns)
+        max_column = self._startcol + len(self._columns)
+
+        def get_column_letter_of(column):
+            return sf._get_column_as_letter(self.sheet, column, self._startcol, max_column)
+
+        if self.best_fit:
+            sf._set_best_fit_widths(self.best_fit, self.font_metrics)
+        for column, width in sf._columns_width.items():
+            self.sheet.column_dimensions[get_column_letter_of(column)].width = width
+
+        if self.columns_to_hide:
+            columns_to_hide = self.columns_to_hide
+            if not isinstance(columns_to_hide, (list, set, tuple)):
+                columns_to_hide = [columns_to_hide]
+            for column in columns_to_hide:
+                self.sheet.column_dimensions[get_column_letter_of(column)].hidden = True
+
+        self._columns_letters = (get_column_letter(self._startcol + 1), get_column_letter(max_column))
+        for cond_formatting in sf._cond_formatting:
+            self._cond_formatting.append((get_column_letter_of(cond_formatting.columns[0]),
+                                          get_column_letter_of(cond_formatting.columns[-1]),
+                                          cond_formatting.rule))
+
+    def close(self):
+        """Adds the filters and conditional formatting that depend on the number of written rows.
+        If the writer was created with a file path the file is saved as well.
+        """
+
+        if self.closed:
+            return
+        self.closed = True
+        if self._columns is not None:
+            if self.row_to_add_filters is not None:
+                if not 0 <= self.row_to_add_filters < self.rows_count:
+                    raise IndexError('row: {} is out of rows range'.format(self.row_to_add_filters))
+                self.sheet.auto_filter.ref = '{start}{row}:{end}{row}'.format(start=self._columns_letters[0],
+                                                                             end=self._columns_letters[1],
+                                                                             row=self.row_to_add_filters + 1)
+            for start_letter, end_letter, rule in self._cond_formatting:
+                self.sheet.conditional_formatting.add('{}1:{}{}'.format(start_letter, end_letter, self.rows_count),
+                                                      rule)
+        if self._save_on_close:
+            self.excel_writer.save()
@@ -0,0 +1,120 @@
+# coding:utf-8
+from collections import OrderedDict
+
+# the attribute of openpyxl workbooks that holds their StyleCache
+WORKBOOK_CACHE_ATTRIBUTE = '_styleframe_style_cache'
+
+
+class StyleCache(object):
+    """
+    A least recently used cache of objects created from styles (usually openpyxl NamedStyle objects created from
+    Styler objects) that keeps count of its hits, misses and evictions.
+    Misses are delegated to the parent cache if one is provided, so a cache scoped to a single workbook can share
+    the objects of a process wide cache.
+    """
+
+    def __init__(self, maxsize=None, parent=None, copy_parent_entry=None):
+        """
+        :param None|int maxsize: The maximal number of entries to keep. If None the cache is unbounded
+        :param None|StyleCache parent: A cache to look for entries that are not in this cache
+        :param None|callable copy_parent_entry: If provided this cache keeps the copies it returns of the parent's
+            objects rather than the objects themselves. Needed for objects that are bound to the workbook they are
+            used in, such as openpyxl NamedStyle objects, so the parent doesn't keep any workbook alive.
+        """
+
+        if maxsize is not None and maxsize < 0:
+            raise ValueError('maxsize must be None or a non-negative integer, got {} instead.'.format(maxsize))
+        self._maxsize = maxsize
+        self.parent = parent
+        self.copy_parent_entry = copy_parent_entry
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize):
+        if maxsize is not None and maxsize < 0:
+            raise ValueError('maxsize must be None or a non-negative integer, got {} instead.'.format(maxsize))
+        self._maxsize = maxsize
+        self._evict()
+
+    @property
+    def stats(self):
+        """Returns the cache's counters and current size
+
+        :rtype: dict
+        """
+
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'size': len(self._entries), 'maxsize': self._maxsize}
+
+    def get(self, key, create):
+        """Returns the cached object of the given key, creating it with create(key) if it is not cached
+
+        :param key: A hashable, immutable key
+        :param callable create: Called with the key to create the object on a miss, unless there is a parent cache
+        """
+
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            if self.parent is None:
+                value = create(key)
+            else:
+                value = self.parent.get(key, create)
+                if self.copy_parent_entry is not None:
+                    value = self.copy_parent_entry(value)
+            if self._maxsize != 0:
+                self._entries[key] = value
+                self._evict()
+            return value
+        self.hits += 1
+        if self._maxsize is not None:
+            # dict.move_to_end does not exist in Python 2's OrderedDict
+            del self._entries[key]
+            self._entries[key] = value
+        return value
+
+    def clear(self):
+        """Removes all the entries and resets the counters"""
+
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def _evict(self):
+        if self._maxsize is None:
+            return
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+def get_workbook_cache(workbook, parent=None, copy_parent_entry=None):
+    """Returns the StyleCache scoped to the given workbook, creating it if needed.
+    The cache is kept by the workbook itself rather than by a registry, so it is released together with the workbook
+    even though the objects in it refer back to the workbook.
+
+    :param workbook: openpyxl Workbook object
+    :param None|StyleCache parent: The parent of a newly created cache
+    :param None|callable copy_parent_entry: See StyleCache
+    :rtype: StyleCache
+    """
+
+    try:
+        return getattr(workbook, WORKBOOK_CACHE_ATTRIBUTE)
+    except AttributeError:
+        cache = StyleCache(parent=parent, copy_parent_entry=copy_parent_entry)
+        setattr(workbook, WORKBOOK_CACHE_ATTRIBUTE, cache)
+        return cache
@@ -1,15 +1,18 @@
 # coding:utf-8
 
 import datetime as dt
+import hashlib
 import numpy as np
 import pandas as pd
 import sys
 
 from .deprecations import deprecated_kwargs
 from . import utils
-from copy import deepcopy
+from copy import copy, deepcopy
 from collections import Iterable
-from openpyxl import load_workbook
+from openpyxl import load_workbook, Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.read_only import ReadOnlyCell
 from openpyxl.cell.cell import get_column_letter
 from openpyxl.xml.functions import fromstring, QName
 from openpyxl.utils import cell
@@ -23,19 +26,39 @@ if PY2:
     # noinspection PyUnresolvedReferences
     from series import Series
     # noinspection PyUnresolvedReferences
-    from styler import Styler, ColorScaleConditionalFormatRule
+    from styler import Styler, LazyStyler, ColorScaleConditionalFormatRule
+    # noinspection PyUnresolvedReferences
+    from style_matrix import StyleMatrix, default_number_format, may_have_default_number_format
+    # noinspection PyUnresolvedReferences
+    from sheet_dimensions import SheetDimensionsReader
+    # noinspection PyUnresolvedReferences
+    import column_width
+    # noinspection PyUnresolvedReferences
+    import row_ranges
+    # noinspection PyUnresolvedReferences
+    import xml_writer
 
 # Python 3
 else:
     from StyleFrame.container import Container
-    from StyleFrame.styler import Styler, ColorScaleConditionalFormatRule
+    from StyleFrame.styler import Styler, LazyStyler, ColorScaleConditionalFormatRule
     from StyleFrame.series import Series
+    from StyleFrame.style_matrix import StyleMatrix, default_number_format, may_have_default_number_format
+    from StyleFrame.sheet_dimensions import SheetDimensionsReader
+    from StyleFrame import column_width, row_ranges, xml_writer
 
 try:
     pd_timestamp = pd.Timestamp
 except AttributeError:
     pd_timestamp = pd.tslib.Timestamp
 
+try:
+    from pandas.api.types import is_bool, is_float, is_integer, is_scalar
+except ImportError:
+    # older pandas versions
+    from pandas.core.common import is_bool, is_float, is_integer
+    is_scalar = pd.lib.isscalar
+
 str_type = basestring if PY2 else str
 unicode_type = unicode if PY2 else str
 
@@ -48,30 +71,35 @@ class StyleFrame(object):
     P_FACTOR = 1.3
     A_FACTOR = 13
 
-    def __init__(self, obj, styler_obj=None):
+    def __init__(self, obj, styler_obj=None, columnar=None, share_styles=None):
         from_another_styleframe = False
         from_pandas_dataframe = False
         if styler_obj and not isinstance(styler_obj, Styler):
             raise TypeError('styler_obj must be {}, got {} instead.'.format(Styler.__name__, type(styler_obj).__name__))
-        if isinstance(obj, pd.DataFrame):
+        if columnar is None:
+            columnar = obj._columnar if isinstance(obj, StyleFrame) else False
+        self._columnar = columnar
+        if share_styles is None:
+            share_styles = obj._share_styles if isinstance(obj, StyleFrame) else False
+        self._share_styles = share_styles
+        self._styles = None
+        if columnar:
+            from_another_styleframe, from_pandas_dataframe = self._init_columnar(obj, styler_obj)
+        elif isinstance(obj, StyleFrame) and obj._columnar:
+            self.data_df = obj._to_containers_df(share_styles)
+            from_another_styleframe = True
+        elif isinstance(obj, pd.DataFrame):
             from_pandas_dataframe = True
-            if obj.empty:
-                self.data_df = deepcopy(obj)
-            else:
-                self.data_df = obj.applymap(lambda x: Container(x, deepcopy(styler_obj)) if not isinstance(x, Container) else x)
+            self.data_df = self._wrap_in_containers(obj, styler_obj, share_styles)
         elif isinstance(obj, pd.Series):
-            self.data_df = obj.apply(lambda x: Container(x, deepcopy(styler_obj)) if not isinstance(x, Container) else x)
+            self.data_df = self._wrap_in_containers(obj.to_frame(), styler_obj, share_styles)
         elif isinstance(obj, (dict, list)):
-            self.data_df = pd.DataFrame(obj).applymap(lambda x: Container(x, deepcopy(styler_obj)) if not isinstance(x, Container) else x)
+            self.data_df = self._wrap_in_containers(pd.DataFrame(obj), styler_obj, share_styles)
         elif isinstance(obj, StyleFrame):
-            self.data_df = deepcopy(obj.data_df)
+            self.data_df = self._wrap_in_containers(obj.data_df, share_styles=share_styles)
             from_another_styleframe = True
         else:
             raise TypeError("{} __init__ doesn't support {}".format(type(self).__name__, type(obj).__name__))
-        self.data_df.columns = [Container(col, deepcopy(styler_obj)) if not isinstance(col, Container) else deepcopy(col)
-                                for col in self.data_df.columns]
-        self.data_df.index = [Container(index, deepcopy(styler_obj)) if not isinstance(index, Container) else deepcopy(index)
-                              for index in self.data_df.index]
 
         if from_pandas_dataframe:
             self.data_df.index.name = obj.index.name
@@ -80,17 +108,199 @@ class StyleFrame(object):
         self._rows_height = obj._rows_height if from_another_styleframe else {}
         self._has_custom_headers_style = obj._has_custom_headers_style if from_another_styleframe else False
         self._cond_formatting = []
+        # column -> (fingerprint of the column's values, the length of its longest value)
+        self._best_fit_lengths = {}
         self._default_style = styler_obj or Styler()
         self._index_header_style = obj._index_header_style if from_another_styleframe else self._default_style
 
-        self._known_attrs = {'at': self.data_df.at,
-                             'loc': self.data_df.loc,
-                             'iloc': self.data_df.iloc,
-                             'applymap': self.data_df.applymap,
-                             'groupby': self.data_df.groupby,
-                             'index': self.data_df.index,
-                             'columns': self.data_df.columns,
-                             'fillna': self.data_df.fillna}
+        self._known_attrs = self._get_known_attrs(self.data_df)
+
+    @staticmethod
+    def _get_known_attrs(data_df):
+        return {'at': data_df.at,
+                'loc': data_df.loc,
+                'iloc': data_df.iloc,
+                'applymap': data_df.applymap,
+                'groupby': data_df.groupby,
+                'index': data_df.index,
+                'columns': data_df.columns,
+                'fillna': data_df.fillna}
+
+    def __getstate__(self):
+        # the known attributes are bound to data_df, so they are recreated when unpickling instead of pickled
+        state = self.__dict__.copy()
+        del state['_known_attrs']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._known_attrs = self._get_known_attrs(self.data_df)
+
+    @staticmethod
+    def _get_cell_style(style, share_styles):
+        """Returns the style to store in a cell. Cells that share their styles get a frozen style, and otherwise each
+        cell gets a mutable copy of its own, so modifying a cell's style in place doesn't modify other cells.
+        Styles that are not Styler objects (openpyxl styles) are returned as they are.
+
+        :param Styler style:
+        :param bool share_styles:
+        :rtype: Styler
+        """
+
+        if not isinstance(style, Styler):
+            return style
+        return style.freeze() if share_styles else style.thaw()
+
+    @staticmethod
+    def _wrap_in_containers(df, styler_obj=None, share_styles=False):
+        """Wraps the values, columns and index of a dataframe in Container objects, one column at a time.
+
+        New Containers use styler_obj, or a default style per value type if it is not provided, and existing
+        Containers are rewrapped with their current style. See _get_cell_style about share_styles.
+
+        :param pandas.DataFrame df:
+        :param None|Styler styler_obj:
+        :param bool share_styles:
+        :rtype: pandas.DataFrame
+        """
+
+        def get_default_style(value_type):
+            try:
+                return default_styles[value_type]
+            except KeyError:
+                number_format = default_number_format(value_type)
+                if number_format is None:
+                    style = general_style
+                else:
+                    style = Styler(number_format=number_format).freeze()
+                default_styles[value_type] = style
+                return style
+
+        def wrap_value(value):
+            if isinstance(value, Container):
+                return Container(value.value, get_cell_style(value.style, share_styles))
+            style = general_style if styler_obj else get_default_style(type(value))
+            return Container(value, get_cell_style(style, share_styles))
+
+        get_cell_style = StyleFrame._get_cell_style
+        # np.frompyfunc builds object arrays directly, without numpy probing each Container as a sequence
+        wrap = np.frompyfunc(wrap_value, 1, 1)
+        general_style = (styler_obj or Styler()).freeze()
+        wrap_numeric = np.frompyfunc(lambda value: Container(value, get_cell_style(general_style, share_styles)), 1, 1)
+        default_styles = {}
+        data = {}
+        for col_index in range(df.shape[1]):
+            column = df.iloc[:, col_index]
+            # extension columns, such as nullable integers, may hold missing values of other types
+            if isinstance(column.dtype, np.dtype) and column.dtype.kind in 'biufc':
+                data[col_index] = wrap_numeric(column.values)
+            else:
+                data[col_index] = wrap(column.astype(object).values)
+        # the rows are given explicitly, since a dataframe may have rows but no columns
+        containers_df = pd.DataFrame(data, index=range(df.shape[0]), columns=range(df.shape[1]))
+        containers_df.columns = pd.Index(wrap(df.columns.astype(object).values), dtype=object)
+        containers_df.index = pd.Index(wrap(df.index.astype(object).values), dtype=object, name=df.index.name)
+        return containers_df
+
+    def _init_columnar(self, obj, styler_obj):
+        """Sets data_df to a dataframe of raw values and _styles to a StyleMatrix of its styles
+
+        :return: (from_another_styleframe, from_pandas_dataframe)
+        :rtype: tuple
+        """
+
+        if isinstance(obj, StyleFrame):
+            if obj._columnar:
+                self.data_df = obj.data_df.copy()
+                self._styles = obj._styles.copy()
+            else:
+                self.data_df, self._styles = self._split_containers(obj.data_df, styler_obj)
+            return True, False
+        if isinstance(obj, pd.Series):
+            obj = obj.to_frame()
+        elif isinstance(obj, (dict, list)):
+            obj = pd.DataFrame(obj)
+        elif not isinstance(obj, pd.DataFrame):
+            raise TypeError("{} __init__ doesn't support {}".format(type(self).__name__, type(obj).__name__))
+        self.data_df, self._styles = self._split_containers(obj, styler_obj)
+        return False, False
+
+    @staticmethod
+    def _split_containers(df, styler_obj=None):
+        """Splits a dataframe that may hold Container objects into a dataframe of raw values and a StyleMatrix
+
+        :param pandas.DataFrame df:
+        :param None|Styler styler_obj: Style for values that are not Containers
+        :rtype: tuple
+        """
+
+        def has_containers(values):
+            return any(isinstance(value, Container) for value in values)
+
+        containers_df = df
+        df = StyleFrame._unwrap_containers(df)
+
+        styles = StyleMatrix.from_dataframe(df, styler_obj)
+        for col_index in range(df.shape[1]):
+            column = containers_df.iloc[:, col_index]
+            if column.dtype == object and has_containers(column):
+                for row_index, value in enumerate(column):
+                    if isinstance(value, Container):
+                        styles.cells[row_index, col_index] = styles.table.add(value.style)
+        for styles_ids, labels in ((styles.headers, containers_df.columns), (styles.index, containers_df.index)):
+            for position, label in enumerate(labels):
+                if isinstance(label, Container):
+                    styles_ids[position] = styles.table.add(label.style)
+        return df, styles
+
+    @staticmethod
+    def _unwrap_containers(df):
+        """Returns a dataframe of the raw values, columns and index of a dataframe that may hold Container objects
+
+        :param pandas.DataFrame df:
+        :rtype: pandas.DataFrame
+        """
+
+        def unwrap(values):
+            return [value.value if isinstance(value, Container) else value for value in values]
+
+        def get_array(column):
+            # unlike values, array keeps the extension types, such as timezone aware timestamps
+            try:
+                return column.array
+            except AttributeError:
+                # older pandas versions
+                return column.values
+
+        columns = (df.iloc[:, col_index] for col_index in range(df.shape[1]))
+        values_df = pd.DataFrame({col_index: unwrap(column) if column.dtype == object else get_array(column)
+                                  for col_index, column in enumerate(columns)},
+                                 columns=range(df.shape[1]), index=df.index)
+        values_df.columns = pd.Index(unwrap(df.columns), name=df.columns.name)
+        values_df.index = pd.Index(unwrap(df.index), name=df.index.name)
+        return values_df
+
+    def _to_containers_df(self, share_styles=False):
+        """Creates a dataframe of Container objects from the columnar representation
+
+        :param bool share_styles: See _get_cell_style
+        :rtype: pandas.DataFrame
+        """
+
+        def get_style(style):
+            return self._get_cell_style(style, share_styles)
+
+        styles = self._styles
+        df = pd.DataFrame({col_index: [Container(value, get_style(styles.get(row_index, col_index)))
+                                       for row_index, value in enumerate(self.data_df.iloc[:, col_index])]
+                           for col_index in range(self.data_df.shape[1])},
+                          columns=range(self.data_df.shape[1]))
+        df.columns = [Container(col, get_style(styles.get_header(col_index)))
+                      for col_index, col in enumerate(self.data_df.columns)]
+        df.index = [Container(index, get_style(styles.get_index(row_index)))
+                    for row_index, index in enumerate(self.data_df.index)]
+        df.index.name = self.data_df.index.name
+        return df
 
     def __str__(self):
         return str(self.data_df)
@@ -105,16 +315,31 @@ class StyleFrame(object):
         if isinstance(item, pd.Series):
             return self.data_df.__getitem__(item).index
         if isinstance(item, list):
-            return StyleFrame(self.data_df.__getitem__(item))
+            if self._columnar:
+                sf = StyleFrame(self.data_df.__getitem__(item), columnar=True)
+                sf._styles = self._styles.take(cols=self.data_df.columns.get_indexer(item))
+                return sf
+            return StyleFrame(self.data_df.__getitem__(item), share_styles=self._share_styles)
+        if self._columnar:
+            return self.data_df.__getitem__(item)
         return Series(self.data_df.__getitem__(item))
 
     def __setitem__(self, key, value):
-        if isinstance(value, (Iterable, pd.Series)):
+        if self._columnar:
+            if key in self.data_df.columns:
+                self._styles.delete_column(self.data_df.columns.get_loc(key))
+            self.data_df.__setitem__(key, value)
+            loc = self.data_df.columns.get_loc(key)
+            self._styles.insert_column(loc, self._styles.table.default_ids(self.data_df.iloc[:, loc]),
+                                       header_id=self._styles.table.default_ids([key])[0])
+        elif isinstance(value, (Iterable, pd.Series)):
             self.data_df.__setitem__(Container(key), list(map(Container, value)))
         else:
             self.data_df.__setitem__(Container(key), Container(value))
 
     def __delitem__(self, item):
+        if self._columnar:
+            self._styles.delete_column(self.data_df.columns.get_loc(item))
         return self.data_df.__delitem__(item)
 
     def __getattr__(self, attr):
@@ -125,7 +350,9 @@ class StyleFrame(object):
         except KeyError:
             raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, attr))
 
-    def _get_column_as_letter(self, sheet, column_to_convert, startcol=0):
+    def _get_column_as_letter(self, sheet, column_to_convert, startcol=0, max_column=None):
+        if max_column is None:
+            max_column = sheet.max_column
         if not isinstance(column_to_convert, (int, str_type, unicode_type, Container)):
             raise TypeError("column must be an index, column letter or column name")
         column_as_letter = None
@@ -139,18 +366,84 @@ class StyleFrame(object):
             column_as_letter = cell.get_column_letter(startcol + column_to_convert)
 
         # assuming we got column letter
-        elif isinstance(column_to_convert, (str_type, unicode_type)) < get_column_letter(sheet.max_column):
+        elif isinstance(column_to_convert, (str_type, unicode_type)) < get_column_letter(max_column):
             column_as_letter = column_to_convert
 
-        if column_as_letter is None or cell.column_index_from_string(column_as_letter) > sheet.max_column:
+        if column_as_letter is None or cell.column_index_from_string(column_as_letter) > max_column:
             raise IndexError("column: %s is out of columns range." % column_to_convert)
 
         return column_as_letter
 
+    @staticmethod
+    def _get_scheme_colors_from_excel(wb):
+        xlmns = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+        if wb.loaded_theme is None:
+            return []
+        root = fromstring(wb.loaded_theme)
+        theme_element = root.find(QName(xlmns, 'themeElements').text)
+        color_schemes = theme_element.findall(QName(xlmns, 'clrScheme').text)
+        colors = []
+        for colorScheme in color_schemes:
+            for tag in ['lt1', 'dk1', 'lt2', 'dk2', 'accent1', 'accent2', 'accent3', 'accent4', 'accent5', 'accent6']:
+                accent = list(colorScheme.find(QName(xlmns, tag).text))[0]
+                if 'window' in accent.attrib['val']:
+                    colors.append(accent.attrib['lastClr'])
+                else:
+                    colors.append(accent.attrib['val'])
+        return colors
+
+    @staticmethod
+    def _get_sheet(wb, sheet_name):
+        if isinstance(sheet_name, (str_type, unicode_type)):
+            return wb[sheet_name]
+        elif isinstance(sheet_name, int):
+            return wb.worksheets[sheet_name]
+        raise TypeError("'sheet_name' must be a string or int, got {} instead".format(type(sheet_name)))
+
+    @classmethod
+    def _get_style_reader(cls, wb, read_only=False, read_comments=False, lazy_style=False, use_openpyxl_styles=False,
+                          share_styles=False):
+        """Returns a function that returns the style object to store for a cell of the given workbook.
+        See read_excel for the arguments.
+        """
+
+        if use_openpyxl_styles:
+            return lambda current_cell: current_cell
+
+        theme_colors = cls._get_scheme_colors_from_excel(wb)
+        styles_by_style_array = {}
+
+        def get_styler(current_cell):
+            if read_only:
+                style_array = current_cell.style_array
+                comment = None
+            else:
+                style_array = current_cell._style
+                comment = read_comments and current_cell.comment
+            # cells with the same openpyxl style array share a single Styler that is converted only once.
+            # Cells that are missing from the sheet have no style array
+            key = None if style_array is None else tuple(style_array)
+            if comment:
+                key += (comment.author, comment.text)
+            try:
+                styler_obj = styles_by_style_array[key]
+            except KeyError:
+                if lazy_style:
+                    styler_obj = LazyStyler(current_cell, theme_colors, comment, share_styles)
+                else:
+                    styler_obj = Styler.from_openpyxl_style(current_cell, theme_colors, comment).freeze()
+                styles_by_style_array[key] = styler_obj
+            # lazy styles are copied when they are resolved
+            if share_styles or lazy_style:
+                return styler_obj
+            return styler_obj.thaw()
+
+        return get_styler
+
     @classmethod
     @deprecated_kwargs(('sheetname',))
     def read_excel(cls, path, sheet_name=0, read_style=False, use_openpyxl_styles=False,
-                   read_comments=False, **kwargs):
+                   read_comments=False, columnar=False, read_only=False, lazy_style=False, share_styles=False, **kwargs):
         """Creates a StyleFrame object from an existing Excel.
 
         :param str path: The path to the Excel file to read.
@@ -162,69 +455,205 @@ class StyleFrame(object):
             Defaults to True for backward compatibility.
         :param bool read_comments: If True cells' comments will be loaded to the returned StyleFrame object. Note
             that reading comments without reading styles is currently not supported.
+        :param bool columnar: If True the returned StyleFrame object will store its styles in a columnar manner.
+            See StyleFrame's columnar argument.
+        :param bool read_only: If True (and read_style is also True) the sheet is read with openpyxl's read-only mode,
+            streaming its rows instead of keeping the whole worksheet in memory. Columns width, rows height and
+            comments are not available in this mode.
+        :param bool lazy_style: If True (and read_style is also True) each distinct style of the sheet is kept as its
+            openpyxl style objects and converted to a Styler object only when a cell with that style is first
+            accessed. Useful when the styles are mostly written back as they are. Can not be used together with
+            use_openpyxl_styles.
+        :param bool share_styles: If True (and read_style is also True) cells with the same style share a single
+            frozen Styler object. See StyleFrame's share_styles argument.
         :param kwargs: Any keyword argument pandas' `read_excel` supports.
         :rtype: StyleFrame
         """
 
-        def _get_scheme_colors_from_excel(wb):
-            xlmns = 'http://schemas.openxmlformats.org/drawingml/2006/main'
-            if wb.loaded_theme is None:
-                return []
-            root = fromstring(wb.loaded_theme)
-            theme_element = root.find(QName(xlmns, 'themeElements').text)
-            color_schemes = theme_element.findall(QName(xlmns, 'clrScheme').text)
-            colors = []
-            for colorScheme in color_schemes:
-                for tag in ['lt1', 'dk1', 'lt2', 'dk2', 'accent1', 'accent2', 'accent3', 'accent4', 'accent5', 'accent6']:
-                    accent = list(colorScheme.find(QName(xlmns, tag).text))[0]
-                    if 'window' in accent.attrib['val']:
-                        colors.append(accent.attrib['lastClr'])
-                    else:
-                        colors.append(accent.attrib['val'])
-            return colors
-
-        def _read_style():
-            wb = load_workbook(path)
-            if isinstance(sheet_name, (str_type, unicode_type)):
-                sheet = wb[sheet_name]
-            elif isinstance(sheet_name, int):
-                sheet = wb.worksheets[sheet_name]
+        def _read_style(wb):
+            sheet = cls._get_sheet(wb, sheet_name)
+            # the styles of a columnar StyleFrame are always shared
+            get_style = cls._get_style_reader(wb, read_only, read_comments, lazy_style, use_openpyxl_styles,
+                                              share_styles or columnar)
+            if columnar:
+                table = sf._styles.table
             else:
-                raise TypeError("'sheet_name' must be a string or int, got {} instead".format(type(sheet_name)))
-            theme_colors = _get_scheme_colors_from_excel(wb)
-            for col_index, col_name in enumerate(sf.columns, start=1):
-                column_cell = sheet.cell(row=1, column=col_index)
-                if use_openpyxl_styles:
-                    style_object = column_cell
-                else:
-                    style_object = Styler.from_openpyxl_style(column_cell, theme_colors,
-                                                              read_comments and column_cell.comment)
-                sf.columns[col_index - 1].style = style_object
-                for row_index, sf_index in enumerate(sf.index, start=2):
-                    current_cell = sheet.cell(row=row_index, column=col_index)
-                    if use_openpyxl_styles:
-                        style_object = current_cell
+                containers = sf.data_df.values
+            # in read-only mode the rows are streamed, cells missing from the file are unstyled
+            default_cell = ReadOnlyCell(sheet, 1, 1, None) if read_only else None
+            rows = sheet.iter_rows(min_row=1, max_row=len(sf) + 1, min_col=1, max_col=len(sf.columns))
+            for row_index, row in enumerate(rows):
+                for col_index, current_cell in enumerate(row):
+                    if read_only and not isinstance(current_cell, ReadOnlyCell):
+                        current_cell = default_cell
+                    style_object = get_style(current_cell)
+                    if row_index == 0:
+                        if columnar:
+                            sf._styles.set_headers(col_index, style_object)
+                        else:
+                            sf.data_df.columns[col_index].style = style_object
+                    elif columnar:
+                        sf._styles.cells[row_index - 1, col_index] = table.add(style_object)
                     else:
-                        style_object = Styler.from_openpyxl_style(current_cell, theme_colors,
-                                                                  read_comments and current_cell.comment)
-                    sf.at[sf_index, col_name].style = style_object
-                    sf._rows_height[row_index] = sheet.row_dimensions[row_index].height
-
+                        containers[row_index - 1, col_index].style = style_object
+
+            if read_only:
+                # dimensions are not available in read-only mode
+                return
+            for row_index in range(2, len(sf) + 2):
+                sf._rows_height[row_index] = sheet.row_dimensions[row_index].height
+            for col_name in sf.columns:
                 sf._columns_width[col_name] = sheet.column_dimensions[sf._get_column_as_letter(sheet, col_name)].width
 
         if 'sheetname' in kwargs:
             sheet_name = kwargs.pop('sheetname')
 
-        sf = cls(pd.read_excel(path, sheet_name, **kwargs))
-        if read_style:
-            _read_style()
-            sf._has_custom_headers_style = True
+        if read_only and read_comments:
+            raise ValueError('Comments can not be read in read-only mode')
+        if lazy_style and use_openpyxl_styles:
+            raise ValueError('lazy_style can not be used together with use_openpyxl_styles')
+
+        if not read_style:
+            return cls(pd.read_excel(path, sheet_name, **kwargs), columnar=columnar, share_styles=share_styles)
+
+        # the workbook is parsed once, for both the values and the styles
+        wb = load_workbook(path, read_only=read_only, data_only=True)
+        try:
+            # pandas closes the workbooks it reads, but not the ExcelFile objects it is given
+            values_source = pd.ExcelFile(wb, engine='openpyxl')
+        except (TypeError, ValueError):
+            # older pandas versions can only read from a path
+            values_source = path
+        try:
+            sf = cls(pd.read_excel(values_source, sheet_name, **kwargs), columnar=columnar, share_styles=share_styles)
+            _read_style(wb)
+        finally:
+            wb.close()
+        sf._has_custom_headers_style = True
         return sf
 
+    @classmethod
+    def read_excel_chunks(cls, path, chunksize, sheet_name=0, read_style=False, use_openpyxl_styles=False,
+                          columnar=False, lazy_style=False, share_styles=False):
+        """Reads an existing Excel sheet in chunks, yielding a StyleFrame object for every chunksize rows.
+
+        The sheet is streamed with openpyxl's read-only mode, so only a single chunk is kept in memory at a time
+        regardless of the number of rows in the sheet. The first row of the sheet is used as the headers of all the
+        chunks, and the index of each chunk continues the index of the previous one.
+        Columns width and rows height are read as well. The rows height of each chunk is relative to the chunk, ie
+        the height of the first row of a chunk is always stored for row 2.
+
+        :param str path: The path to the Excel file to read.
+        :param int chunksize: The number of rows in each chunk.
+        :param str|int sheet_name: The sheet name to read. If an integer is provided then it be used as a zero-based
+            sheet index
+        :param bool read_style: If True the sheet's style will be loaded to the returned StyleFrame objects.
+        :param bool use_openpyxl_styles: See read_excel.
+        :param bool columnar: See read_excel.
+        :param bool lazy_style: See read_excel.
+        :param bool share_styles: See read_excel.
+        :rtype: collections.Iterator
+        """
+
+        def get_headers(header_row):
+            return [value if value is not None else 'Unnamed: {}'.format(col_index)
+                    for col_index, value in enumerate(cell_obj.value for cell_obj in header_row)]
+
+        def fit_row(row):
+            # rows missing from the file are empty, and rows may be shorter or longer than the headers
+            row = tuple(current_cell if isinstance(current_cell, ReadOnlyCell) else default_cell
+                        for current_cell in row[:columns_count])
+            return row + (default_cell,) * (columns_count - len(row))
+
+        def create_chunk(rows, first_row_index):
+            sf = cls(pd.DataFrame([[current_cell.value for current_cell in row] for row in rows], columns=headers,
+                                  index=range(first_row_index, first_row_index + len(rows))),
+                     columnar=columnar, share_styles=share_styles)
+            if read_style:
+                if columnar:
+                    table = sf._styles.table
+                    for col_index, style_object in enumerate(headers_style):
+                        sf._styles.set_headers(col_index, style_object)
+                    for row_index, row in enumerate(rows):
+                        sf._styles.cells[row_index] = [table.add(get_style(current_cell)) for current_cell in row]
+                else:
+                    # the headers style is read once for all the chunks
+                    for column, style_object in zip(sf.data_df.columns, headers_style):
+                        column.style = cls._get_cell_style(style_object, share_styles)
+                    containers = sf.data_df.values
+                    for row_index, row in enumerate(rows):
+                        for col_index, current_cell in enumerate(row):
+                            containers[row_index, col_index].style = get_style(current_cell)
+                sf._has_custom_headers_style = True
+            # sheet rows are shifted by the rows of the previous chunks, the headers row is always row 1
+            rows_height = dimensions.rows_height_until(first_row_index + len(rows) + 1)
+            sf._rows_height = {row_index - first_row_index: height for row_index, height in rows_height.items()}
+            if header_height is not None:
+                sf._rows_height[1] = header_height
+            sf._columns_width = {header: dimensions.columns_width[col_index]
+                                 for col_index, header in enumerate(headers, start=1)
+                                 if col_index in dimensions.columns_width}
+            return sf
+
+        if not isinstance(chunksize, int) or chunksize < 1:
+            raise ValueError('chunksize must be a positive integer, got {} instead'.format(chunksize))
+        if lazy_style and use_openpyxl_styles:
+            raise ValueError('lazy_style can not be used together with use_openpyxl_styles')
+
+        wb = load_workbook(path, read_only=True, data_only=True)
+        dimensions = None
+        try:
+            sheet = cls._get_sheet(wb, sheet_name)
+            dimensions = SheetDimensionsReader(sheet)
+            get_style = cls._get_style_reader(wb, read_only=True, lazy_style=lazy_style,
+                                              use_openpyxl_styles=use_openpyxl_styles,
+                                              share_styles=share_styles or columnar)
+            default_cell = ReadOnlyCell(sheet, 1, 1, None)
+            rows = sheet.iter_rows(min_row=1, max_col=sheet.max_column)
+            try:
+                header_row = next(rows)
+            except StopIteration:
+                return
+            headers = get_headers(header_row)
+            columns_count = len(headers)
+            headers_style = [get_style(current_cell) for current_cell in fit_row(header_row)] if read_style else None
+            header_height = dimensions.rows_height_until(1).get(1)
+
+            chunk_rows = []
+            first_row_index = 0
+            for row in rows:
+                chunk_rows.append(fit_row(row))
+                if len(chunk_rows) == chunksize:
+                    yield create_chunk(chunk_rows, first_row_index)
+                    first_row_index += chunksize
+                    chunk_rows = []
+            if chunk_rows:
+                yield create_chunk(chunk_rows, first_row_index)
+        finally:
+            if dimensions is not None:
+                dimensions.close()
+            wb.close()
+
     # noinspection PyPep8Naming
     @classmethod
-    def ExcelWriter(cls, path):
-        return pd.ExcelWriter(path, engine='openpyxl')
+    def ExcelWriter(cls, path, write_only=False):
+        """
+        :param str path: The path of the Excel file to create
+        :param bool write_only: If True, the workbook is created in openpyxl's write-only mode and sheets are
+            streamed to the file row by row by StyleFrame.to_excel
+        :rtype: pandas.ExcelWriter
+        """
+
+        if not write_only:
+            return pd.ExcelWriter(path, engine='openpyxl')
+        try:
+            excel_writer = pd.ExcelWriter(path, engine='openpyxl', engine_kwargs={'write_only': True})
+        except TypeError:
+            excel_writer = pd.ExcelWriter(path, engine='openpyxl')
+        # older pandas versions ignore engine_kwargs
+        if not excel_writer.book.write_only:
+            excel_writer.book = Workbook(write_only=True)
+        return excel_writer
 
     @property
     def row_indexes(self):
@@ -241,7 +670,8 @@ class StyleFrame(object):
 
     def to_excel(self, excel_writer='output.xlsx', sheet_name='Sheet1',
                  allow_protection=False, right_to_left=False, columns_to_hide=None, row_to_add_filters=None,
-                 columns_and_rows_to_freeze=None, best_fit=None, **kwargs):
+                 columns_and_rows_to_freeze=None, best_fit=None, write_only=False, processes=1, direct_xml=False,
+                 font_metrics=False, **kwargs):
         """Saves the dataframe to excel and applies the styles.
 
         :param str|pandas.ExcelWriter excel_writer: File path or existing ExcelWriter
@@ -254,6 +684,21 @@ class StyleFrame(object):
         :param None|str columns_and_rows_to_freeze: column and row string to freeze for example: C3 will freeze columns: A,B and rows: 1,2.
         :param None|str|list|tuple|set best_fit: single column, list, set or tuple of columns names to attempt to best fit the width
                                 for.
+        :param bool write_only: If True, the sheet is streamed row by row with the styles already attached to the cells,
+                                so the worksheet is never kept in memory. Requires a file path or an ExcelWriter created
+                                with StyleFrame.ExcelWriter(path, write_only=True), and is used automatically for the
+                                latter. Only na_rep, float_format and inf_rep are supported out of the pandas arguments.
+        :param None|int processes: The number of processes the rows are written by in write-only mode. The rows are
+                                split into ranges, each written by a worker process, and the sheet is identical to
+                                the one written by a single process. None uses all the CPUs.
+        :param bool direct_xml: If True, the rows are written in write-only mode as xml that is generated directly from
+                                the values and the styles, without creating an openpyxl cell for every value, which is
+                                much faster. The sheet is the same as the one written with openpyxl cells. Sheets with
+                                comments are written with openpyxl cells. The rows are written by a single process,
+                                whatever processes is.
+        :param bool font_metrics: If True, the width of the best_fit columns is computed from the widths of the
+                                characters in the font, font size and boldness of each cell's style instead of from the
+                                number of characters.
 
         See Pandas.DataFrame.to_excel documentation about other arguments
         """
@@ -264,6 +709,25 @@ class StyleFrame(object):
         startcol = kwargs.pop('startcol', 0)
         startrow = kwargs.pop('startrow', 0)
         na_rep = kwargs.pop('na_rep', '')
+        float_format = kwargs.pop('float_format', None)
+        inf_rep = kwargs.pop('inf_rep', 'inf')
+
+        if isinstance(excel_writer, (str_type, unicode_type)):
+            excel_writer = self.ExcelWriter(excel_writer, write_only=write_only)
+        elif write_only and not excel_writer.book.write_only:
+            raise ValueError('write_only requires an ExcelWriter created by {}.ExcelWriter(path, write_only=True)'
+                             .format(type(self).__name__))
+
+        if processes is not None and processes < 1:
+            raise ValueError('processes must be None or a positive integer, got {} instead'.format(processes))
+
+        if excel_writer.book.write_only:
+            return self._to_excel_write_only(excel_writer, sheet_name, allow_protection, right_to_left,
+                                             columns_to_hide, row_to_add_filters, columns_and_rows_to_freeze,
+                                             best_fit, header, index, startcol, startrow, na_rep, float_format,
+                                             inf_rep, processes, direct_xml, font_metrics, **kwargs)
+        if processes != 1 or direct_xml:
+            raise ValueError('processes and direct_xml require write_only=True')
 
         def get_values(x):
             if isinstance(x, Container):
@@ -300,97 +764,97 @@ class StyleFrame(object):
                                                                                 end_letter=end_letter,
                                                                                 end_index=end_index)
 
-        if len(self.data_df) > 0:
-            export_df = self.data_df.applymap(get_values)
+        derived_styles = {}
 
+        # values are written together with their styles, unless there are arguments that only pandas handles
+        write_values = not kwargs
+        if write_values:
+            if sheet_name in excel_writer.book.sheetnames:
+                sheet = excel_writer.book[sheet_name]
+            else:
+                sheet = excel_writer.book.create_sheet(sheet_name)
+                # older pandas versions keep track of the sheets themselves
+                excel_writer.sheets[sheet_name] = sheet
+            get_value = self._get_value_converter(na_rep, float_format, inf_rep)
         else:
-            export_df = deepcopy(self.data_df)
+            if self._columnar:
+                export_df = self.data_df
+            else:
+                if len(self.data_df) > 0:
+                    export_df = self.data_df.applymap(get_values)
 
-        export_df.columns = [col.value for col in export_df.columns]
-        # noinspection PyTypeChecker
-        export_df.index = [row_index.value for row_index in export_df.index]
-        export_df.index.name = self.data_df.index.name
+                else:
+                    export_df = deepcopy(self.data_df)
 
-        if isinstance(excel_writer, (str_type, unicode_type)):
-            excel_writer = self.ExcelWriter(excel_writer)
+                export_df.columns = [col.value for col in export_df.columns]
+                # noinspection PyTypeChecker
+                export_df.index = [row_index.value for row_index in export_df.index]
+                export_df.index.name = self.data_df.index.name
 
-        export_df.to_excel(excel_writer, sheet_name=sheet_name, engine='openpyxl', header=header,
-                           index=index, startcol=startcol, startrow=startrow, na_rep=na_rep, **kwargs)
+            export_df.to_excel(excel_writer, sheet_name=sheet_name, engine='openpyxl', header=header,
+                               index=index, startcol=startcol, startrow=startrow, na_rep=na_rep,
+                               float_format=float_format, inf_rep=inf_rep, **kwargs)
+            sheet = excel_writer.sheets[sheet_name]
 
-        sheet = excel_writer.sheets[sheet_name]
+        style_cache = Styler.get_workbook_cache(excel_writer.book)
+        style_arrays = {}
 
         sheet.sheet_view.rightToLeft = right_to_left
 
-        self.data_df.fillna(Container('NaN'), inplace=True)
+        # openpyxl's rows and cols start from 1,1 while the dataframe is 0,0
+        first_data_row = startrow + (2 if header else 1)
 
         if index:
-            if self.data_df.index.name:
+            if header and self.data_df.index.name:
                 index_name_cell = sheet.cell(row=startrow + 1, column=startcol + 1)
-                index_name_cell.style = self._index_header_style.to_openpyxl_style()
-            for row_index, index in enumerate(self.data_df.index):
-                try:
-                    style_to_apply = index.style.to_openpyxl_style()
-                except AttributeError:
-                    style_to_apply = index.style
-                current_cell = sheet.cell(row=startrow + row_index + 2, column=startcol + 1)
-                current_cell.style = style_to_apply
-                if isinstance(index.style, Styler):
-                    current_cell.comment = index.style.generate_comment()
-                else:
-                    if hasattr(index.style, 'comment'):
-                        index.style.comment.parent = None
-                        current_cell.comment = index.style.comment
+                if write_values:
+                    index_name_cell.value = self.data_df.index.name
+                self._style_cell(index_name_cell, self._index_header_style, style_cache, style_arrays)
+            for row_index, index_value in enumerate(self.data_df.index.tolist()):
+                index_style = self._styles.get_index(row_index) if self._columnar else index_value.style
+                current_cell = sheet.cell(row=first_data_row + row_index, column=startcol + 1)
+                if write_values:
+                    current_cell.value = get_value(index_value)
+                self._style_cell(current_cell, index_style, style_cache, style_arrays)
 
             startcol += 1
 
         if header and not self._has_custom_headers_style:
             self.apply_headers_style(Styler.default_header_style())
 
-        # Iterating over the dataframe's elements and applying their styles
-        # openpyxl's rows and cols start from 1,1 while the dataframe is 0,0
+        # Iterating over the dataframe's elements, writing their values and applying their styles
+        default_style = Styler()
         for col_index, column in enumerate(self.data_df.columns):
-            try:
-                style_to_apply = column.style.to_openpyxl_style()
-            except AttributeError:
-                style_to_apply = column.style
-            column_header_cell = sheet.cell(row=startrow + 1, column=col_index + startcol + 1)
-            column_header_cell.style = style_to_apply
-            if isinstance(column.style, Styler):
-                column_header_cell.comment = column.style.generate_comment()
+            column_value = column if self._columnar else column.value
+            if header:
+                column_style = self._styles.get_header(col_index) if self._columnar else column.style
+                column_header_cell = sheet.cell(row=startrow + 1, column=col_index + startcol + 1)
+                if write_values:
+                    column_header_cell.value = column_value
+                self._style_cell(column_header_cell, column_style, style_cache, style_arrays)
+            is_best_fit = bool(best_fit) and column_value in best_fit
+            # walking each column by position as plain lists spares a pandas label lookup for every cell
+            column_values = self.data_df.iloc[:, col_index].tolist()
+            if self._columnar:
+                column_styles = [self._styles.table[style_id] for style_id in self._styles.cells[:, col_index].tolist()]
             else:
-                if hasattr(column.style, 'comment'):
-                    column.style.comment.parent = None
-                    column_header_cell.comment = column.style.comment
-            for row_index, index in enumerate(self.data_df.index):
-                current_cell = sheet.cell(row=row_index + startrow + 2, column=col_index + startcol + 1)
-                data_df_style = self.data_df.at[index, column].style
-                try:
-                    if '=HYPERLINK' in unicode_type(current_cell.value):
-                        data_df_style.font_color = utils.colors.blue
-                        data_df_style.underline = utils.underline.single
-                    else:
-                        if best_fit and column.value in best_fit:
-                            data_df_style.wrap_text = False
-                            data_df_style.shrink_to_fit = False
-                    try:
-                        style_to_apply = data_df_style.to_openpyxl_style()
-                    except AttributeError:
-                        style_to_apply = data_df_style
-                    current_cell.style = style_to_apply
-                    if isinstance(data_df_style, Styler):
-                        current_cell.comment = data_df_style.generate_comment()
-                    else:
-                        if hasattr(data_df_style, 'comment'):
-                            data_df_style.comment.parent = None
-                            current_cell.comment = data_df_style.comment
-                except AttributeError:  # if the element in the dataframe is not Container creating a default style
-                    current_cell.style = Styler().to_openpyxl_style()
+                # if the element in the dataframe is not a Container it gets the default style
+                column_styles = [value.style if isinstance(value, Container) else default_style
+                                 for value in column_values]
+            excel_column = col_index + startcol + 1
+            for row_index, (value, data_df_style) in enumerate(zip(column_values, column_styles)):
+                current_cell = sheet.cell(row=first_data_row + row_index, column=excel_column)
+                if write_values:
+                    current_cell.value = get_value(value)
+                cell_value = current_cell.value
+                is_hyperlink = isinstance(cell_value, (str_type, unicode_type)) and '=HYPERLINK' in cell_value
+                data_df_style = self._get_style_to_write(data_df_style, is_hyperlink, is_best_fit, derived_styles)
+                self._style_cell(current_cell, data_df_style, style_cache, style_arrays)
 
         if best_fit:
             if not isinstance(best_fit, (list, set, tuple)):
                 best_fit = [best_fit]
-            self.set_column_width_dict({column: (max(self.data_df[column].astype(str).str.len()) + self.A_FACTOR) * self.P_FACTOR
-                                        for column in best_fit})
+            self._set_best_fit_widths(best_fit, font_metrics)
 
         for column in self._columns_width:
             column_letter = self._get_column_as_letter(sheet, column, startcol)
@@ -439,11 +903,359 @@ class StyleFrame(object):
 
         return excel_writer
 
+    @staticmethod
+    def _get_values_fingerprint(series):
+        """Returns a digest of the values of a column whose longest value takes much longer to measure than to digest
+        (floats, dates and durations), or None for other columns. Ints and bools are measured faster than they are
+        digested, and objects, such as the strings of a column, can't be digested by their raw memory.
+
+        :param pandas.Series series: Raw (non-Container) values
+        :rtype: None|tuple
+        """
+
+        values = series.values
+        if not isinstance(values, np.ndarray) or values.dtype.kind not in 'fcmM':
+            return None
+        return values.dtype.str, hashlib.sha1(np.ascontiguousarray(values).view(np.uint8)).digest()
+
+    def _set_best_fit_widths(self, best_fit, font_metrics=False):
+        """Sets the width of the given columns by the length of their longest value.
+        The lengths of the columns that have a fingerprint (see _get_values_fingerprint) are cached until their
+        values change. The values of Containers may change in place, so they are always measured.
+
+        :param list|set|tuple best_fit: Columns names
+        :param bool font_metrics: If True the widths are computed by the fonts of the cells' styles instead
+        """
+
+        def unwrap(values):
+            return [value.value if isinstance(value, Container) else value for value in values]
+
+        columns_width = {}
+        for column in best_fit:
+            if font_metrics:
+                columns_width[column] = self._get_font_metrics_width(self.data_df.columns.get_loc(column))
+                continue
+            series = self.data_df[column]
+            column_key = column.value if isinstance(column, Container) else column
+            fingerprint = self._get_values_fingerprint(series) if self._columnar else None
+            cached = self._best_fit_lengths.get(column_key)
+            if fingerprint is not None and cached is not None and cached[0] == fingerprint:
+                length = cached[1]
+            else:
+                values = series if self._columnar else pd.Series(unwrap(series), dtype=object)
+                length = column_width.get_max_length(values)
+                if fingerprint is not None:
+                    self._best_fit_lengths[column_key] = (fingerprint, length)
+            columns_width[column] = (length + self.A_FACTOR) * self.P_FACTOR
+        self.set_column_width_dict(columns_width)
+
+    def _get_font_metrics_width(self, col_index):
+        """Returns the width of a column by the widths of its values' characters in the fonts of their styles.
+        The values are measured once for every distinct font the column's cells are written with.
+
+        :param int col_index:
+        :rtype: float
+        """
+
+        series = self.data_df.iloc[:, col_index]
+        if self._columnar:
+            values = series
+            style_ids = self._styles.cells[:, col_index]
+            styles = self._styles.table
+        else:
+            values = pd.Series([value.value if isinstance(value, Container) else value for value in series],
+                               dtype=object)
+            # the Containers of a column have few distinct styles, which are numbered in order of appearance
+            styles_positions = {}
+            styles = []
+            style_ids = np.empty(len(series), dtype=np.int64)
+            default_style = Styler()
+            for row_index, value in enumerate(series):
+                style = value.style if isinstance(value, Container) else default_style
+                style_id = styles_positions.get(style)
+                if style_id is None:
+                    style_id = styles_positions[style] = len(styles)
+                    styles.append(style)
+                style_ids[row_index] = style_id
+
+        fonts_style_ids = {}
+        for style_id in np.unique(style_ids).tolist():
+            fonts_style_ids.setdefault(column_width.get_font(styles[style_id]), []).append(style_id)
+        text_width = 0.0
+        for font, font_style_ids in fonts_style_ids.items():
+            font_values = values if len(fonts_style_ids) == 1 else values[np.isin(style_ids, font_style_ids)]
+            text_width = max(text_width,
+                             column_width.get_max_text_width(font_values, column_width.get_glyph_widths(*font)))
+        return column_width.get_column_width(text_width)
+
+    @staticmethod
+    def _get_style_to_write(style, is_hyperlink, is_best_fit, derived_styles):
+        # hyperlinks and best fit columns are written with a derived style so the stored style isn't modified
+        if not (is_hyperlink or is_best_fit) or not isinstance(style, Styler):
+            return style
+        # cells with equal styles share a derived style, whether or not they share the same Styler object
+        key = (style, is_hyperlink)
+        try:
+            return derived_styles[key]
+        except KeyError:
+            if is_hyperlink:
+                overrides = Styler(font_color=utils.colors.blue, underline=utils.underline.single)
+            else:
+                overrides = Styler(wrap_text=False, shrink_to_fit=False)
+            derived_style = derived_styles[key] = Styler.combine(style, overrides).freeze()
+            return derived_style
+
+    @staticmethod
+    def _get_value_converter(na_rep, float_format=None, inf_rep='inf'):
+        """Returns a function that converts a value (or a Container's value) to the value written to the sheet,
+        the same way pandas' ExcelFormatter and openpyxl writer do. Timedeltas are written as a number of days and
+        values of any type that pandas doesn't write as it is are written as strings.
+        The number format pandas gives timedeltas is not kept, since the style of the cell replaces it.
+        """
+
+        def get_value(value):
+            if isinstance(value, Container):
+                value = value.value
+            value_type = type(value)
+            if value_type is unicode_type or value_type is int or value_type is bool:
+                return value
+            if value_type is float:
+                if value != value:
+                    return na_rep
+            elif is_scalar(value) and pd.isnull(value):
+                return na_rep
+            if value_type is float or is_float(value):
+                if value == np.inf:
+                    return inf_rep
+                if value == -np.inf:
+                    return '-' + inf_rep
+                if float_format is not None:
+                    return float(float_format % value)
+                return float(value)
+            if getattr(value, 'tzinfo', None) is not None:
+                raise ValueError('Excel does not support datetimes with timezones. '
+                                 'Please ensure that datetimes are timezone unaware before writing to Excel.')
+            if is_integer(value):
+                return int(value)
+            if is_bool(value):
+                return bool(value)
+            if isinstance(value, dt.date):
+                return value
+            if isinstance(value, dt.timedelta):
+                return value.total_seconds() / 86400.0
+            if isinstance(value, str_type):
+                return value
+            return unicode_type(value)
+
+        return get_value
+
+    @staticmethod
+    def _style_cell(current_cell, style, style_cache, style_arrays):
+        """
+        :param current_cell: openpyxl Cell or WriteOnlyCell object
+        :param style: Styler or openpyxl style object
+        :param StyleCache style_cache:
+        :param dict style_arrays: style -> openpyxl StyleArray of the cells already styled with it
+        """
+
+        if isinstance(style, Styler):
+            try:
+                current_cell._style = copy(style_arrays[style])
+            except KeyError:
+                # assigning a NamedStyle registers it with the workbook, which is too slow to do for every cell.
+                # Once it is registered the cells only need a copy of its style array
+                current_cell.style = style.to_openpyxl_style(style_cache)
+                style_arrays[style] = copy(current_cell._style)
+            current_cell.comment = style.generate_comment()
+            return
+        try:
+            current_cell.style = style.to_openpyxl_style(style_cache)
+        except AttributeError:
+            current_cell.style = style
+        if hasattr(style, 'comment'):
+            style.comment.parent = None
+            current_cell.comment = style.comment
+
+    def _to_excel_write_only(self, excel_writer, sheet_name, allow_protection, right_to_left, columns_to_hide,
+                             row_to_add_filters, columns_and_rows_to_freeze, best_fit, header, index, startcol,
+                             startrow, na_rep, float_format, inf_rep, processes=1, direct_xml=False, font_metrics=False,
+                             **kwargs):
+        """Streams the StyleFrame to a write-only sheet, one row of styled WriteOnlyCell objects at a time.
+        Everything that openpyxl writes before the rows (columns width, rows height, freeze panes) is set up first.
+        """
+
+        if kwargs:
+            raise TypeError('{} are not supported when writing in write-only mode'.format(', '.join(sorted(kwargs))))
+
+        def within_sheet_boundaries(row=1, column='A'):
+            return 1 <= int(row) <= max_row and 1 <= cell.column_index_from_string(column) <= max_column
+
+        def get_range_of_cells(row_index=None, columns=None):
+            if columns is None:
+                columns = self.data_df.columns
+            start_letter = self._get_column_as_letter(sheet, columns[0], startcol, max_column)
+            end_letter = self._get_column_as_letter(sheet, columns[-1], startcol, max_column)
+            if row_index is None:
+                start_index = startrow + 1
+                end_index = start_index + len(self)
+            else:
+                start_index = end_index = startrow + row_index + 1
+            return '{}{}:{}{}'.format(start_letter, start_index, end_letter, end_index)
+
+        sheet = excel_writer.book.create_sheet(sheet_name)
+        # older pandas versions keep track of the sheets themselves
+        excel_writer.sheets[sheet_name] = sheet
+        style_cache = Styler.get_workbook_cache(excel_writer.book)
+        style_arrays = {}
+        derived_styles = {}
+        get_value = self._get_value_converter(na_rep, float_format, inf_rep)
+
+        # like in the regular path, the default headers style is applied after the index header is styled
+        index_header_style = self._index_header_style
+        if header and not self._has_custom_headers_style:
+            self.apply_headers_style(Styler.default_header_style())
+
+        if index:
+            startcol += 1
+        max_row = startrow + len(self) + (1 if header else 0)
+        max_column = startcol + len(self.columns)
+        sheet.sheet_view.rightToLeft = right_to_left
+
+        if best_fit:
+            if not isinstance(best_fit, (list, set, tuple)):
+                best_fit = [best_fit]
+            self._set_best_fit_widths(best_fit, font_metrics)
+
+        for column in self._columns_width:
+            column_letter = self._get_column_as_letter(sheet, column, startcol, max_column)
+            sheet.column_dimensions[column_letter].width = self._columns_width[column]
+
+        if columns_to_hide:
+            if not isinstance(columns_to_hide, (list, set, tuple)):
+                columns_to_hide = [columns_to_hide]
+            for column in columns_to_hide:
+                column_letter = self._get_column_as_letter(sheet, column, startcol, max_column)
+                sheet.column_dimensions[column_letter].hidden = True
+
+        for row in self._rows_height:
+            if within_sheet_boundaries(row=(row + startrow)):
+                sheet.row_dimensions[startrow + row].height = self._rows_height[row]
+            else:
+                raise IndexError('row: {} is out of range'.format(row))
+
+        if row_to_add_filters is not None:
+            try:
+                row_to_add_filters = int(row_to_add_filters)
+                if not within_sheet_boundaries(row=(row_to_add_filters + startrow + 1)):
+                    raise IndexError('row: {} is out of rows range'.format(row_to_add_filters))
+                sheet.auto_filter.ref = get_range_of_cells(row_index=row_to_add_filters)
+            except (TypeError, ValueError):
+                raise TypeError("row must be an index and not {}".format(type(row_to_add_filters)))
+
+        if columns_and_rows_to_freeze is not None:
+            if not isinstance(columns_and_rows_to_freeze, (str_type, unicode_type)) or len(columns_and_rows_to_freeze) < 2:
+                raise TypeError("columns_and_rows_to_freeze must be a str for example: 'C3'")
+            if not within_sheet_boundaries(column=columns_and_rows_to_freeze[0]):
+                raise IndexError("column: %s is out of columns range." % columns_and_rows_to_freeze[0])
+            if not within_sheet_boundaries(row=columns_and_rows_to_freeze[1]):
+                raise IndexError("row: %s is out of rows range." % columns_and_rows_to_freeze[1])
+            sheet.freeze_panes = columns_and_rows_to_freeze
+
+        if allow_protection:
+            sheet.protection.autoFilter = False
+            sheet.protection.enable()
+
+        for cond_formatting in self._cond_formatting:
+            sheet.conditional_formatting.add(get_range_of_cells(columns=cond_formatting.columns),
+                                             cond_formatting.rule)
+
+        leading_columns = startcol - 1 if index else startcol
+        rows = self._iter_write_only_rows(sheet, header, index, leading_columns, best_fit, get_value,
+                                          index_header_style, style_cache, style_arrays, derived_styles)
+        # the ranges of rows are written by openpyxl's serializer, so direct_xml sheets are written by a single process
+        written = processes != 1 and not direct_xml and row_ranges.append_rows_in_parallel(
+            self, sheet, rows, processes, startrow, header, index, leading_columns, best_fit,
+            (na_rep, float_format, inf_rep), index_header_style, style_cache, style_arrays)
+        if not written and direct_xml:
+            written = xml_writer.write_rows_xml(self, sheet, startrow, header, index, leading_columns, best_fit,
+                                                (na_rep, float_format, inf_rep), index_header_style, style_cache,
+                                                style_arrays)
+        if not written:
+            for _ in range(startrow):
+                sheet.append([])
+            for row in rows:
+                sheet.append(row)
+
+        return excel_writer
+
+    def _take_rows(self, start, stop):
+        """Returns a StyleFrame with the rows in the given range of positions, sharing the rest of its attributes"""
+
+        sf = copy(self)
+        sf.data_df = self.data_df.iloc[start:stop]
+        sf._known_attrs = self._get_known_attrs(sf.data_df)
+        sf._best_fit_lengths = {}
+        if self._columnar:
+            sf._styles = self._styles.take(rows=np.arange(start, stop))
+        return sf
+
+    def _iter_write_only_rows(self, sheet, header, index, leading_columns, best_fit, get_value, index_header_style,
+                              style_cache, style_arrays, derived_styles):
+        """Yields the rows of the StyleFrame, starting with the headers row if header is True, as lists of styled
+        WriteOnlyCell objects ready to be appended to a write-only sheet.
+        """
+
+        def styled_cell(value, style):
+            current_cell = WriteOnlyCell(sheet, value=value)
+            self._style_cell(current_cell, style, style_cache, style_arrays)
+            return current_cell
+
+        leading_cells = [None] * leading_columns
+        if header:
+            row = list(leading_cells)
+            if index:
+                index_name = self.data_df.index.name
+                row.append(None if index_name is None else styled_cell(index_name, index_header_style))
+            for col_index, column in enumerate(self.data_df.columns):
+                if self._columnar:
+                    row.append(styled_cell(column, self._styles.get_header(col_index)))
+                else:
+                    row.append(styled_cell(column.value, column.style))
+            yield row
+
+        if best_fit:
+            best_fit_columns = [column in best_fit for column in self.data_df.columns]
+        else:
+            best_fit_columns = [False] * len(self.data_df.columns)
+        default_style = Styler()
+        index_values = self.data_df.index.tolist()
+        for row_index, values in enumerate(self.data_df.itertuples(index=False, name=None)):
+            row = list(leading_cells)
+            if index:
+                index_value = index_values[row_index]
+                if self._columnar:
+                    row.append(styled_cell(get_value(index_value), self._styles.get_index(row_index)))
+                else:
+                    row.append(styled_cell(get_value(index_value), index_value.style))
+            if self._columnar:
+                styles = [self._styles.table[style_id] for style_id in self._styles.cells[row_index].tolist()]
+            else:
+                styles = [value.style if isinstance(value, Container) else default_style for value in values]
+            for col_index, (value, style) in enumerate(zip(values, styles)):
+                value = get_value(value)
+                is_hyperlink = isinstance(value, (str_type, unicode_type)) and '=HYPERLINK' in value
+                style = self._get_style_to_write(style, is_hyperlink, best_fit_columns[col_index], derived_styles)
+                row.append(styled_cell(value, style))
+            yield row
+
     def apply_style_by_indexes(self, indexes_to_style, styler_obj, cols_to_style=None, height=None,
                                complement_style=None, complement_height=None, overwrite_default_style=True):
         """Applies a certain style to the provided indexes in the dataframe in the provided columns
 
-        :param list|tuple|int|Container indexes_to_style: indexes to which the provided style will be applied
+        :param list|tuple|int|Container|pandas.Index|numpy.ndarray|pandas.Series indexes_to_style: indexes to which
+            the provided style will be applied. Either index labels (a Container or pandas.Index, for example
+            sf[sf['a'] > 1]), row positions (int, or a list, tuple or array of ints) or a boolean mask of the rows
+            (a list, array or Series of bools, for example sf['a'] > 1). The whole block of rows is styled at once.
         :param Styler styler_obj: the styler object that contains the style which will be applied to indexes in indexes_to_style
         :param None|str|list|tuple|set cols_to_style: the columns to apply the style to, if not provided all the columns will be styled
         :param None|int|float height: height for rows whose indexes are in indexes_to_style
@@ -460,11 +1272,7 @@ class StyleFrame(object):
         if not isinstance(styler_obj, Styler):
             raise TypeError('styler_obj must be {}, got {} instead.'.format(Styler.__name__, type(styler_obj).__name__))
 
-        if isinstance(indexes_to_style, (list, tuple, int)):
-            indexes_to_style = self.index[indexes_to_style]
-
-        elif isinstance(indexes_to_style, Container):
-            indexes_to_style = pd.Index([indexes_to_style])
+        rows = self._get_rows_positions(indexes_to_style)
 
         default_number_formats = {pd_timestamp: utils.number_formats.default_date_time_format,
                                   dt.date: utils.number_formats.default_date_format,
@@ -476,37 +1284,247 @@ class StyleFrame(object):
             cols_to_style = [cols_to_style]
         elif cols_to_style is None:
             cols_to_style = list(self.data_df.columns)
+        cols = self.data_df.columns.get_indexer(list(cols_to_style))
+        if (cols == -1).any():
+            raise KeyError("one of the columns in {} wasn't found".format(cols_to_style))
 
         if overwrite_default_style:
-            style_to_apply = deepcopy(styler_obj)
+            style_to_apply = styler_obj.freeze()
         else:
-            style_to_apply = Styler.combine(self._default_style, styler_obj)
+            style_to_apply = Styler.combine(self._default_style, styler_obj).freeze()
 
-        for index in indexes_to_style:
-            if orig_number_format == utils.number_formats.general:
-                style_to_apply.number_format = default_number_formats.get(type(index.value),
-                                                                          utils.number_formats.general)
-            index.style = style_to_apply
-
-            for col in cols_to_style:
-                cell = self.iloc[self.index.get_loc(index), self.columns.get_loc(col)]
-                if orig_number_format == utils.number_formats.general:
-                    style_to_apply.number_format = default_number_formats.get(type(cell.value),
-                                                                              utils.number_formats.general)
+        if orig_number_format == utils.number_formats.general:
+            get_number_format = default_number_formats.get
+        else:
+            get_number_format = None
 
-                cell.style = style_to_apply
+        self._apply_style_by_positions(rows, cols, style_to_apply, get_number_format, style_index=True)
 
         if height:
             # Add offset 2 since rows do not include the headers and they starts from 1 (not 0).
-            rows_indexes_for_height_change = [self.index.get_loc(idx) + 2 for idx in indexes_to_style]
-            self.set_row_height(rows=rows_indexes_for_height_change, height=height)
+            self.set_row_height(rows=(rows + 2).tolist(), height=height)
 
         if complement_style:
-            self.apply_style_by_indexes(self.index.difference(indexes_to_style), complement_style, cols_to_style,
+            complement_rows = np.ones(len(self.data_df), dtype=bool)
+            complement_rows[rows] = False
+            self.apply_style_by_indexes(complement_rows, complement_style, cols_to_style,
                                         complement_height if complement_height else height)
 
         return self
 
+    def apply_style_by_condition(self, cols_to_style, condition, styler_obj, complement_style=None,
+                                 overwrite_default_style=True):
+        """Applies a certain style to the cells whose values meet a condition
+
+        :param None|str|list|tuple|set cols_to_style: the columns to apply the style to, if not provided all the columns will be styled
+        :param callable|str condition: Either a function that is called with the raw values of each column in
+            cols_to_style, as a pandas Series, and returns a boolean mask of the column's cells to style (for example
+            lambda values: values > 5), or an expression that pandas.DataFrame.eval evaluates over the raw values of
+            all the columns to a boolean mask of the rows to style (for example 'a > b').
+        :param Styler styler_obj: the styler object that contains the style which will be applied to the cells that meet
+            the condition
+        :param None|Styler complement_style: the styler object that contains the style which will be applied to the cells
+            that don't meet the condition
+        :param bool overwrite_default_style: If True, the default style (the style used when initializing StyleFrame)
+            will be overwritten. If False then the default style and the provided style wil be combined using
+            Styler.combine method.
+        :return: self
+        :rtype: StyleFrame
+        """
+
+        return self.apply_style_by_conditions(cols_to_style, [(condition, styler_obj)], complement_style,
+                                              overwrite_default_style)
+
+    def apply_style_by_conditions(self, cols_to_style, rules, complement_style=None, overwrite_default_style=True):
+        """Applies styles to the cells whose values meet conditions. The raw values are taken once for all the rules,
+        and each cell is styled by the first rule whose condition it meets.
+
+        :param None|str|list|tuple|set cols_to_style: the columns to apply the styles to, if not provided all the columns will be styled
+        :param list|tuple rules: (condition, styler_obj) pairs. See apply_style_by_condition about the conditions.
+        :param None|Styler complement_style: the styler object that contains the style which will be applied to the cells
+            that don't meet any of the conditions
+        :param bool overwrite_default_style: See apply_style_by_condition
+        :return: self
+        :rtype: StyleFrame
+        """
+
+        def get_mask(mask):
+            mask = np.asarray(mask)
+            if mask.dtype == object:
+                # missing values, for example of Series.str methods, don't meet the condition
+                mask = pd.Series(mask.ravel()).fillna(False).values.astype(bool).reshape(mask.shape)
+            elif mask.dtype != bool:
+                raise TypeError('condition must return a boolean mask, got {} instead'.format(mask.dtype))
+            if mask.ndim == 0:
+                return np.full(len(self.data_df), bool(mask))
+            if mask.shape != (len(self.data_df),):
+                raise IndexError('boolean mask of shape {} does not match the {} rows'.format(mask.shape,
+                                                                                            len(self.data_df)))
+            return mask
+
+        def get_style_to_apply(styler_obj):
+            if not isinstance(styler_obj, Styler):
+                raise TypeError('styler_obj must be {}, got {} instead.'.format(Styler.__name__,
+                                                                               type(styler_obj).__name__))
+            if overwrite_default_style:
+                return styler_obj.freeze()
+            return Styler.combine(self._default_style, styler_obj).freeze()
+
+        rules = list(rules)
+        if not rules:
+            raise ValueError('at least one rule must be provided')
+        for condition, _ in rules:
+            if not callable(condition) and not isinstance(condition, (str_type, unicode_type)):
+                raise TypeError('condition must be callable or str, got {} instead.'.format(type(condition).__name__))
+        # the last style is applied to the cells that meet none of the conditions
+        styles = [get_style_to_apply(styler_obj) for _, styler_obj in rules]
+        styles.append(None if complement_style is None else get_style_to_apply(complement_style))
+
+        if cols_to_style is not None and not isinstance(cols_to_style, (list, tuple, set)):
+            cols_to_style = [cols_to_style]
+        elif cols_to_style is None:
+            cols_to_style = list(self.data_df.columns)
+        cols = self.data_df.columns.get_indexer(list(cols_to_style))
+        if (cols == -1).any():
+            raise KeyError("one of the columns in {} wasn't found".format(cols_to_style))
+
+        values_df = self.data_df if self._columnar else self._unwrap_containers(self.data_df)
+        # expressions are evaluated once for all the columns
+        rows_masks = {rule_index: get_mask(values_df.eval(condition))
+                      for rule_index, (condition, _) in enumerate(rules)
+                      if isinstance(condition, (str_type, unicode_type))}
+        for col in cols:
+            values = values_df.iloc[:, col]
+            masks = [rows_masks[rule_index] if rule_index in rows_masks else get_mask(condition(values))
+                     for rule_index, (condition, _) in enumerate(rules)]
+            # the index of the first rule each cell meets, or len(rules) if it meets none of them
+            rules_indexes = np.select(masks, list(range(len(rules))), default=len(rules))
+            for rule_index, style in enumerate(styles):
+                rows = np.flatnonzero(rules_indexes == rule_index)
+                if style is not None and len(rows):
+                    self._apply_style_by_positions(rows, [col], style,
+                                                   default_number_format
+                                                   if style.number_format == utils.number_formats.general else None)
+        return self
+
+    def _get_rows_positions(self, indexes_to_style):
+        """Returns the positions of the rows to style
+
+        :param indexes_to_style: Index labels, row positions or a boolean mask of the rows.
+            See apply_style_by_indexes.
+        :rtype: numpy.ndarray
+        """
+
+        if isinstance(indexes_to_style, Container):
+            indexes_to_style = pd.Index([indexes_to_style])
+        elif isinstance(indexes_to_style, (list, tuple, int, np.integer, np.ndarray, pd.Series)):
+            positions = np.asarray(indexes_to_style)
+            if positions.dtype == bool:
+                if len(positions) != len(self.data_df):
+                    raise IndexError('boolean mask of length {} does not match the {} rows'.format(len(positions),
+                                                                                                 len(self.data_df)))
+                return np.flatnonzero(positions)
+            if positions.dtype.kind in 'iu' or positions.size == 0:
+                return np.atleast_1d(np.arange(len(self.data_df))[positions.astype(np.intp)])
+        if self._columnar:
+            return np.flatnonzero(self.data_df.index.isin(indexes_to_style))
+
+        def unwrap(values):
+            return [value.value if isinstance(value, Container) else value for value in values]
+
+        # Container objects are equal to their values, and matching the values is much faster than hashing the
+        # Container objects one by one
+        return np.flatnonzero(pd.Index(unwrap(self.data_df.index), dtype=object).isin(unwrap(indexes_to_style)))
+
+    def _apply_style_by_positions(self, rows, cols, style_to_apply, get_number_format=None, style_index=False):
+        """Sets the style of a block of cells
+
+        :param None|numpy.ndarray rows: row positions, all rows if None
+        :param numpy.ndarray cols: column positions
+        :param Styler style_to_apply:
+        :param None|callable get_number_format: If provided, called with the values' types. Cells for which it returns
+            a number format (of a date or a time) are styled with style_to_apply combined with that number format.
+            The values of columns with a dtype other than object are all of the same type, and the values of object
+            columns are only checked one by one if they may have dates or times.
+        :param bool style_index: If True, the index of the given rows will be styled as well
+        """
+
+        def get_style(value_type):
+            try:
+                return styles_by_type[value_type]
+            except KeyError:
+                number_format = get_number_format(value_type)
+                if number_format is None:
+                    style = style_to_apply
+                else:
+                    style = Styler.combine(style_to_apply, Styler(number_format=number_format)).freeze()
+                styles_by_type[value_type] = style
+                return style
+
+        def get_styles(dtype, values):
+            """Returns the style of each of the values, or a single style for all of them
+
+            :param numpy.dtype dtype: The dtype of the values' column
+            :param values: The values, only iterated if their styles depend on their types
+            """
+
+            if get_number_format is None:
+                return style_to_apply
+            if dtype.kind == 'M':
+                missing = np.asarray(pd.isnull(values))
+                if not missing.any():
+                    return get_style(pd_timestamp)
+                # NaT is not a Timestamp, so it gets the style of its own type, as it does in a Container
+                timestamp_style, missing_style = get_style(pd_timestamp), get_style(type(pd.NaT))
+                return [missing_style if is_missing else timestamp_style for is_missing in missing.tolist()]
+            if dtype.kind != 'O':
+                return style_to_apply
+            if not isinstance(values, np.ndarray):
+                values = list(values)
+            if not may_have_default_number_format(values):
+                return style_to_apply
+            return [get_style(type(value)) for value in values]
+
+        # one style per value type, which the cells copy unless the StyleFrame shares its styles
+        styles_by_type = {}
+        rows = np.arange(len(self.data_df)) if rows is None else rows
+
+        if self._columnar:
+            table = self._styles.table
+
+            def set_styles(style_ids, positions, styles):
+                if isinstance(styles, Styler):
+                    style_ids[positions] = table.add(styles)
+                else:
+                    ids = {style: table.add(style) for style in set(styles)}
+                    style_ids[positions] = [ids[style] for style in styles]
+
+            index = self.data_df.index
+            if style_index:
+                set_styles(self._styles.index, rows, get_styles(index.dtype, index.values[rows]))
+            for col in cols:
+                column = self.data_df.iloc[:, col]
+                # a view of the column's style ids
+                set_styles(self._styles.cells[:, col], rows, get_styles(column.dtype, column.values[rows]))
+            return
+
+        def set_styles(containers):
+            styles = get_styles(np.dtype(object), (container.value for container in containers))
+            if isinstance(styles, Styler):
+                styles = [styles] * len(containers)
+            for container, style in zip(containers, styles):
+                container.style = get_cell_style(style, share_styles)
+
+        get_cell_style = self._get_cell_style
+        share_styles = self._share_styles
+
+        if style_index:
+            set_styles(self.data_df.index.values[rows])
+        # the Container objects of the whole block, without looking each cell up
+        containers = self.data_df.values
+        for col in cols:
+            set_styles(containers[rows, col])
+
     def apply_column_style(self, cols_to_style, styler_obj, style_header=False, use_default_formats=True, width=None,
                            overwrite_default_style=True):
         """apply style to a whole column
@@ -532,24 +1550,20 @@ class StyleFrame(object):
             raise KeyError("one of the columns in {} wasn't found".format(cols_to_style))
 
         if overwrite_default_style:
-            style_to_apply = styler_obj
+            style_to_apply = styler_obj.freeze()
         else:
-            style_to_apply = Styler.combine(self._default_style, styler_obj)
-
-        for col_name in cols_to_style:
-            if style_header:
-                self.columns[self.columns.get_loc(col_name)].style = style_to_apply
-                self._has_custom_headers_style = True
-            for index in self.index:
-                if use_default_formats:
-                    if isinstance(self.at[index, col_name].value, pd_timestamp):
-                        style_to_apply.number_format = utils.number_formats.date_time
-                    elif isinstance(self.at[index, col_name].value, dt.date):
-                        style_to_apply.number_format = utils.number_formats.date
-                    elif isinstance(self.at[index, col_name].value, dt.time):
-                        style_to_apply.number_format = utils.number_formats.time_24_hours
-
-                self.at[index, col_name].style = style_to_apply
+            style_to_apply = Styler.combine(self._default_style, styler_obj).freeze()
+
+        cols = self.data_df.columns.get_indexer(list(cols_to_style))
+        if style_header:
+            if self._columnar:
+                self._styles.set_headers(cols, style_to_apply)
+            else:
+                for col in cols:
+                    self.data_df.columns[col].style = self._get_cell_style(style_to_apply, self._share_styles)
+            self._has_custom_headers_style = True
+        self._apply_style_by_positions(None, cols, style_to_apply,
+                                       default_number_format if use_default_formats else None)
 
         if width:
             self.set_column_width(columns=cols_to_style, width=width)
@@ -575,11 +1589,15 @@ class StyleFrame(object):
         if not all(col in self.columns for col in cols_to_style):
             raise KeyError("one of the columns in {} wasn't found".format(cols_to_style))
 
+        styler_obj = styler_obj.freeze()
         if style_index_header:
             self._index_header_style = styler_obj
 
-        for column in cols_to_style:
-            self.columns[self.columns.get_loc(column)].style = styler_obj
+        if self._columnar:
+            self._styles.set_headers(self.data_df.columns.get_indexer(list(cols_to_style)), styler_obj)
+        else:
+            for column in cols_to_style:
+                self.columns[self.columns.get_loc(column)].style = self._get_cell_style(styler_obj, self._share_styles)
         self._has_custom_headers_style = True
         return self
 
@@ -677,8 +1695,11 @@ class StyleFrame(object):
 
         sf = self if inplace else StyleFrame(self)
 
-        new_columns = [col if col not in columns else Container(columns[col], col.style)
-                       for col in sf.data_df.columns]
+        if sf._columnar:
+            new_columns = [columns.get(col, col) for col in sf.data_df.columns]
+        else:
+            new_columns = [col if col not in columns else Container(columns[col], col.style)
+                           for col in sf.data_df.columns]
 
         sf._known_attrs['columns'] = sf.data_df.columns = new_columns
 
@@ -0,0 +1,252 @@
+# coding:utf-8
+import datetime as dt
+import numpy as np
+import pandas as pd
+import sys
+
+from . import utils
+
+PY2 = sys.version_info[0] == 2
+
+# Python 2
+if PY2:
+    # noinspection PyUnresolvedReferences
+    from styler import Styler, LazyStyler
+# Python 3
+else:
+    from StyleFrame.styler import Styler, LazyStyler
+
+try:
+    pd_timestamp = pd.Timestamp
+except AttributeError:
+    pd_timestamp = pd.tslib.Timestamp
+
+try:
+    from pandas.api.types import infer_dtype
+except ImportError:
+    # older pandas versions
+    infer_dtype = pd.lib.infer_dtype
+
+STYLE_ID_DTYPE = np.int32
+
+# the types pandas infers for values of which none are dates or times
+NON_TEMPORAL_INFERRED_TYPES = frozenset(('empty', 'string', 'unicode', 'bytes', 'floating', 'integer',
+                                         'mixed-integer-float', 'decimal', 'complex', 'boolean', 'timedelta',
+                                         'period', 'interval'))
+
+
+def default_number_format(value_type):
+    """Returns the number format a Container would pick by default for values of the given type, or None"""
+
+    if issubclass(value_type, pd_timestamp):
+        return utils.number_formats.default_date_time_format
+    elif issubclass(value_type, dt.date):
+        return utils.number_formats.default_date_format
+    elif issubclass(value_type, dt.time):
+        return utils.number_formats.default_time_format
+    return None
+
+
+def may_have_default_number_format(values):
+    """Returns False if none of the values get a default number format, which pandas decides in a single scan of
+    the values rather than by the type of each value
+
+    :param values: Array or list of raw (non-Container) values
+    :rtype: bool
+    """
+
+    try:
+        inferred_type = infer_dtype(values, skipna=True)
+    except TypeError:
+        # older pandas versions
+        inferred_type = infer_dtype(values)
+    except ValueError:
+        # pandas can't infer the type of some extension arrays, such as periods. Their values are checked one by one
+        return True
+    return inferred_type not in NON_TEMPORAL_INFERRED_TYPES
+
+
+class StyleTable(object):
+    """
+    Interns style objects and maps each distinct style to a small integer id.
+    Id 0 is always the default style the table was created with.
+    """
+
+    def __init__(self, default_style=None):
+        self.styles = []
+        self._ids = {}
+        self.add(default_style or Styler())
+
+    def __len__(self):
+        return len(self.styles)
+
+    def __getitem__(self, style_id):
+        style = self.styles[style_id]
+        if type(style) is LazyStyler:
+            style = self.styles[style_id] = style.resolve()
+            self._ids.setdefault(style, style_id)
+        return style
+
+    @property
+    def default_style(self):
+        return self[0]
+
+    def add(self, style):
+        """Returns the id of the provided style, adding it to the table if it is not there yet.
+
+        :param Styler style: The style to intern. openpyxl style and LazyStyler objects are interned by identity.
+        :rtype: int
+        """
+
+        try:
+            return self._ids[style]
+        except KeyError:
+            if isinstance(style, Styler):
+                style = style.freeze()
+            style_id = self._ids[style] = len(self.styles)
+            self.styles.append(style)
+            return style_id
+
+    def copy(self):
+        table = StyleTable.__new__(StyleTable)
+        table.styles = list(self.styles)
+        table._ids = dict(self._ids)
+        return table
+
+    def default_ids(self, values, styler_obj=None):
+        """Returns an array with the id of the default style of each of the provided values.
+
+        If styler_obj is provided it is used for all values, otherwise values that are dates, times or timestamps get
+        the matching default number format, just like a Container created without a style.
+
+        :param values: Iterable of values (usually a pandas column or index).
+        :param None|Styler styler_obj:
+        :rtype: numpy.ndarray
+        """
+
+        if styler_obj is not None:
+            return np.full(len(values), self.add(styler_obj), dtype=STYLE_ID_DTYPE)
+
+        dtype = getattr(values, 'dtype', None)
+        if dtype is not None and dtype.kind in 'biufcm':
+            return np.zeros(len(values), dtype=STYLE_ID_DTYPE)
+        if dtype is not None and dtype.kind == 'M':
+            ids = np.full(len(values), self.default_id(pd_timestamp), dtype=STYLE_ID_DTYPE)
+            # NaT is not a Timestamp, so it gets the style a Container of NaT gets
+            missing = np.asarray(pd.isnull(values))
+            if missing.any():
+                ids[missing] = self.default_id(type(pd.NaT))
+            return ids
+
+        if not may_have_default_number_format(values):
+            return np.zeros(len(values), dtype=STYLE_ID_DTYPE)
+        ids_by_type = {}
+        ids = np.empty(len(values), dtype=STYLE_ID_DTYPE)
+        for i, value in enumerate(values):
+            value_type = type(value)
+            try:
+                ids[i] = ids_by_type[value_type]
+            except KeyError:
+                ids[i] = ids_by_type[value_type] = self.default_id(value_type)
+        return ids
+
+    def default_id(self, value_type):
+        """Returns the id of the style a Container created without a style gets for values of the given type
+
+        :param type value_type:
+        :rtype: int
+        """
+
+        number_format = default_number_format(value_type)
+        if number_format is None:
+            return 0
+        return self.add(Styler(number_format=number_format))
+
+
+class StyleMatrix(object):
+    """
+    Stores the styles of a StyleFrame in a columnar manner: a StyleTable of distinct styles and numpy int32 arrays
+    of ids into it, one for the cells, one for the columns' headers and one for the index.
+    """
+
+    def __init__(self, table, cells, headers, index):
+        self.table = table
+        self.cells = cells
+        self.headers = headers
+        self.index = index
+
+    @classmethod
+    def from_dataframe(cls, df, styler_obj=None):
+        """Creates a StyleMatrix with the default styles of the given dataframe's values, columns and index
+
+        :param pandas.DataFrame df: A dataframe of raw (non-Container) values
+        :param None|Styler styler_obj: The default style. If not provided dates and times get default number formats.
+        :rtype: StyleMatrix
+        """
+
+        table = StyleTable(styler_obj)
+        cells = np.empty(df.shape, dtype=STYLE_ID_DTYPE)
+        for col_index in range(df.shape[1]):
+            cells[:, col_index] = table.default_ids(df.iloc[:, col_index], styler_obj)
+        return cls(table, cells,
+                   headers=table.default_ids(df.columns, styler_obj),
+                   index=table.default_ids(df.index, styler_obj))
+
+    @property
+    def shape(self):
+        return self.cells.shape
+
+    def copy(self):
+        return StyleMatrix(self.table.copy(), self.cells.copy(), self.headers.copy(), self.index.copy())
+
+    def take(self, rows=None, cols=None):
+        """Returns a new StyleMatrix with only the given row and column positions.
+
+        :param None|list|numpy.ndarray rows: Row positions to keep, all rows if not provided
+        :param None|list|numpy.ndarray cols: Column positions to keep, all columns if not provided
+        :rtype: StyleMatrix
+        """
+
+        rows = slice(None) if rows is None else np.asarray(rows, dtype=np.intp)
+        cols = slice(None) if cols is None else np.asarray(cols, dtype=np.intp)
+        return StyleMatrix(self.table.copy(), self.cells[rows][:, cols], self.headers[cols], self.index[rows])
+
+    def get(self, row, col):
+        return self.table[self.cells[row, col]]
+
+    def get_header(self, col):
+        return self.table[self.headers[col]]
+
+    def get_index(self, row):
+        return self.table[self.index[row]]
+
+    def set(self, rows, cols, style):
+        """Sets the style of the block of cells at the given row and column positions
+
+        :param slice|list|numpy.ndarray rows: Row positions or a boolean mask
+        :param slice|list|numpy.ndarray cols: Column positions or a boolean mask
+        :param Styler style:
+        """
+
+        if not isinstance(rows, slice):
+            rows = np.asarray(rows)
+        if not isinstance(cols, slice):
+            cols = np.asarray(cols)
+        if isinstance(rows, slice) or isinstance(cols, slice):
+            self.cells[rows, cols] = self.table.add(style)
+        else:
+            self.cells[np.ix_(rows, cols)] = self.table.add(style)
+
+    def set_headers(self, cols, style):
+        self.headers[cols] = self.table.add(style)
+
+    def set_index(self, rows, style):
+        self.index[rows] = self.table.add(style)
+
+    def insert_column(self, loc, ids, header_id=0):
+        self.cells = np.insert(self.cells, loc, ids, axis=1)
+        self.headers = np.insert(self.headers, loc, header_id)
+
+    def delete_column(self, loc):
+        self.cells = np.delete(self.cells, loc, axis=1)
+        self.headers = np.delete(self.headers, loc)
@@ -1,5 +1,8 @@
 # coding:utf-8
+import weakref
+
 from . import utils
+from .style_cache import StyleCache, get_workbook_cache
 from colour import Color
 from openpyxl.formatting.rule import ColorScaleRule
 from openpyxl.styles import PatternFill, NamedStyle, Color as OpenPyColor, Border, Side, Font, Alignment, Protection
@@ -12,7 +15,14 @@ class Styler(object):
     Creates openpyxl Style to be applied
     """
 
-    cache = {}
+    # in the same order as __init__ arguments
+    _fields = ('bg_color', 'bold', 'font', 'font_size', 'font_color', 'number_format', 'protection', 'underline',
+               'border_type', 'horizontal_alignment', 'vertical_alignment', 'wrap_text', 'shrink_to_fit',
+               'fill_pattern_type', 'indent', 'comment_author', 'comment_text', 'text_rotation')
+    __slots__ = _fields + ('__weakref__',)
+
+    # shared between workbooks, see Styler.get_workbook_cache
+    cache = StyleCache(maxsize=1024)
 
     def __init__(self, bg_color=None, bold=False, font=utils.fonts.arial, font_size=12, font_color=None,
                  number_format=utils.number_formats.general, protection=False, underline=None,
@@ -47,24 +57,63 @@ class Styler(object):
         self.comment_text = comment_text
         self.text_rotation = text_rotation
 
+    def _key(self):
+        return tuple(getattr(self, field) for field in self._fields)
+
+    def _asdict(self):
+        return dict(zip(self._fields, self._key()))
+
     def __eq__(self, other):
-        if not isinstance(other, self.__class__):
+        if self is other:
+            return True
+        if not isinstance(other, Styler):
             return False
-        return self.__dict__ == other.__dict__
+        return self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self == other
 
     def __hash__(self):
-        return hash(tuple((k, v) for k, v in sorted(self.__dict__.items())))
+        return hash(self._key())
 
     def __add__(self, other):
-        default = Styler().__dict__
-        d = dict(self.__dict__)
-        for k, v in other.__dict__.items():
+        default = Styler()._asdict()
+        d = self._asdict()
+        for k, v in other._asdict().items():
             if v != default[k]:
                 d[k] = v
         return Styler(**d)
 
     def __repr__(self):
-        return pformat(self.__dict__)
+        return pformat(self._asdict())
+
+    def freeze(self):
+        """Returns an immutable, interned FrozenStyler object equal to this style.
+
+        :rtype: FrozenStyler
+        """
+
+        key = self._key()
+        try:
+            return FrozenStyler._interned[key]
+        except KeyError:
+            frozen = object.__new__(FrozenStyler)
+            for field, value in zip(self._fields, key):
+                object.__setattr__(frozen, field, value)
+            object.__setattr__(frozen, '_hash', hash(key))
+            FrozenStyler._interned[key] = frozen
+            return frozen
+
+    def thaw(self):
+        """Returns a mutable Styler object equal to this style. Unlike copy, also unfreezes FrozenStyler objects.
+
+        :rtype: Styler
+        """
+
+        styler = object.__new__(Styler)
+        for field, value in zip(self._fields, self._key()):
+            object.__setattr__(styler, field, value)
+        return styler
 
     def generate_comment(self):
         if any((self.comment_author, self.comment_text)):
@@ -75,25 +124,53 @@ class Styler(object):
     def default_header_style(cls):
         return cls(bold=True)
 
-    def to_openpyxl_style(self):
-        try:
-            openpyxl_style = self.cache[self]
-        except KeyError:
-            side = Side(border_style=self.border_type, color=utils.colors.black)
-            border = Border(left=side, right=side, top=side, bottom=side)
-            openpyxl_style = self.cache[self] = NamedStyle(
-                name=str(hash(self)),
-                font=Font(name=self.font, size=self.font_size, color=OpenPyColor(self.font_color),
-                          bold=self.bold, underline=self.underline),
-                fill=PatternFill(patternType=self.fill_pattern_type, fgColor=self.bg_color),
-                alignment=Alignment(horizontal=self.horizontal_alignment, vertical=self.vertical_alignment,
-                                    wrap_text=self.wrap_text, shrink_to_fit=self.shrink_to_fit,
-                                    indent=self.indent, text_rotation=self.text_rotation),
-                border=border,
-                number_format=self.number_format,
-                protection=Protection(locked=self.protection)
-            )
-        return openpyxl_style
+    def to_openpyxl_style(self, cache=None):
+        """
+        :param None|StyleCache cache: The cache to use, usually the one returned by Styler.get_workbook_cache.
+            If not provided a copy of the object in the shared Styler.cache is returned, since NamedStyle objects are
+            bound to the workbook they are used in.
+        :return: openpyxl NamedStyle object
+        """
+
+        # keyed by the frozen style so lookups with interned styles are resolved by identity
+        if cache is None:
+            return self._copy_openpyxl_style(self.cache.get(self.freeze(), Styler._create_openpyxl_style))
+        return cache.get(self.freeze(), Styler._create_openpyxl_style)
+
+    def _create_openpyxl_style(self):
+        side = Side(border_style=self.border_type, color=utils.colors.black)
+        border = Border(left=side, right=side, top=side, bottom=side)
+        return NamedStyle(
+            name=str(hash(self)),
+            font=Font(name=self.font, size=self.font_size, color=OpenPyColor(self.font_color),
+                      bold=self.bold, underline=self.underline),
+            fill=PatternFill(patternType=self.fill_pattern_type, fgColor=self.bg_color),
+            alignment=Alignment(horizontal=self.horizontal_alignment, vertical=self.vertical_alignment,
+                                wrap_text=self.wrap_text, shrink_to_fit=self.shrink_to_fit,
+                                indent=self.indent, text_rotation=self.text_rotation),
+            border=border,
+            number_format=self.number_format,
+            protection=Protection(locked=self.protection)
+        )
+
+    @staticmethod
+    def _copy_openpyxl_style(openpyxl_style):
+        """Returns a NamedStyle object that is not bound to any workbook, with the same name and style objects"""
+
+        return NamedStyle(name=openpyxl_style.name, font=openpyxl_style.font, fill=openpyxl_style.fill,
+                          alignment=openpyxl_style.alignment, border=openpyxl_style.border,
+                          number_format=openpyxl_style.number_format, protection=openpyxl_style.protection)
+
+    @classmethod
+    def get_workbook_cache(cls, workbook):
+        """Returns the style cache scoped to the given openpyxl workbook. Its misses are delegated to Styler.cache,
+        and it keeps copies of the shared NamedStyle objects, which are bound to this workbook when they are used.
+
+        :param workbook: openpyxl Workbook object
+        :rtype: StyleCache
+        """
+
+        return get_workbook_cache(workbook, parent=cls.cache, copy_parent_entry=cls._copy_openpyxl_style)
 
     @classmethod
     def from_openpyxl_style(cls, openpyxl_style, theme_colors, openpyxl_comment=None):
@@ -170,6 +247,85 @@ class Styler(object):
     create_style = to_openpyxl_style
 
 
+class FrozenStyler(Styler):
+    """
+    An immutable Styler. Instances are interned, so equal FrozenStyler objects are the same object, equality is
+    decided by identity and the hash is computed once.
+    Mostly should not be created directly, but through Styler.freeze
+    """
+
+    __slots__ = ('_hash',)
+
+    _interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, *args, **kwargs):
+        return Styler(*args, **kwargs).freeze()
+
+    def __init__(self, *args, **kwargs):
+        # the instance is fully initialized by Styler.freeze
+        pass
+
+    def __setattr__(self, name, value):
+        raise AttributeError("'{}' object is immutable, create a new Styler instead".format(type(self).__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError("'{}' object is immutable".format(type(self).__name__))
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(other) is FrozenStyler:
+            return False
+        return Styler.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        return FrozenStyler, self._key()
+
+    def freeze(self):
+        return self
+
+
+class LazyStyler(object):
+    """
+    A placeholder for the style of cells read from an Excel file. It keeps the cells' openpyxl style objects and
+    converts them to a Styler only the first time it is resolved. The cells share a single frozen Styler if
+    share_styles is True, otherwise each of them gets a mutable copy of it.
+    Mostly should not be created directly, but through StyleFrame.read_excel with lazy_style=True
+    """
+
+    __slots__ = ('font', 'fill', 'border', 'alignment', 'protection', 'number_format', '_theme_colors',
+                 '_openpyxl_comment', '_share_styles', '_styler')
+
+    def __init__(self, openpyxl_cell, theme_colors, openpyxl_comment=None, share_styles=True):
+        # only the style objects are kept and not the cell itself, so the worksheet can be released
+        self.font = openpyxl_cell.font
+        self.fill = openpyxl_cell.fill
+        self.border = openpyxl_cell.border
+        self.alignment = openpyxl_cell.alignment
+        self.protection = openpyxl_cell.protection
+        self.number_format = openpyxl_cell.number_format
+        self._theme_colors = theme_colors
+        self._openpyxl_comment = openpyxl_comment
+        self._share_styles = share_styles
+        self._styler = None
+
+    def resolve(self):
+        """Returns the Styler of a cell, converting the openpyxl style objects on the first call.
+
+        :rtype: Styler
+        """
+
+        if self._styler is None:
+            self._styler = Styler.from_openpyxl_style(self, self._theme_colors, self._openpyxl_comment).freeze()
+        return self._styler if self._share_styles else self._styler.thaw()
+
+
 class ColorScaleConditionalFormatRule(object):
     """Creates a color scale conditional format rule. Wraps openpyxl's ColorScaleRule.
     Mostly should not be used directly, but through StyleFrame.add_color_scale_conditional_formatting
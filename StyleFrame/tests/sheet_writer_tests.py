@@ -0,0 +1,57 @@
+import unittest
+import os
+import pandas as pd
+
+from openpyxl import load_workbook
+from StyleFrame import SheetWriter, StyleFrame, Styler, utils
+from StyleFrame.tests import TEST_FILENAME
+
+
+class SheetWriterTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.styler_obj = Styler(bg_color=utils.colors.yellow)
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            os.remove(TEST_FILENAME)
+        except OSError as ex:
+            print(ex)
+
+    def test_append(self):
+        first_batch = StyleFrame({'a': [1, 2], 'b': ['x', 'y']}, self.styler_obj)
+        first_batch.set_column_width('b', 30)
+        first_batch.set_row_height(2, 20)
+        second_batch = StyleFrame({'a': [3], 'b': ['z']})
+        second_batch.set_row_height(2, 25)
+        with SheetWriter(TEST_FILENAME, row_to_add_filters=0, columns_and_rows_to_freeze='A2') as writer:
+            writer.append(first_batch)
+            writer.append(second_batch)
+            writer.append(pd.DataFrame({'a': [4], 'b': ['w']}))
+            self.assertEqual(writer.rows_count, 5)
+
+        sheet = load_workbook(TEST_FILENAME).active
+        self.assertEqual([[cell.value for cell in row] for row in sheet.iter_rows()],
+                         [['a', 'b'], [1, 'x'], [2, 'y'], [3, 'z'], [4, 'w']])
+        self.assertEqual(sheet.freeze_panes, 'A2')
+        self.assertEqual(sheet.auto_filter.ref, 'A1:B1')
+        self.assertEqual(sheet.column_dimensions['B'].width, 30)
+        self.assertEqual(sheet.row_dimensions[2].height, 20)
+        self.assertEqual(sheet.row_dimensions[4].height, 25)
+
+        sf_from_excel = StyleFrame.read_excel(TEST_FILENAME, read_style=True)
+        self.assertEqual(sf_from_excel.iloc[1, 1].style, self.styler_obj)
+        self.assertEqual(sf_from_excel.iloc[2, 1].style, Styler())
+        self.assertEqual(sf_from_excel.columns[0].style, Styler.default_header_style())
+
+    def test_append_errors(self):
+        writer = SheetWriter(StyleFrame.ExcelWriter(TEST_FILENAME, write_only=True))
+        writer.append(pd.DataFrame({'a': [1]}))
+        with self.assertRaises(ValueError):
+            writer.append(pd.DataFrame({'a': [1], 'b': [2]}))
+        writer.close()
+        with self.assertRaises(ValueError):
+            writer.append(pd.DataFrame({'a': [1]}))
+        with self.assertRaises(ValueError):
+            SheetWriter(StyleFrame.ExcelWriter(TEST_FILENAME))
@@ -0,0 +1,80 @@
+import gc
+import unittest
+import weakref
+
+from openpyxl import Workbook
+
+from StyleFrame import StyleFrame, Styler
+from StyleFrame.style_cache import StyleCache, get_workbook_cache
+from StyleFrame.tests import TEST_FILENAME
+
+
+class StyleCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.created = []
+        self.cache = StyleCache(maxsize=2)
+
+    def create(self, key):
+        self.created.append(key)
+        return key * 2
+
+    def test_get(self):
+        self.assertEqual(self.cache.get(1, self.create), 2)
+        self.assertEqual(self.cache.get(1, self.create), 2)
+        self.assertEqual(self.created, [1])
+        self.assertEqual(self.cache.stats, {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1, 'maxsize': 2})
+
+    def test_lru_eviction(self):
+        for key in (1, 2, 1, 3):
+            self.cache.get(key, self.create)
+        self.assertIn(1, self.cache)
+        self.assertNotIn(2, self.cache)
+        self.assertEqual(self.cache.evictions, 1)
+
+        self.cache.maxsize = 0
+        self.assertEqual(len(self.cache), 0)
+        self.cache.get(4, self.create)
+        self.assertEqual(len(self.cache), 0)
+
+        with self.assertRaises(ValueError):
+            StyleCache(maxsize=-1)
+
+    def test_parent(self):
+        child = StyleCache(parent=self.cache)
+        self.assertEqual(child.get(1, self.create), 2)
+        self.assertEqual(StyleCache(parent=self.cache).get(1, self.create), 2)
+        self.assertEqual(self.created, [1])
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_clear(self):
+        self.cache.get(1, self.create)
+        self.cache.clear()
+        self.assertEqual(self.cache.stats, {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'maxsize': 2})
+
+    def test_workbook_cache(self):
+        workbook = Workbook()
+        cache = get_workbook_cache(workbook)
+        self.assertIs(get_workbook_cache(workbook), cache)
+        self.assertIsNot(get_workbook_cache(Workbook()), cache)
+
+        cache = Styler.get_workbook_cache(Workbook())
+        self.assertIs(cache.parent, Styler.cache)
+        styler_obj = Styler(bold=True)
+        named_style = styler_obj.to_openpyxl_style(cache)
+        # the workbook's objects are bound to it, so they are copies of the shared objects
+        self.assertIsNot(named_style, Styler.cache.get(styler_obj.freeze(), None))
+        self.assertIsNot(named_style, styler_obj.to_openpyxl_style())
+        self.assertEqual(named_style.font, styler_obj.to_openpyxl_style().font)
+        self.assertIs(styler_obj.to_openpyxl_style(cache), named_style)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_workbook_cache_released(self):
+        sf = StyleFrame({'a': [1, 2]}, Styler(bold=True))
+        workbooks = []
+        for _ in range(3):
+            excel_writer = sf.to_excel(TEST_FILENAME)
+            excel_writer.save()
+            workbooks.append(weakref.ref(excel_writer.book))
+            del excel_writer
+        gc.collect()
+        self.assertTrue(all(workbook() is None for workbook in workbooks))
@@ -1,9 +1,15 @@
+import datetime as dt
 import unittest
+import uuid
+import numpy as np
 import pandas as pd
 import os
+import zipfile
 
 from functools import partial
-from StyleFrame import Container, StyleFrame, Styler, utils
+from openpyxl import load_workbook
+from StyleFrame import Container, StyleFrame, Styler, row_ranges, utils, xml_writer
+from StyleFrame.styler import LazyStyler
 from StyleFrame.tests import TEST_FILENAME
 
 
@@ -17,8 +23,6 @@ class StyleFrameTest(unittest.TestCase):
                                   vertical_alignment=utils.vertical_alignments.center,
                                   comment_text='styler_obj_1 comment')
         cls.styler_obj_2 = Styler(bg_color=utils.colors.yellow, comment_text='styler_obj_2 comment')
-        cls.openpy_style_obj_1 = cls.styler_obj_1.to_openpyxl_style()._style
-        cls.openpy_style_obj_2 = cls.styler_obj_2.to_openpyxl_style()._style
 
     def setUp(self):
         self.ew = StyleFrame.ExcelWriter(TEST_FILENAME)
@@ -42,6 +46,9 @@ class StyleFrameTest(unittest.TestCase):
             self.ew.save()
         return self.ew.sheets['Sheet1']
 
+    def get_workbook_style(self, styler_obj):
+        return styler_obj.to_openpyxl_style(Styler.get_workbook_cache(self.ew.book))._style
+
     def get_cf_rules(self, sheet):
         conditional_formatting = sheet.conditional_formatting
         try:
@@ -53,18 +60,132 @@ class StyleFrameTest(unittest.TestCase):
     def test_init_styler_obj(self):
         self.sf = StyleFrame({'a': [1, 2, 3], 'b': [1, 2, 3]}, styler_obj=self.styler_obj_1)
 
-        self.assertTrue(all(self.sf.at[index, 'a'].style.to_openpyxl_style()._style == self.openpy_style_obj_1
+        self.assertTrue(all(self.sf.at[index, 'a'].style == self.styler_obj_1
                             for index in self.sf.index))
 
         sheet = self.export_and_get_default_sheet()
 
-        self.assertTrue(all(sheet.cell(row=i, column=j)._style == self.openpy_style_obj_1
+        self.assertTrue(all(sheet.cell(row=i, column=j)._style == self.get_workbook_style(self.styler_obj_1)
                             for i in range(2, len(self.sf))
                             for j in range(1, len(self.sf.columns))))
 
         with self.assertRaises(TypeError):
             StyleFrame({}, styler_obj=1)
 
+    def test_init_shares_styles(self):
+        sf = StyleFrame(pd.DataFrame({'a': [1, 2], 'b': pd.to_datetime(['2019-01-01', '2019-01-02'])}),
+                        share_styles=True)
+        self.assertIs(sf.iloc[0, 0].style, sf.iloc[1, 0].style)
+        self.assertIs(sf.iloc[0, 1].style, sf.iloc[1, 1].style)
+        self.assertEqual(sf.iloc[0, 1].style.number_format, utils.number_formats.default_date_time_format)
+        self.assertEqual(sf.iloc[0, 0].style, Styler())
+
+        sf = StyleFrame({'a': [1, 2]}, styler_obj=self.styler_obj_1, share_styles=True)
+        self.assertTrue(all(container.style is self.styler_obj_1.freeze() for container in sf['a']))
+        self.assertIs(StyleFrame(sf).iloc[0, 0].style, self.styler_obj_1.freeze())
+        self.assertIsNot(StyleFrame(sf).iloc[0, 0], sf.iloc[0, 0])
+        with self.assertRaises(AttributeError):
+            sf.iloc[0, 0].style.bold = False
+
+    def test_init_styleframe_copies_styles(self):
+        sf = StyleFrame({'a': [1, 2]})
+        sf.iloc[0, 0].style = Styler(bold=True)
+        sf_copy = StyleFrame(sf)
+        self.assertEqual(sf_copy.iloc[0, 0].style, sf.iloc[0, 0].style)
+        self.assertIsNot(sf_copy.iloc[0, 0].style, sf.iloc[0, 0].style)
+        sf_copy.iloc[0, 0].style.bold = False
+        self.assertTrue(sf.iloc[0, 0].style.bold)
+
+        # cells that share their styles freeze the styles they are given
+        sf_copy = StyleFrame(sf, share_styles=True)
+        self.assertIs(sf_copy.iloc[0, 0].style, Styler(bold=True).freeze())
+        sf.iloc[0, 0].style.bold = False
+        self.assertTrue(sf_copy.iloc[0, 0].style.bold)
+
+    def test_init_series(self):
+        sf = StyleFrame(pd.Series([1, 2], name='a'), self.styler_obj_1)
+        self.assertEqual(list(sf.columns), ['a'])
+        self.assertEqual(list(sf['a']), [1, 2])
+        self.assertTrue(all(container.style == self.styler_obj_1 for container in sf['a']))
+        self.assertIsNot(sf.iloc[0, 0].style, sf.iloc[1, 0].style)
+
+    def test_init_styles_are_mutable(self):
+        sf = StyleFrame(pd.DataFrame({'a': [1, 2], 'b': pd.to_datetime(['2019-01-01', '2019-01-02'])}),
+                        styler_obj=self.styler_obj_1)
+        self.assertIsNot(sf.iloc[0, 1].style, sf.iloc[1, 1].style)
+        sf.iloc[0, 1].style.bold = False
+        self.assertFalse(sf.iloc[0, 1].style.bold)
+        self.assertTrue(sf.iloc[1, 1].style.bold)
+        self.assertTrue(self.styler_obj_1.bold)
+
+        sf.columns[0].style.font_color = utils.colors.red
+        self.assertEqual(sf.columns[0].style.font_color, utils.colors.red)
+        self.assertNotEqual(sf.columns[1].style.font_color, utils.colors.red)
+
+        sf.apply_column_style('a', self.styler_obj_2, style_header=True)
+        sf.iloc[0, 0].style.font_size = 20
+        self.assertNotEqual(sf.iloc[1, 0].style.font_size, 20)
+        sf.columns[0].style.font_size = 20
+        self.assertNotEqual(sf.iloc[1, 0].style.font_size, 20)
+
+    def test_init_nullable_columns(self):
+        sf = StyleFrame({'a': pd.array([1, None], dtype='Int64'), 'b': pd.array([True, None], dtype='boolean')})
+        self.assertTrue(all(isinstance(value, Container) for col in sf.columns for value in sf[col]))
+        self.assertIs(sf.iloc[1, 0].value, pd.NA)
+        sf.apply_column_style('a', self.styler_obj_1)
+        sf.apply_style_by_indexes([1], self.styler_obj_2, cols_to_style='b')
+        self.assertEqual(sf.iloc[1, 0].style, self.styler_obj_1)
+        self.assertEqual(sf.iloc[1, 1].style, self.styler_obj_2)
+
+    def test_apply_column_style_does_not_modify_styler_obj(self):
+        styler_obj = Styler(bold=True)
+        sf = StyleFrame({'a': pd.to_datetime(['2019-01-01']), 'b': [1]})
+        sf.apply_column_style(['a', 'b'], styler_obj)
+        self.assertEqual(styler_obj.number_format, utils.number_formats.general)
+        self.assertEqual(sf.iloc[0, 0].style.number_format, utils.number_formats.date_time)
+        self.assertEqual(sf.iloc[0, 1].style, styler_obj)
+
+    def test_apply_column_style_number_formats_by_dtype(self):
+        for columnar in (False, True):
+            sf = StyleFrame({'datetime': pd.date_range('2020-01-01', periods=2),
+                             'date': [pd.Timestamp('2020-01-01').date(), None],
+                             'int': [1, 2],
+                             'mixed': ['a', pd.Timestamp('2020-01-01').date()]}, columnar=columnar)
+            sf.apply_column_style(sf.columns, self.styler_obj_2, style_header=True)
+
+            def get_style(row, col):
+                return sf._styles.get(row, col) if columnar else sf.iloc[row, col].style
+
+            self.assertEqual([[get_style(row, col).number_format for col in range(4)] for row in range(2)],
+                             [[utils.number_formats.default_date_time_format, utils.number_formats.date,
+                               utils.number_formats.general, utils.number_formats.general],
+                              [utils.number_formats.default_date_time_format, utils.number_formats.general,
+                               utils.number_formats.general, utils.number_formats.date]])
+            self.assertEqual(get_style(0, 2), self.styler_obj_2)
+            self.assertEqual(sf._styles.get_header(0) if columnar else sf.columns[0].style, self.styler_obj_2)
+
+    def test_apply_style_by_indexes_does_not_modify_styler_obj(self):
+        styler_obj = Styler(bold=True)
+        sf = StyleFrame({'a': [pd.Timestamp('2019-01-01')], 'b': [1]})
+        sf.apply_style_by_indexes(sf.index, styler_obj)
+        self.assertEqual(styler_obj.number_format, utils.number_formats.general)
+        self.assertEqual(sf.iloc[0, 0].style.number_format, utils.number_formats.default_date_time_format)
+        self.assertEqual(sf.iloc[0, 1].style, styler_obj)
+        sf.iloc[0, 1].style.bold = False
+        self.assertTrue(styler_obj.bold)
+
+        sf = StyleFrame({'a': [pd.Timestamp('2019-01-01')], 'b': [1]}, share_styles=True)
+        sf.apply_style_by_indexes(sf.index, styler_obj)
+        with self.assertRaises(AttributeError):
+            sf.iloc[0, 1].style.bold = False
+
+    def test_to_excel_uses_workbook_cache(self):
+        self.export_and_get_default_sheet()
+        self.sf.to_excel(self.ew, sheet_name='Sheet2')
+        cache = Styler.get_workbook_cache(self.ew.book)
+        self.assertGreater(cache.hits, 0)
+        self.assertEqual(cache.misses, len(cache))
+
     def test_init_dataframe(self):
         self.assertIsInstance(StyleFrame(pd.DataFrame({'a': [1, 2, 3], 'b': [1, 2, 3]})), StyleFrame)
         self.assertIsInstance(StyleFrame(pd.DataFrame()), StyleFrame)
@@ -113,8 +234,8 @@ class StyleFrameTest(unittest.TestCase):
 
         # actual tests
         self.apply_column_style(cols_to_style=['a'])
-        self.assertTrue(all([self.sf.at[index, 'a'].style.to_openpyxl_style()._style == self.openpy_style_obj_1
-                             and self.sf.at[index, 'b'].style.to_openpyxl_style()._style != self.openpy_style_obj_1
+        self.assertTrue(all([self.sf.at[index, 'a'].style == self.styler_obj_1
+                             and self.sf.at[index, 'b'].style != self.styler_obj_1
                              for index in self.sf.index]))
 
         sheet = self.export_and_get_default_sheet()
@@ -122,7 +243,7 @@ class StyleFrameTest(unittest.TestCase):
         self.assertEqual(sheet.column_dimensions['A'].width, 10)
 
         # range starts from 2 since we don't want to check the header's style
-        self.assertTrue(all(sheet.cell(row=i, column=1)._style == self.openpy_style_obj_1 for i in range(2, len(self.sf))))
+        self.assertTrue(all(sheet.cell(row=i, column=1)._style == self.get_workbook_style(self.styler_obj_1) for i in range(2, len(self.sf))))
 
     def test_apply_column_style_no_override_default_style(self):
         # testing some edge cases
@@ -145,7 +266,7 @@ class StyleFrameTest(unittest.TestCase):
         self.assertEqual(sheet.column_dimensions['A'].width, 10)
 
         # range starts from 2 since we don't want to check the header's style
-        self.assertTrue(all(sheet.cell(row=i, column=1)._style == Styler.combine(self.default_styler_obj, self.styler_obj_1).to_openpyxl_style()._style
+        self.assertTrue(all(sheet.cell(row=i, column=1)._style == self.get_workbook_style(Styler.combine(self.default_styler_obj, self.styler_obj_1))
                             for i in range(2, len(self.sf))))
 
     def test_apply_style_by_indexes_single_col(self):
@@ -155,12 +276,12 @@ class StyleFrameTest(unittest.TestCase):
 
         self.apply_style_by_indexes(self.sf[self.sf['a'] == 'col_a_row_2'], cols_to_style=['a'])
 
-        self.assertTrue(all(self.sf.at[index, 'a'].style.to_openpyxl_style()._style == self.openpy_style_obj_1
+        self.assertTrue(all(self.sf.at[index, 'a'].style == self.styler_obj_1
                             for index in self.sf.index if self.sf.at[index, 'a'] == 'col_a_row_2'))
 
         sheet = self.export_and_get_default_sheet()
 
-        self.assertTrue(all(sheet.cell(row=i, column=1)._style == self.openpy_style_obj_1 for i in range(1, len(self.sf))
+        self.assertTrue(all(sheet.cell(row=i, column=1)._style == self.get_workbook_style(self.styler_obj_1) for i in range(1, len(self.sf))
                             if sheet.cell(row=i, column=1).value == 2))
 
         self.assertEqual(sheet.row_dimensions[3].height, 10)
@@ -168,12 +289,12 @@ class StyleFrameTest(unittest.TestCase):
     def test_apply_style_by_indexes_all_cols(self):
         self.apply_style_by_indexes(self.sf[self.sf['a'] == 2])
 
-        self.assertTrue(all(self.sf.at[index, 'a'].style.to_openpyxl_style()._style == self.openpy_style_obj_1
+        self.assertTrue(all(self.sf.at[index, 'a'].style == self.styler_obj_1
                             for index in self.sf.index if self.sf.at[index, 'a'] == 2))
 
         sheet = self.export_and_get_default_sheet()
 
-        self.assertTrue(all(sheet.cell(row=i, column=j)._style == self.openpy_style_obj_1
+        self.assertTrue(all(sheet.cell(row=i, column=j)._style == self.get_workbook_style(self.styler_obj_1)
                             for i in range(1, len(self.sf))
                             for j in range(1, len(self.sf.columns))
                             if sheet.cell(row=i, column=1).value == 2))
@@ -181,43 +302,101 @@ class StyleFrameTest(unittest.TestCase):
     def test_apply_style_by_indexes_complement_style(self):
         self.apply_style_by_indexes(self.sf[self.sf['a'] == 'col_a_row_1'], complement_style=self.styler_obj_2)
 
-        self.assertTrue(all(self.sf.at[index, 'a'].style.to_openpyxl_style()._style == self.openpy_style_obj_1
+        self.assertTrue(all(self.sf.at[index, 'a'].style == self.styler_obj_1
                             for index in self.sf.index if self.sf.at[index, 'a'] == 'col_a_row_1'))
 
-        self.assertTrue(all(self.sf.at[index, 'a'].style.to_openpyxl_style()._style == self.openpy_style_obj_2
+        self.assertTrue(all(self.sf.at[index, 'a'].style == self.styler_obj_2
                             for index in self.sf.index if self.sf.at[index, 'a'] != 'col_a_row_1'))
 
     def test_apply_style_by_indexes_with_single_index(self):
         self.apply_style_by_indexes(self.sf.index[0])
 
-        self.assertTrue(all(self.sf.iloc[0, self.sf.columns.get_loc(col)].style.to_openpyxl_style()._style == self.openpy_style_obj_1
+        self.assertTrue(all(self.sf.iloc[0, self.sf.columns.get_loc(col)].style == self.styler_obj_1
                             for col in self.sf.columns))
 
         sheet = self.export_and_get_default_sheet()
 
         # row=2 since sheet start from row 1 and the headers are row 1
-        self.assertTrue(all(sheet.cell(row=2, column=col)._style == self.openpy_style_obj_1
+        self.assertTrue(all(sheet.cell(row=2, column=col)._style == self.get_workbook_style(self.styler_obj_1)
                             for col in range(1, len(self.sf.columns))))
 
     def test_apply_style_by_indexes_all_cols_with_multiple_indexes(self):
         self.apply_style_by_indexes([1, 2])
 
-        self.assertTrue(all(self.sf.iloc[index, self.sf.columns.get_loc(col)].style.to_openpyxl_style()._style == self.openpy_style_obj_1
+        self.assertTrue(all(self.sf.iloc[index, self.sf.columns.get_loc(col)].style == self.styler_obj_1
                             for index in [1, 2]
                             for col in self.sf.columns))
 
         sheet = self.export_and_get_default_sheet()
 
-        self.assertTrue(all(sheet.cell(row=i, column=j)._style == self.openpy_style_obj_1
+        self.assertTrue(all(sheet.cell(row=i, column=j)._style == self.get_workbook_style(self.styler_obj_1)
                             for i in [3, 4]  # sheet start from row 1 and headers are row 1
                             for j in range(1, len(self.sf.columns))))
 
+    def test_apply_style_by_indexes_with_mask_and_positions(self):
+        for columnar in (False, True):
+            sf = StyleFrame({'a': [1, 2, 3, 4], 'b': pd.date_range('2020-01-01', periods=4)}, columnar=columnar)
+            sf.apply_style_by_indexes(sf['a'] > 2, styler_obj=self.styler_obj_1, cols_to_style='a',
+                                      complement_style=self.styler_obj_2)
+            sf.apply_style_by_indexes(np.array([0, -1]), styler_obj=self.styler_obj_2, cols_to_style='b', height=15)
+            sf.apply_style_by_indexes(np.array([True, False, False, False]), styler_obj=self.styler_obj_1,
+                                      cols_to_style='b')
+
+            def get_style(row, col):
+                return sf._styles.get(row, col) if columnar else sf.iloc[row, col].style
+
+            self.assertEqual([get_style(row, 0) for row in range(4)],
+                             [self.styler_obj_2, self.styler_obj_2, self.styler_obj_1, self.styler_obj_1])
+            # the number format of the dates is decided by the column's dtype
+            self.assertEqual([get_style(row, 1).number_format for row in range(4)],
+                             [utils.number_formats.default_date_time_format] * 4)
+            self.assertEqual([get_style(row, 1).bg_color for row in range(4)],
+                             [self.styler_obj_1.bg_color, Styler().bg_color, Styler().bg_color,
+                              self.styler_obj_2.bg_color])
+            self.assertEqual(sf._rows_height, {2: 15, 5: 15})
+            with self.assertRaises(IndexError):
+                sf.apply_style_by_indexes([True, False], styler_obj=self.styler_obj_1)
+            with self.assertRaises(KeyError):
+                sf.apply_style_by_indexes([0], styler_obj=self.styler_obj_1, cols_to_style='c')
+
+    def test_apply_style_by_conditions(self):
+        df = pd.DataFrame({'a': [1, 5, 10, None], 'b': ['x', 'yy', None, 'zzz'],
+                           'c': pd.date_range('2020-01-01', periods=4)})
+        for columnar in (False, True):
+            sf = StyleFrame(df, columnar=columnar)
+            sf.apply_style_by_conditions(['a', 'c'], [(lambda values: values.notnull(), self.styler_obj_1),
+                                                      ('a < 2 or a > 5', self.styler_obj_2)],
+                                         complement_style=self.default_styler_obj)
+            # missing values returned by the condition don't meet it
+            sf.apply_style_by_condition('b', lambda values: values.str.len() > 1, self.styler_obj_2)
+
+            def get_style(row, col):
+                return sf._styles.get(row, col) if columnar else sf.iloc[row, col].style
+
+            self.assertEqual([get_style(row, 0) for row in range(4)],
+                             [self.styler_obj_1, self.styler_obj_1, self.styler_obj_1, self.default_styler_obj])
+            self.assertEqual([get_style(row, 1) for row in range(4)],
+                             [Styler(), self.styler_obj_2, Styler(), self.styler_obj_2])
+            self.assertEqual([get_style(row, 2).bg_color for row in range(4)], [self.styler_obj_1.bg_color] * 4)
+            self.assertEqual(get_style(0, 2).number_format, utils.number_formats.default_date_time_format)
+
+            with self.assertRaises(TypeError):
+                sf.apply_style_by_condition('a', 1, self.styler_obj_1)
+            with self.assertRaises(TypeError):
+                sf.apply_style_by_condition('a', lambda values: values, self.styler_obj_1)
+            with self.assertRaises(IndexError):
+                sf.apply_style_by_condition('a', lambda values: [True], self.styler_obj_1)
+            with self.assertRaises(KeyError):
+                sf.apply_style_by_condition('d', 'a > 1', self.styler_obj_1)
+            with self.assertRaises(ValueError):
+                sf.apply_style_by_conditions('a', [])
+
     def test_apply_headers_style(self):
         self.apply_headers_style()
-        self.assertEqual(self.sf.columns[0].style.to_openpyxl_style()._style, self.openpy_style_obj_1)
+        self.assertEqual(self.sf.columns[0].style, self.styler_obj_1)
 
         sheet = self.export_and_get_default_sheet()
-        self.assertEqual(sheet.cell(row=1, column=1)._style, self.openpy_style_obj_1)
+        self.assertEqual(sheet.cell(row=1, column=1)._style, self.get_workbook_style(self.styler_obj_1))
 
     def test_set_column_width(self):
         # testing some edge cases
@@ -250,6 +429,70 @@ class StyleFrameTest(unittest.TestCase):
         self.assertTrue(all(sheet.column_dimensions[col.upper()].width == width_dict[col]
                             for col in width_dict))
 
+    def test_best_fit_widths(self):
+        df = pd.DataFrame({'a': ['a', 'bbb', None], 'b': [1, -100, 5], 'c': [1.5, np.nan, -2.25],
+                           'd': pd.to_datetime(['2020-01-01', '2020-01-02 10:00:00.001', None])})
+        for columnar in (False, True):
+            sf = StyleFrame(df, columnar=columnar)
+            sf.to_excel(self.ew, best_fit=list(df.columns))
+            expected_lengths = {column: max(sf.data_df[column].astype(str).str.len()) for column in df.columns}
+            self.assertEqual(sf._columns_width, {column: (length + sf.A_FACTOR) * sf.P_FACTOR
+                                                 for column, length in expected_lengths.items()})
+
+            if columnar:
+                cached = sf._best_fit_lengths['c']
+                sf.to_excel(self.ew, sheet_name='Sheet2', best_fit='c')
+                self.assertIs(sf._best_fit_lengths['c'], cached)
+                # changed in place, the column keeps its Series
+                sf.data_df['c'].values[1] = 1234.125
+                sf.to_excel(self.ew, sheet_name='Sheet3', best_fit='c')
+                self.assertEqual(sf._columns_width['c'], (len('1234.125') + sf.A_FACTOR) * sf.P_FACTOR)
+            else:
+                self.assertEqual(sf._best_fit_lengths, {})
+                sf.iloc[0, 0].value = 'a much much longer value than before'
+                sf.to_excel(self.ew, sheet_name='Sheet3', best_fit='a')
+                self.assertEqual(sf._columns_width['a'],
+                                 (len('a much much longer value than before') + sf.A_FACTOR) * sf.P_FACTOR)
+
+            sf.loc[0, 'a'] = 'a longer value' if columnar else Container('a longer value')
+            sf.to_excel(self.ew, sheet_name='Sheet4', best_fit='a')
+            self.assertEqual(sf._columns_width['a'], (len('a longer value') + sf.A_FACTOR) * sf.P_FACTOR)
+
+    def test_best_fit_font_metrics(self):
+        # Courier New is monospaced, 600/1000 of the font size for every character
+        def get_expected_width(text_length, font_size):
+            text_width = text_length * 0.6 * font_size * 96 / 72.0
+            return np.ceil((text_width + 5) / 7 * 256) / 256
+
+        df = pd.DataFrame({'a': ['abcd', 'ab', None], 'b': [1, -100, 5], 'c': ['iiii', 'bbbb', 'x']})
+        for columnar in (False, True):
+            sf = StyleFrame(df, Styler(font='Courier New', font_size=10), columnar=columnar)
+            sf.apply_style_by_indexes(sf.index[-1], Styler(font='Courier New', font_size=20), cols_to_style='a')
+            sf.to_excel(TEST_FILENAME, write_only=True, best_fit=['a', 'b'], font_metrics=True).save()
+            # None is formatted as 'None' in the larger font
+            self.assertEqual(sf._columns_width, {'a': get_expected_width(4, 20), 'b': get_expected_width(4, 10)})
+            sheet = load_workbook(TEST_FILENAME).active
+            self.assertEqual(sheet.column_dimensions['A'].width, get_expected_width(4, 20))
+
+            sf = StyleFrame(df, columnar=columnar)
+            sf.apply_column_style('c', Styler(bold=True), style_header=False)
+            sf.to_excel(self.ew, best_fit=['a', 'c'], font_metrics=True)
+            # 'iiii' is narrower than 'abcd' in Arial, and 'bbbb' is wider even when it isn't bold
+            self.assertGreater(sf._columns_width['c'], sf._columns_width['a'])
+            regular_sf = StyleFrame(df, columnar=columnar)
+            regular_sf.to_excel(self.ew, 'Sheet2', best_fit='c', font_metrics=True)
+            self.assertGreater(sf._columns_width['c'], regular_sf._columns_width['c'])
+
+        # extension columns are measured the same in both modes, missing values included
+        df = pd.DataFrame({'a': pd.period_range('2020-01', periods=3, freq='M'),
+                           'b': pd.arrays.SparseArray([0.5, None, 2.25]), 'c': pd.array([1, None, 3], dtype='Int64')})
+        columns_widths = []
+        for columnar in (False, True):
+            sf = StyleFrame(df, columnar=columnar)
+            sf.to_excel(self.ew, best_fit=list(df.columns), font_metrics=True)
+            columns_widths.append(sf._columns_width)
+        self.assertEqual(columns_widths[0], columns_widths[1])
+
     def test_set_row_height(self):
         # testing some edge cases
         with self.assertRaises(TypeError):
@@ -316,6 +559,229 @@ class StyleFrameTest(unittest.TestCase):
             # noinspection PyStatementEffect
             new_sf['A']
 
+        # the renamed StyleFrame has styles of its own
+        new_sf.columns[0].style.bold = not self.sf.columns[0].style.bold
+        new_sf.iloc[0, 0].style.bold = not self.sf.iloc[0, 0].style.bold
+        self.assertNotEqual(new_sf.columns[0].style, self.sf.columns[0].style)
+        self.assertNotEqual(new_sf.iloc[0, 0].style, self.sf.iloc[0, 0].style)
+
+    def test_to_excel_values_and_styles(self):
+        sf = StyleFrame({'a': [1, None]}, self.styler_obj_1)
+        sf.to_excel(self.ew, header=False, startrow=1, na_rep='-')
+        sf.to_excel(self.ew, startrow=4)
+        sheet = self.ew.sheets['Sheet1']
+        self.assertEqual([sheet.cell(row=row, column=1).value for row in range(2, 7)], [1, '-', None, 'a', 1])
+        self.assertEqual(sheet.cell(row=2, column=1)._style, self.get_workbook_style(self.styler_obj_1))
+        self.assertEqual(sheet.cell(row=3, column=1)._style, self.get_workbook_style(self.styler_obj_1))
+
+    def test_to_excel_value_types(self):
+        values = [uuid.UUID(int=1), [1, 2], pd.Period('2020-01', 'M'), pd.Interval(0, 1), 1 + 2j, pd.NA, None,
+                  pd.Timedelta(days=1, hours=12), dt.timedelta(hours=6), dt.time(6, 30), np.int64(3), np.bool_(True),
+                  float('-inf'), 'a']
+        expected_values = ['00000000-0000-0000-0000-000000000001', '[1, 2]', '2020-01', '(0, 1]', '(1+2j)', '-', '-',
+                           1.5, 0.25, '06:30:00', 3, True, '-inf', 'a']
+        for columnar in (True, False):
+            sf = StyleFrame({'a': values}, columnar=columnar)
+            for kwargs in ({}, {'columns': ['a']}, {'write_only': True}, {'write_only': True, 'direct_xml': True}):
+                sf.to_excel(TEST_FILENAME, header=False, na_rep='-', **kwargs).save()
+                sheet = load_workbook(TEST_FILENAME).active
+                self.assertEqual([row[0].value for row in sheet.iter_rows()], expected_values)
+
+            sf = StyleFrame({'a': pd.array([1, None], dtype='Int64'), 'b': pd.array([True, None], dtype='boolean')},
+                            columnar=columnar)
+            for kwargs in ({}, {'write_only': True}, {'write_only': True, 'direct_xml': True}):
+                sf.to_excel(TEST_FILENAME, header=False, na_rep='-', **kwargs).save()
+                sheet = load_workbook(TEST_FILENAME).active
+                self.assertEqual([[cell.value for cell in row] for row in sheet.iter_rows()], [[1, True], ['-', '-']])
+
+            sf = StyleFrame({'a': [pd.Timestamp('2020-01-01', tz='UTC')]}, columnar=columnar)
+            for kwargs in ({}, {'write_only': True}, {'write_only': True, 'direct_xml': True}):
+                with self.assertRaises(ValueError):
+                    sf.to_excel(TEST_FILENAME, **kwargs)
+
+    def test_to_excel_write_only(self):
+        self.apply_column_style(cols_to_style='a', styler_obj=Styler(bold=True, bg_color=utils.colors.yellow))
+        self.sf.set_row_height(2, 20)
+        excel_writer = StyleFrame.ExcelWriter(TEST_FILENAME, write_only=True)
+        self.sf.to_excel(excel_writer, row_to_add_filters=0, columns_and_rows_to_freeze='A2')
+        excel_writer.save()
+
+        sheet = load_workbook(TEST_FILENAME).active
+        self.assertEqual(sheet.freeze_panes, 'A2')
+        self.assertEqual(sheet.auto_filter.ref, 'A1:B1')
+        self.assertEqual(sheet.row_dimensions[2].height, 20)
+        self.assertEqual(sheet.column_dimensions['A'].width, 10)
+
+        sf_from_excel = StyleFrame.read_excel(TEST_FILENAME, read_style=True)
+        self.assertTrue(all(list(self.sf[col]) == list(sf_from_excel[col]) for col in self.sf.columns))
+        self.assertTrue(all(self.sf.iloc[row, col].style == sf_from_excel.iloc[row, col].style
+                            for row in range(len(self.sf)) for col in range(len(self.sf.columns))))
+
+    def test_to_excel_write_only_comments(self):
+        styler_obj = Styler(bg_color=utils.colors.yellow, comment_author='author', comment_text='comment')
+        self.apply_style_by_indexes(self.sf.index[1], styler_obj=styler_obj)
+        self.sf.to_excel(TEST_FILENAME, write_only=True).save()
+
+        sf_from_excel = StyleFrame.read_excel(TEST_FILENAME, read_style=True, read_comments=True)
+        self.assertEqual(sf_from_excel.iloc[1, 0].style, styler_obj)
+        self.assertTrue(all(self.sf.iloc[row, col].style == sf_from_excel.iloc[row, col].style
+                            for row in range(len(self.sf)) for col in range(len(self.sf.columns))))
+
+    def test_to_excel_write_only_errors(self):
+        with self.assertRaises(ValueError):
+            self.sf.to_excel(self.ew, write_only=True)
+        with self.assertRaises(TypeError):
+            self.sf.to_excel(StyleFrame.ExcelWriter(TEST_FILENAME, write_only=True), columns=['a'])
+        with self.assertRaises(ValueError):
+            self.sf.to_excel(StyleFrame.ExcelWriter(TEST_FILENAME, write_only=True), processes=0)
+        with self.assertRaises(ValueError):
+            self.sf.to_excel(self.ew, processes=2)
+        with self.assertRaises(ValueError):
+            self.sf.to_excel(self.ew, direct_xml=True)
+
+    def test_to_excel_write_only_processes(self):
+        def get_parts(processes, columnar):
+            sf = StyleFrame({'a': range(40), 'b': ['=HYPERLINK("http://a.com", "a")' if i % 3 else 'b' for i in range(40)]},
+                            columnar=columnar)
+            sf.apply_style_by_indexes(sf.index[25:30], Styler(bg_color=utils.colors.yellow), cols_to_style='a')
+            sf.set_row_height(35, 20)
+            sf.to_excel(TEST_FILENAME, write_only=True, processes=processes, index=True, best_fit='b').save()
+            with zipfile.ZipFile(TEST_FILENAME) as workbook:
+                return [workbook.read(name) for name in ('xl/worksheets/sheet1.xml', 'xl/styles.xml')]
+
+        min_rows_per_range = row_ranges.MIN_ROWS_PER_RANGE
+        row_ranges.MIN_ROWS_PER_RANGE = 10
+        worksheet_writer = row_ranges.WorksheetWriter
+        try:
+            for columnar in (True, False):
+                parts = get_parts(1, columnar)
+                self.assertEqual(get_parts(3, columnar), parts)
+                # openpyxl versions without the internals the ranges are written with fall back to a single process
+                row_ranges.WorksheetWriter = None
+                self.assertEqual(get_parts(3, columnar), parts)
+                row_ranges.WorksheetWriter = worksheet_writer
+        finally:
+            row_ranges.MIN_ROWS_PER_RANGE = min_rows_per_range
+            row_ranges.WorksheetWriter = worksheet_writer
+
+    def test_to_excel_direct_xml(self):
+        def get_sheet_xml(columnar, **kwargs):
+            sf = StyleFrame({'a': [1.5, None, float('inf'), 4, True] * 8,
+                             'b': ['=HYPERLINK("http://a.com", "a")', ' b ', '<b&>', '=SUM(1)', ''] * 8},
+                            columnar=columnar)
+            sf.apply_style_by_indexes(sf.index[25:30], Styler(bg_color=utils.colors.yellow), cols_to_style='a')
+            sf.set_row_height(35, 20)
+            sf.to_excel(TEST_FILENAME, write_only=True, index=True, best_fit='b', startrow=2, na_rep='-',
+                        **kwargs).save()
+            with zipfile.ZipFile(TEST_FILENAME) as workbook:
+                return workbook.read('xl/worksheets/sheet1.xml')
+
+        min_rows_per_range = row_ranges.MIN_ROWS_PER_RANGE
+        row_ranges.MIN_ROWS_PER_RANGE = 10
+        try:
+            for columnar in (True, False):
+                sheet_xml = get_sheet_xml(columnar)
+                self.assertEqual(get_sheet_xml(columnar, direct_xml=True), sheet_xml)
+                self.assertEqual(get_sheet_xml(columnar, direct_xml=True, processes=3), sheet_xml)
+        finally:
+            row_ranges.MIN_ROWS_PER_RANGE = min_rows_per_range
+
+    def test_insert_rows(self):
+        class Writer(object):
+            out = TEST_FILENAME
+
+        class ClosedSheet(object):
+            _rows = iter(())
+            _writer = Writer
+
+            def close(self):
+                pass
+
+        # openpyxl writes an empty sheetData as a self-closing element with some xml backends
+        for sheet_data in (b'<sheetData></sheetData>', b'<sheetData />', b'<sheetData/>'):
+            with open(TEST_FILENAME, 'wb') as out:
+                out.write(b'<worksheet>' + sheet_data + b'<pageMargins /></worksheet>')
+            xml_writer.insert_rows(ClosedSheet(), lambda out: out.write(b'<row r="1"></row>'))
+            with open(TEST_FILENAME, 'rb') as sheet_file:
+                self.assertEqual(sheet_file.read(),
+                                 b'<worksheet><sheetData><row r="1"></row></sheetData><pageMargins /></worksheet>')
+
+    def test_read_excel_shares_styles(self):
+        self.export_and_get_default_sheet(save=True)
+        sf_from_excel = StyleFrame.read_excel(TEST_FILENAME, read_style=True, share_styles=True)
+        self.assertIs(sf_from_excel.iloc[0, 1].style, sf_from_excel.iloc[1, 1].style)
+        self.assertEqual(sf_from_excel.iloc[0, 1].style, self.sf.iloc[0, 1].style)
+        self.assertIsNot(sf_from_excel.iloc[0, 1].style, sf_from_excel.columns[1].style)
+
+        sf_from_excel = StyleFrame.read_excel(TEST_FILENAME, read_style=True)
+        self.assertEqual(sf_from_excel.iloc[0, 1].style, sf_from_excel.iloc[1, 1].style)
+        sf_from_excel.iloc[0, 1].style.bold = not sf_from_excel.iloc[0, 1].style.bold
+        self.assertNotEqual(sf_from_excel.iloc[0, 1].style, sf_from_excel.iloc[1, 1].style)
+
+    def test_read_excel_with_style_and_pandas_kwargs(self):
+        self.export_and_get_default_sheet(save=True)
+        sf_from_excel = StyleFrame.read_excel(TEST_FILENAME, read_style=True, nrows=2, dtype=str)
+        self.assertEqual(list(sf_from_excel['b']), list(self.sf['b'])[:2])
+        self.assertEqual(sf_from_excel.iloc[1, 1].style, self.sf.iloc[1, 1].style)
+
+    def test_read_excel_read_only(self):
+        self.export_and_get_default_sheet(save=True)
+        sf_from_excel = StyleFrame.read_excel(TEST_FILENAME, read_style=True, read_only=True)
+        self.assertTrue(all(list(self.sf[col]) == list(sf_from_excel[col]) for col in self.sf.columns))
+        self.assertTrue(all(sf_from_excel.iloc[row, col].style == self.sf.iloc[row, col].style
+                            for row in range(len(self.sf)) for col in range(len(self.sf.columns))))
+        with self.assertRaises(ValueError):
+            StyleFrame.read_excel(TEST_FILENAME, read_style=True, read_only=True, read_comments=True)
+
+    def test_read_excel_lazy_style(self):
+        self.export_and_get_default_sheet(save=True)
+        sf_from_excel = StyleFrame.read_excel(TEST_FILENAME, read_style=True, lazy_style=True)
+        self.assertIsInstance(sf_from_excel.iloc[0, 1]._style, LazyStyler)
+        self.assertEqual(sf_from_excel.iloc[0, 1].style, self.sf.iloc[0, 1].style)
+        self.assertIsNot(sf_from_excel.iloc[0, 1].style, sf_from_excel.iloc[1, 1].style)
+        self.assertTrue(all(sf_from_excel.iloc[row, col].style == self.sf.iloc[row, col].style
+                            for row in range(len(self.sf)) for col in range(len(self.sf.columns))))
+
+        sf_from_excel = StyleFrame.read_excel(TEST_FILENAME, read_style=True, lazy_style=True, share_styles=True)
+        self.assertIs(sf_from_excel.iloc[0, 1].style, sf_from_excel.iloc[1, 1].style)
+
+        sf_from_excel = StyleFrame.read_excel(TEST_FILENAME, read_style=True, lazy_style=True, columnar=True)
+        self.assertTrue(all(sf_from_excel._styles.get(row, col) == self.sf.iloc[row, col].style
+                            for row in range(len(self.sf)) for col in range(len(self.sf.columns))))
+        with self.assertRaises(ValueError):
+            StyleFrame.read_excel(TEST_FILENAME, read_style=True, lazy_style=True, use_openpyxl_styles=True)
+
+    def test_read_excel_chunks(self):
+        sf = StyleFrame({'a': list(range(5)), 'b': ['row_{}'.format(i) for i in range(5)]}, self.default_styler_obj)
+        yellow_styler_obj = Styler(bg_color=utils.colors.yellow)
+        sf.apply_style_by_indexes(sf.index[3], styler_obj=yellow_styler_obj)
+        sf.set_column_width('b', 30)
+        sf.set_row_height(1, 25)
+        sf.set_row_height(5, 20)
+        sf.to_excel(self.ew)
+        self.ew.save()
+
+        chunks = list(StyleFrame.read_excel_chunks(TEST_FILENAME, chunksize=2, read_style=True))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual([index.value for chunk in chunks for index in chunk.index], list(range(5)))
+        self.assertEqual([value for chunk in chunks for value in chunk['a']], list(sf['a']))
+        self.assertEqual(chunks[1].iloc[1, 1].style, yellow_styler_obj)
+        self.assertEqual(chunks[1].iloc[0, 1].style, self.default_styler_obj)
+        self.assertEqual(chunks[0].columns[0].style, sf.columns[0].style)
+        self.assertEqual(chunks[1]._rows_height, {1: 25, 3: 20})
+        self.assertEqual(chunks[2]._columns_width, {'b': 30})
+
+        with self.assertRaises(ValueError):
+            next(StyleFrame.read_excel_chunks(TEST_FILENAME, chunksize=0))
+
+    def test_read_excel_no_header(self):
+        self.export_and_get_default_sheet(save=True)
+        for read_only in (False, True):
+            sf_from_excel = StyleFrame.read_excel(TEST_FILENAME, read_style=True, header=None, read_only=read_only)
+            self.assertEqual(list(sf_from_excel[0]), ['a'] + list(self.sf['a']))
+            self.assertEqual(sf_from_excel.columns[0].style, self.sf.columns[0].style)
+            self.assertEqual(sf_from_excel.iloc[0, 1].style, self.default_styler_obj)
+
     def test_read_excel_no_style(self):
         self.export_and_get_default_sheet(save=True)
         sf_from_excel = StyleFrame.read_excel(TEST_FILENAME)
@@ -399,13 +865,13 @@ class StyleFrameTest(unittest.TestCase):
 
     def test_style_alternate_rows(self):
         styles = [self.styler_obj_1, self.styler_obj_2]
-        openpy_styles = [self.openpy_style_obj_1, self.openpy_style_obj_2]
         self.sf.style_alternate_rows(styles)
 
-        self.assertTrue(all(self.sf.iloc[index.value, 0].style.to_openpyxl_style() == styles[index.value % len(styles)].to_openpyxl_style()
+        self.assertTrue(all(self.sf.iloc[index.value, 0].style == styles[index.value % len(styles)]
                             for index in self.sf.index))
 
         sheet = self.export_and_get_default_sheet()
+        openpy_styles = [self.get_workbook_style(styler_obj) for styler_obj in styles]
 
         # sheet start from row 1 and headers are row 1, so need to add 2 when iterating
         self.assertTrue(all(sheet.cell(row=i.value + 2, column=1)._style == openpy_styles[i.value % len(styles)]
@@ -449,3 +915,78 @@ class StyleFrameTest(unittest.TestCase):
         self.assertEqual(rules_dict[0].colorScale.cfvo[1].val, 50.0)
         self.assertEqual(rules_dict[0].colorScale.cfvo[2].type, utils.conditional_formatting_types.percentile)
         self.assertEqual(rules_dict[0].colorScale.cfvo[2].val, 100.0)
+
+    def test_init_columnar(self):
+        sf = StyleFrame({'a': [1, 2, 3], 'b': ['x', 'y', 'z']}, styler_obj=self.styler_obj_1, columnar=True)
+        self.assertEqual(sf.data_df['a'].dtype, 'int64')
+        self.assertEqual(sf._styles.cells.shape, (3, 2))
+        self.assertTrue(all(sf._styles.get(i, j) == self.styler_obj_1 for i in range(3) for j in range(2)))
+
+        dates = pd.Series(pd.date_range('2020-01-01', periods=3, tz='UTC'))
+        self.assertEqual(StyleFrame({'a': dates}, columnar=True).data_df['a'].dtype, dates.dtype)
+        self.assertEqual(StyleFrame(StyleFrame({'a': dates}), columnar=True).data_df['a'].dtype, dates.dtype)
+
+        # converting between the two representations keeps the styles
+        self.sf.apply_column_style('a', self.styler_obj_2)
+        sf = StyleFrame(self.sf, columnar=True)
+        self.assertTrue(all(sf._styles.get(i, 0) == self.styler_obj_2 for i in range(3)))
+        self.assertTrue(all(sf._styles.get(i, 1) == self.default_styler_obj for i in range(3)))
+        self.assertTrue(all(container.style == self.styler_obj_2 for container in StyleFrame(sf, columnar=False)['a']))
+
+    def test_columnar_styles_parity(self):
+        df = pd.DataFrame({'a': pd.to_datetime(['2020-01-01', None, '2020-01-03']),
+                           'b': pd.Series([dt.date(2020, 1, 1), None, pd.NaT], dtype=object), 'c': [1, 2, 3]})
+
+        def get_sheet_styles(columnar):
+            sf = StyleFrame(df, columnar=columnar)
+            yield [[sf._styles.get(row, col).number_format if columnar else sf.iloc[row, col].style.number_format
+                    for col in range(3)] for row in range(3)]
+            sf.apply_column_style(['a', 'b'], self.styler_obj_2)
+            sf.apply_style_by_indexes(sf.index[1], Styler(bold=True), cols_to_style='a')
+            sf.to_excel(TEST_FILENAME).save()
+            sheet = load_workbook(TEST_FILENAME).active
+            yield [[(cell.number_format, cell.font.b, cell.fill.fgColor.rgb, cell.comment and cell.comment.text)
+                    for cell in row] for row in sheet.iter_rows()]
+
+        for containers_styles, columnar_styles in zip(get_sheet_styles(False), get_sheet_styles(True)):
+            self.assertEqual(containers_styles, columnar_styles)
+
+    def test_columnar_extension_columns(self):
+        sf = StyleFrame({'a': pd.period_range('2020-01', periods=3, freq='M'),
+                         'b': pd.arrays.SparseArray([0, 1, 0])}, columnar=True)
+        sf.apply_column_style(['a', 'b'], self.styler_obj_2)
+        self.assertTrue(all(sf._styles.get(i, j) == self.styler_obj_2 for i in range(3) for j in range(2)))
+        for kwargs in ({}, {'write_only': True}, {'write_only': True, 'direct_xml': True}):
+            sf.to_excel(TEST_FILENAME, **kwargs).save()
+            sheet = load_workbook(TEST_FILENAME).active
+            self.assertEqual([[cell.value for cell in row] for row in sheet.iter_rows(min_row=2)],
+                             [['2020-01', 0], ['2020-02', 1], ['2020-03', 0]])
+
+        containers_sf = StyleFrame(sf, columnar=False)
+        for best_fit_sf in (sf, containers_sf):
+            best_fit_sf.to_excel(TEST_FILENAME, best_fit=['a', 'b'])
+        self.assertEqual(sf._columns_width, containers_sf._columns_width)
+
+    def test_apply_styles_columnar(self):
+        self.sf = StyleFrame(self.sf, columnar=True)
+        self.sf.apply_style_by_indexes([1], styler_obj=self.styler_obj_1, cols_to_style='a')
+        self.sf.apply_column_style('b', styler_obj=self.styler_obj_2)
+        self.sf.apply_headers_style(self.styler_obj_1)
+
+        self.assertEqual(self.sf._styles.get(1, 0), self.styler_obj_1)
+        self.assertEqual(self.sf._styles.get(0, 0), self.default_styler_obj)
+        self.assertTrue(all(self.sf._styles.get(i, 1) == self.styler_obj_2 for i in range(3)))
+        self.assertEqual(len(set(self.sf._styles.table.styles)), len(self.sf._styles.table))
+
+        sheet = self.export_and_get_default_sheet()
+        self.assertEqual(sheet.cell(row=1, column=1)._style, self.get_workbook_style(self.styler_obj_1))
+        self.assertEqual(sheet.cell(row=3, column=1)._style, self.get_workbook_style(self.styler_obj_1))
+        self.assertTrue(all(sheet.cell(row=i, column=2)._style == self.get_workbook_style(self.styler_obj_2) for i in range(2, 5)))
+
+    def test_read_excel_columnar(self):
+        self.export_and_get_default_sheet(save=True)
+        sf_from_excel = StyleFrame.read_excel(TEST_FILENAME, read_style=True, columnar=True)
+        self.assertTrue(all(list(self.sf[col]) == list(sf_from_excel[col]) for col in self.sf.columns))
+        self.assertTrue(all(sf_from_excel._styles.get(i, j) == self.sf.iloc[i, j].style
+                            for i in range(len(self.sf))
+                            for j in range(len(self.sf.columns))))
@@ -0,0 +1,55 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from StyleFrame import Styler, utils
+from StyleFrame.style_matrix import StyleMatrix, StyleTable
+
+
+class StyleTableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = StyleTable()
+
+    def test_add(self):
+        self.assertEqual(self.table.add(Styler()), 0)
+        self.assertEqual(self.table.add(Styler(bold=True)), 1)
+        self.assertEqual(self.table.add(Styler(bold=True)), 1)
+        self.assertEqual(len(self.table), 2)
+        self.assertEqual(self.table[1], Styler(bold=True))
+
+    def test_default_ids(self):
+        self.assertTrue((self.table.default_ids(pd.Series([1, 2])) == 0).all())
+        ids = self.table.default_ids(pd.Series(pd.date_range('2019-01-01', periods=2)))
+        self.assertEqual(self.table[ids[0]].number_format, utils.number_formats.default_date_time_format)
+        ids = self.table.default_ids(pd.Series([1, 2]), Styler(bold=True))
+        self.assertTrue(all(self.table[style_id] == Styler(bold=True) for style_id in ids))
+
+
+class StyleMatrixTest(unittest.TestCase):
+    def setUp(self):
+        self.matrix = StyleMatrix.from_dataframe(pd.DataFrame({'a': [1, 2, 3], 'b': ['x', 'y', 'z']}))
+
+    def test_from_dataframe(self):
+        self.assertEqual(self.matrix.shape, (3, 2))
+        self.assertEqual(self.matrix.cells.dtype, np.int32)
+        self.assertTrue((self.matrix.cells == 0).all())
+
+    def test_set(self):
+        self.matrix.set([0, 2], [1], Styler(bold=True))
+        self.assertEqual(self.matrix.get(0, 1), Styler(bold=True))
+        self.assertEqual(self.matrix.get(1, 1), Styler())
+        self.matrix.set(np.array([False, True, False]), [0, 1], Styler(bold=True))
+        self.assertTrue((self.matrix.cells[1] == 1).all())
+
+    def test_take(self):
+        self.matrix.set_headers(1, Styler(bold=True))
+        matrix = self.matrix.take(rows=[0, 1], cols=[1])
+        self.assertEqual(matrix.shape, (2, 1))
+        self.assertEqual(matrix.get_header(0), Styler(bold=True))
+
+    def test_insert_and_delete_column(self):
+        self.matrix.insert_column(1, [1, 1, 1])
+        self.assertEqual(self.matrix.shape, (3, 3))
+        self.assertTrue((self.matrix.cells[:, 1] == 1).all())
+        self.matrix.delete_column(1)
+        self.assertEqual(self.matrix.shape, (3, 2))
@@ -1,6 +1,9 @@
+import copy
+import pickle
 import unittest
 
 from StyleFrame import Styler, utils
+from StyleFrame.styler import FrozenStyler
 
 
 class StylerTests(unittest.TestCase):
@@ -34,3 +37,45 @@ class StylerTests(unittest.TestCase):
                             fill_pattern_type=utils.fill_pattern_types.gray0625, indent=1)
 
         self.assertEqual(styler_obj, Styler.from_openpyxl_style(styler_obj.to_openpyxl_style(), []))
+
+    def test_hash(self):
+        self.assertEqual(hash(self.yellow_1), hash(self.yellow_2))
+        self.assertEqual(len({self.yellow_1, self.yellow_2, self.blue}), 2)
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            Styler().non_existing_attribute = 1
+
+    def test_freeze(self):
+        frozen = self.yellow_1.freeze()
+        self.assertIsInstance(frozen, FrozenStyler)
+        self.assertIs(frozen, self.yellow_2.freeze())
+        self.assertIs(frozen, frozen.freeze())
+        self.assertIs(frozen, FrozenStyler(bg_color='yellow'))
+        self.assertEqual(frozen, self.yellow_1)
+        self.assertEqual(self.yellow_1, frozen)
+        self.assertEqual(hash(frozen), hash(self.yellow_1))
+        self.assertNotEqual(frozen, self.blue.freeze())
+
+    def test_frozen_is_immutable(self):
+        frozen = self.yellow_1.freeze()
+        with self.assertRaises(AttributeError):
+            frozen.bold = True
+        with self.assertRaises(AttributeError):
+            del frozen.bold
+        self.assertEqual(frozen.bold, False)
+
+    def test_thaw(self):
+        frozen = self.yellow_1.freeze()
+        thawed = frozen.thaw()
+        self.assertIs(type(thawed), Styler)
+        self.assertEqual(thawed, frozen)
+        thawed.bold = True
+        self.assertFalse(frozen.bold)
+        self.assertIsNot(self.yellow_1.thaw(), self.yellow_1)
+
+    def test_frozen_copy_and_pickle(self):
+        frozen = self.yellow_bold_underline.freeze()
+        self.assertIs(copy.deepcopy(frozen), frozen)
+        self.assertIs(pickle.loads(pickle.dumps(frozen)), frozen)
+        self.assertEqual(frozen + self.blue, Styler(bg_color='blue', bold=True, underline='single'))
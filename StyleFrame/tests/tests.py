@@ -3,12 +3,17 @@ import unittest
 from StyleFrame.command_line.tests.commandline_tests import CommandlineInterfaceTest
 from StyleFrame.tests.container_tests import ContainerTest
 from StyleFrame.tests.series_tests import SeriesTest
+from StyleFrame.tests.sheet_writer_tests import SheetWriterTest
+from StyleFrame.tests.style_cache_tests import StyleCacheTest
 from StyleFrame.tests.style_frame_tests import StyleFrameTest
+from StyleFrame.tests.style_matrix_tests import StyleTableTest, StyleMatrixTest
 from StyleFrame.tests.styler_tests import StylerTests
+from StyleFrame.tests.workbook_builder_tests import WorkbookBuilderTest
 
 
 def run():
-    test_classes = [ContainerTest, StyleFrameTest, CommandlineInterfaceTest, SeriesTest, StylerTests]
+    test_classes = [ContainerTest, StyleFrameTest, CommandlineInterfaceTest, SeriesTest, StylerTests, StyleTableTest,
+                    StyleMatrixTest, StyleCacheTest, SheetWriterTest, WorkbookBuilderTest]
     for test_class in test_classes:
         suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
         unittest.TextTestRunner().run(suite)
@@ -0,0 +1,76 @@
+import unittest
+import os
+import pickle
+
+from collections import OrderedDict
+from openpyxl import load_workbook
+from StyleFrame import StyleFrame, Styler, WorkbookBuilder, utils
+from StyleFrame.tests import TEST_FILENAME
+
+
+class WorkbookBuilderTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.styler_obj = Styler(bg_color=utils.colors.yellow, bold=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            os.remove(TEST_FILENAME)
+        except OSError as ex:
+            print(ex)
+
+    def get_sheets(self):
+        first_sf = StyleFrame({'a': [1, 2], 'b': ['x', 'y']}, self.styler_obj, columnar=True)
+        first_sf.apply_style_by_indexes(first_sf.index[:1], Styler(number_format=utils.number_formats.percent),
+                                        cols_to_style='a')
+        second_sf = StyleFrame({'c': ['=HYPERLINK("http://a.com", "a")', 'long value'], 'd': [1.5, 2.5]})
+        commented_sf = StyleFrame({'e': [1]}, Styler(comment_text='comment'))
+        return OrderedDict([('first', first_sf), ('second', second_sf), ('commented', commented_sf)])
+
+    def test_pickle(self):
+        sf = StyleFrame({'a': [1, 2]}, self.styler_obj)
+        unpickled_sf = pickle.loads(pickle.dumps(sf))
+        self.assertEqual(unpickled_sf.loc[0, 'a'].style, self.styler_obj)
+        self.assertEqual(list(unpickled_sf.columns), list(sf.columns))
+        unpickled_sf.set_column_width('a', 20)
+        self.assertEqual(unpickled_sf._columns_width, {'a': 20})
+
+    def test_save(self):
+        serial_filename = TEST_FILENAME.replace('.xlsx', '_serial.xlsx')
+        try:
+            WorkbookBuilder(self.get_sheets(), processes=1, row_to_add_filters=0).save(serial_filename)
+            builder = WorkbookBuilder(processes=2, row_to_add_filters=0)
+            for sheet_name, sf in self.get_sheets().items():
+                builder.add_sheet(sheet_name, sf, best_fit=list(sf.columns) if sheet_name == 'second' else None)
+            builder.save(TEST_FILENAME)
+
+            workbook = load_workbook(TEST_FILENAME)
+            self.assertEqual(workbook.sheetnames, ['first', 'second', 'commented'])
+            self.assertEqual(workbook['first'].auto_filter.ref, 'A1:B1')
+            self.assertEqual(workbook['commented']['A2'].comment.text, 'comment')
+            self.assertGreater(workbook['second'].column_dimensions['A'].width, 13)
+            serial_workbook = load_workbook(serial_filename)
+            for sheet_name in ('first', 'commented'):
+                for row, serial_row in zip(workbook[sheet_name].iter_rows(), serial_workbook[sheet_name].iter_rows()):
+                    for cell, serial_cell in zip(row, serial_row):
+                        self.assertEqual(cell.value, serial_cell.value)
+                        self.assertEqual(Styler.from_openpyxl_style(cell, [], cell.comment),
+                                         Styler.from_openpyxl_style(serial_cell, [], serial_cell.comment))
+
+            sf_from_excel = StyleFrame.read_excel(TEST_FILENAME, sheet_name='first', read_style=True)
+            self.assertEqual(sf_from_excel.loc[1, 'b'].style, self.styler_obj)
+            self.assertEqual(sf_from_excel.loc[0, 'a'].style.number_format, utils.number_formats.percent)
+        finally:
+            if os.path.exists(serial_filename):
+                os.remove(serial_filename)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            WorkbookBuilder(processes=0)
+        builder = WorkbookBuilder()
+        builder.add_sheet('first', self.get_sheets()['first'])
+        with self.assertRaises(ValueError):
+            builder.add_sheet('first', self.get_sheets()['first'])
+        with self.assertRaises(TypeError):
+            builder.add_sheet('second', {'a': [1]})
@@ -0,0 +1,253 @@
+# coding:utf-8
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+
+from collections import OrderedDict
+from openpyxl import Workbook
+
+PY2 = sys.version_info[0] == 2
+
+# Python 2
+if PY2:
+    # noinspection PyUnresolvedReferences
+    from container import Container
+    # noinspection PyUnresolvedReferences
+    from style_frame import StyleFrame, str_type, unicode_type
+    # noinspection PyUnresolvedReferences
+    from styler import Styler
+# Python 3
+else:
+    from StyleFrame.container import Container
+    from StyleFrame.style_frame import StyleFrame, str_type, unicode_type
+    from StyleFrame.styler import Styler
+
+# the name openpyxl gives the only sheet of a workbook
+SINGLE_SHEET_PATH = 'xl/worksheets/sheet1.xml'
+
+
+class _RenderTarget(object):
+    """The parts of pandas.ExcelWriter that StyleFrame.to_excel uses, for a write-only workbook that is saved directly"""
+
+    def __init__(self):
+        self.book = Workbook(write_only=True)
+        self.sheets = {}
+
+
+def _register_styles(book, styles):
+    """Adds the given styles to the workbook's cell styles, in order, and returns the workbook's cell styles.
+    Workbooks that register the same styles in the same order assign them the same style ids.
+
+    :param openpyxl.Workbook book: A new workbook
+    :param list styles: Styler objects
+    :rtype: list
+    """
+
+    style_cache = Styler.get_workbook_cache(book)
+    for style in styles:
+        named_style = style.to_openpyxl_style(style_cache)
+        # the same as assigning the named style to a cell does
+        if named_style not in book._named_styles:
+            book.add_named_style(named_style)
+        book._cell_styles.add(named_style.as_tuple())
+    return [tuple(style_array) for style_array in book._cell_styles]
+
+
+def _render_sheet(task):
+    """Renders a sheet in a workbook of its own, with the styles registered in the shared order.
+    Returns None if the sheet needed styles that were not registered, since their ids would not be shared.
+    Runs in the worker processes.
+    """
+
+    sheet_name, sf, to_excel_kwargs, styles, path = task
+    target = _RenderTarget()
+    style_arrays = _register_styles(target.book, styles)
+    sf.to_excel(target, sheet_name=sheet_name, **to_excel_kwargs)
+    if len(target.book._cell_styles) != len(style_arrays):
+        return None
+    target.book.save(path)
+    return path, style_arrays, target.sheets[sheet_name].auto_filter.ref
+
+
+class WorkbookBuilder(object):
+    """
+    Renders the sheets of a workbook in parallel, each in a separate worker process, and merges them into a single
+    xlsx file. The distinct styles of all the sheets are registered in the same order by every process, so they
+    share a single stylesheet and each sheet's xml can be copied to the merged file as it is.
+    Sheets that can't be rendered this way (for example sheets with comments) are rendered by the calling process.
+    """
+
+    def __init__(self, sheets=None, processes=None, **to_excel_kwargs):
+        """
+        :param None|dict sheets: Sheet name -> StyleFrame. Use an OrderedDict to keep the order of the sheets in
+            Python versions older than 3.7
+        :param None|int processes: The number of worker processes. Defaults to the number of CPUs.
+        :param to_excel_kwargs: Arguments passed to StyleFrame.to_excel for every sheet. Only the arguments that
+            to_excel supports with write_only=True can be used.
+        """
+
+        if processes is not None and processes < 1:
+            raise ValueError('processes must be None or a positive integer, got {} instead'.format(processes))
+        self.processes = processes
+        self.to_excel_kwargs = to_excel_kwargs
+        self.sheets = OrderedDict()
+        for sheet_name, sf in (sheets or {}).items():
+            self.add_sheet(sheet_name, sf)
+
+    def add_sheet(self, sheet_name, sf, **to_excel_kwargs):
+        """
+        :param str sheet_name:
+        :param StyleFrame sf:
+        :param to_excel_kwargs: Arguments passed to StyleFrame.to_excel for this sheet, overriding the ones
+            the WorkbookBuilder was created with.
+        :return: self
+        :rtype: WorkbookBuilder
+        """
+
+        if not isinstance(sf, StyleFrame):
+            raise TypeError('sf must be {}, got {} instead.'.format(StyleFrame.__name__, type(sf).__name__))
+        if sheet_name in self.sheets:
+            raise ValueError('Sheet {} was already added'.format(sheet_name))
+        kwargs = dict(self.to_excel_kwargs)
+        kwargs.update(to_excel_kwargs)
+        self.sheets[sheet_name] = (sf, kwargs)
+        return self
+
+    def save(self, path='output.xlsx'):
+        """Renders all the sheets and saves the workbook to the given path.
+
+        :param str path:
+        """
+
+        processes = min(self.processes or multiprocessing.cpu_count(), len(self.sheets))
+        if processes <= 1:
+            target = _RenderTarget()
+            for sheet_name, (sf, kwargs) in self.sheets.items():
+                sf.to_excel(target, sheet_name=sheet_name, **kwargs)
+            target.book.save(path)
+            return
+
+        sheets_styles = OrderedDict((sheet_name, self._get_styles(sf, kwargs))
+                                    for sheet_name, (sf, kwargs) in self.sheets.items())
+        styles = []
+        registered = set()
+        for sheet_styles in sheets_styles.values():
+            for style in sheet_styles or ():
+                if style not in registered:
+                    registered.add(style)
+                    styles.append(style)
+
+        target = _RenderTarget()
+        style_arrays = _register_styles(target.book, styles)
+        temp_dir = tempfile.mkdtemp()
+        try:
+            tasks = [(sheet_name, sf, kwargs, styles, os.path.join(temp_dir, '{}.xlsx'.format(sheet_index)))
+                     for sheet_index, (sheet_name, (sf, kwargs)) in enumerate(self.sheets.items())
+                     if sheets_styles[sheet_name] is not None]
+            rendered = self._render(tasks, processes)
+
+            sheets_xml = {}
+            for sheet_name, (sf, kwargs) in self.sheets.items():
+                result = rendered.get(sheet_name)
+                if result is None or result[1] != style_arrays:
+                    sf.to_excel(target, sheet_name=sheet_name, **kwargs)
+                else:
+                    sheet = target.book.create_sheet(sheet_name)
+                    # the workbook keeps the defined names of the sheets' filters
+                    if result[2]:
+                        sheet.auto_filter.ref = result[2]
+                    sheets_xml[sheet] = result[0]
+            target.book.save(path)
+            if sheets_xml:
+                self._merge(path, {sheet.path.lstrip('/'): sheet_path for sheet, sheet_path in sheets_xml.items()})
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def _render(tasks, processes):
+        """Renders the sheets in the worker processes, the largest sheets first.
+
+        :return: sheet name -> the result of _render_sheet
+        :rtype: dict
+        """
+
+        if not tasks:
+            return {}
+        tasks.sort(key=lambda task: task[1].data_df.size, reverse=True)
+        pool = multiprocessing.Pool(min(processes, len(tasks)))
+        try:
+            results = pool.map(_render_sheet, tasks, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+        return {task[0]: result for task, result in zip(tasks, results)}
+
+    @staticmethod
+    def _get_styles(sf, to_excel_kwargs):
+        """Returns the distinct styles the sheet will be written with, in a stable order, or None if the sheet can
+        only be written by the calling process.
+
+        :rtype: None|list
+        """
+
+        if to_excel_kwargs.get('header', True) and not sf._has_custom_headers_style:
+            # the same as to_excel does, so the headers style is known in advance
+            sf.apply_headers_style(Styler.default_header_style())
+        best_fit = to_excel_kwargs.get('best_fit')
+        if best_fit and not isinstance(best_fit, (list, set, tuple)):
+            best_fit = [best_fit]
+
+        styles = OrderedDict()
+        derived_styles = {}
+        default_style = Styler()
+        if to_excel_kwargs.get('index', False):
+            styles[sf._index_header_style] = None
+            for row_index, index_value in enumerate(sf.data_df.index):
+                styles[sf._styles.get_index(row_index) if sf._columnar else index_value.style] = None
+        for col_index, column in enumerate(sf.data_df.columns):
+            styles[sf._styles.get_header(col_index) if sf._columnar else column.style] = None
+            column_values = sf.data_df.iloc[:, col_index]
+            if sf._columnar:
+                column_styles = [sf._styles.table[style_id] for style_id in set(sf._styles.cells[:, col_index].tolist())]
+            else:
+                column_styles = set(value.style if isinstance(value, Container) else default_style
+                                    for value in column_values)
+            is_best_fit = bool(best_fit) and (column if sf._columnar else column.value) in best_fit
+            has_hyperlinks = column_values.dtype == object and any(
+                isinstance(value, (str_type, unicode_type)) and '=HYPERLINK' in value
+                for value in column_values.map(lambda value: value.value if isinstance(value, Container) else value))
+            for style in column_styles:
+                styles[style] = None
+                if has_hyperlinks:
+                    styles[sf._get_style_to_write(style, True, is_best_fit, derived_styles)] = None
+                if is_best_fit:
+                    styles[sf._get_style_to_write(style, False, is_best_fit, derived_styles)] = None
+
+        if not all(isinstance(style, Styler) and style.generate_comment() is None for style in styles):
+            # comments and openpyxl style objects are not shared between the processes
+            return None
+        return list(styles)
+
+    @staticmethod
+    def _merge(path, sheets_xml):
+        """Replaces the given sheets of the workbook with the sheets rendered by the worker processes
+
+        :param str path: The workbook
+        :param dict sheets_xml: The path of a sheet in the workbook -> the workbook the sheet was rendered in
+        """
+
+        merged_path = path + '.merged'
+        with zipfile.ZipFile(path) as source, zipfile.ZipFile(merged_path, 'w', zipfile.ZIP_DEFLATED) as merged:
+            for info in source.infolist():
+                if info.filename in sheets_xml:
+                    with zipfile.ZipFile(sheets_xml[info.filename]) as rendered:
+                        with rendered.open(SINGLE_SHEET_PATH) as sheet_xml, \
+                                merged.open(info.filename, 'w', force_zip64=True) as merged_sheet_xml:
+                            shutil.copyfileobj(sheet_xml, merged_sheet_xml)
+                else:
+                    merged.writestr(info, source.read(info.filename))
+        os.remove(path)
+        os.rename(merged_path, path)
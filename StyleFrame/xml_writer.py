@@ -0,0 +1,527 @@
+# coding:utf-8
+import os
+import re
+import sys
+
+from collections import OrderedDict
+from copy import copy
+
+import numpy as np
+from openpyxl import LXML
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ERROR_CODES, ILLEGAL_CHARACTERS_RE, TIME_TYPES
+from openpyxl.compat import NUMERIC_TYPES
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.datetime import to_excel
+from openpyxl.xml.constants import XML_NS
+from openpyxl.xml.functions import Element, SubElement
+
+try:
+    from openpyxl.cell._writer import write_cell
+    from openpyxl.worksheet._writer import WorksheetWriter
+except ImportError:
+    # older openpyxl versions stream write-only sheets without a reusable writer
+    from openpyxl.writer.etree_worksheet import write_cell
+    WorksheetWriter = None
+
+PY2 = sys.version_info[0] == 2
+
+# Python 2
+if PY2:
+    # noinspection PyUnresolvedReferences
+    from container import Container
+    # noinspection PyUnresolvedReferences
+    from styler import Styler
+    str_type = unicode
+# Python 3
+else:
+    from StyleFrame.container import Container
+    from StyleFrame.styler import Styler
+    str_type = str
+
+# the cells of a block of rows are prepared together, so memory usage does not grow with the size of the sheet
+ROWS_PER_BLOCK = 10000
+MAX_STRING_LENGTH = 32767
+
+SHEET_DATA_START = b'<sheetData>'
+SHEET_DATA_END = b'</sheetData>'
+# an empty sheetData may be written as a self-closing element
+EMPTY_SHEET_DATA_RE = re.compile(br'<sheetData\s*/>')
+# only the elements after the rows (filters, conditional formatting, page setup) follow the end of sheetData
+TAIL_SIZE = 1 << 20
+
+NUMBER_TYPES = frozenset(NUMERIC_TYPES)
+DATE_TYPES = frozenset(TIME_TYPES)
+INFINITY = float('inf')
+
+
+def get_hyperlink_positions(values, get_value):
+    """Returns the positions of the values that are written as hyperlinks (with the style StyleFrame gives them)
+
+    :param list values: Values or Container objects
+    :rtype: list[int]
+    """
+
+    def is_hyperlink(value):
+        return type(value) is str_type and '=HYPERLINK' in value
+
+    # other than strings, only missing and infinite values are written as strings (na_rep and inf_rep)
+    check_other_values = any(is_hyperlink(get_value(value)) for value in (None, INFINITY, -INFINITY))
+    positions = []
+    for position, value in enumerate(values):
+        if type(value) is Container:
+            value = value.value
+        if is_hyperlink(value) or (check_other_values and type(value) is not str_type
+                                   and is_hyperlink(get_value(value))):
+            positions.append(position)
+    return positions
+
+
+def get_written_styles(sf, header, index, best_fit, get_value, index_header_style):
+    """Returns the distinct styles StyleFrame._iter_write_only_rows writes, in the order they first appear in the
+    sheet, or None if some of them can't be written without openpyxl cells (comments and openpyxl style objects).
+
+    :rtype: None|list
+    """
+
+    styles = OrderedDict()
+    derived_styles = {}
+    data_df = sf.data_df
+    if header:
+        if index and data_df.index.name is not None:
+            styles[index_header_style] = None
+        for col_index, column in enumerate(data_df.columns):
+            styles[sf._styles.get_header(col_index) if sf._columnar else column.style] = None
+
+    best_fit_columns = [bool(best_fit) and column in best_fit for column in data_df.columns]
+    hyperlinks = [get_hyperlink_positions(data_df.iloc[:, col_index].tolist(), get_value)
+                  if data_df.iloc[:, col_index].dtype == object else []
+                  for col_index in range(data_df.shape[1])]
+
+    if sf._columnar:
+        # a cell's written style only depends on its style id, whether it is a hyperlink and whether its column is
+        # best fit, so the first appearance of each combination is found without visiting the cells one by one
+        keys = sf._styles.cells.astype(np.int64) * 4 + np.array(best_fit_columns, dtype=np.int64)
+        for col_index, positions in enumerate(hyperlinks):
+            keys[positions, col_index] += 2
+        if index:
+            keys = np.column_stack([sf._styles.index.astype(np.int64) * 4, keys])
+        unique_keys, first_positions = np.unique(keys.ravel(), return_index=True)
+        for key in unique_keys[np.argsort(first_positions, kind='mergesort')].tolist():
+            style = sf._get_style_to_write(sf._styles.table[key >> 2], bool(key & 2), bool(key & 1), derived_styles)
+            styles[style] = None
+    else:
+        # the first (row, column) of every written style, found one column at a time
+        first_cells = {}
+
+        def add_column(col_index, cells_styles, is_best_fit, hyperlink_positions):
+            first_rows = {}
+            hyperlink_positions = set(hyperlink_positions)
+            for row_index, style in enumerate(cells_styles):
+                if style not in first_rows and row_index not in hyperlink_positions:
+                    first_rows[style] = row_index
+            cells = [(sf._get_style_to_write(style, False, is_best_fit, derived_styles), row_index)
+                     for style, row_index in first_rows.items()]
+            cells.extend((sf._get_style_to_write(cells_styles[row_index], True, is_best_fit, derived_styles), row_index)
+                         for row_index in sorted(hyperlink_positions))
+            for style, row_index in cells:
+                if (row_index, col_index) < first_cells.get(style, (row_index + 1, )):
+                    first_cells[style] = (row_index, col_index)
+
+        if index:
+            add_column(-1, [index_value.style for index_value in data_df.index], False, [])
+        default_style = Styler()
+        for col_index in range(data_df.shape[1]):
+            add_column(col_index, [value.style if isinstance(value, Container) else default_style
+                                   for value in data_df.iloc[:, col_index].tolist()],
+                       best_fit_columns[col_index], hyperlinks[col_index])
+        for style in sorted(first_cells, key=first_cells.get):
+            styles[style] = None
+
+    if not all(isinstance(style, Styler) and style.generate_comment() is None for style in styles):
+        return None
+    return list(styles)
+
+
+def register_styles(sf, sheet, styles, style_cache, style_arrays):
+    """Assigns the styles the ids they would get if the rows were written one cell at a time, by registering them
+    with the workbook in the order they first appear in the sheet.
+
+    :return: style -> the style id of the cells written with it, or None for cells without a style
+    :rtype: dict
+    """
+
+    cell = WriteOnlyCell(sheet)
+    style_ids = {}
+    for style in styles:
+        sf._style_cell(cell, style, style_cache, style_arrays)
+        # openpyxl assigns a style its id when the first cell with it is written, and cells without a style have none
+        style_ids[style] = '%d' % cell.style_id if cell.has_style else None
+    return style_ids
+
+
+def insert_rows(sheet, write_rows):
+    """Closes a write-only sheet and inserts rows after the rows that were appended to it
+
+    :param sheet: openpyxl WriteOnlyWorksheet object
+    :param write_rows: Function that writes the xml of the rows to the file object it is called with
+    """
+
+    if sheet._rows is None:
+        # the same as appending the first row does, so the sheet is closed with an empty sheetData
+        sheet._get_writer()
+        sheet._rows = sheet._write_rows()
+        next(sheet._rows)
+    sheet.close()
+    path = sheet._writer.out
+    size = os.path.getsize(path)
+    with open(path, 'r+b') as out:
+        out.seek(max(0, size - TAIL_SIZE))
+        tail = out.read()
+        end = tail.rfind(SHEET_DATA_END)
+        if end == -1:
+            empty_sheet_data = EMPTY_SHEET_DATA_RE.search(tail)
+            out.seek(size - len(tail) + empty_sheet_data.start())
+            tail = SHEET_DATA_END + tail[empty_sheet_data.end():]
+            out.truncate()
+            out.write(SHEET_DATA_START)
+        else:
+            tail = tail[end:]
+            out.seek(size - len(tail))
+            out.truncate()
+        write_rows(out)
+        out.write(tail)
+
+
+def write_sheet_rows(sheet, write_rows):
+    """Writes the rows of a write-only sheet that no rows were appended to while the sheet is written, the same way
+    openpyxl writes appended rows, and closes the sheet.
+
+    :param sheet: openpyxl WriteOnlyWorksheet object
+    :param write_rows: Function that writes the rows to the openpyxl xmlfile object it is called with
+    """
+
+    def stream_rows():
+        xf = sheet._writer.xf.send(True)
+        with xf.element('sheetData'):
+            write_rows(xf)
+            try:
+                yield
+            except GeneratorExit:
+                pass
+        sheet._writer.xf.send(None)
+
+    sheet._get_writer()
+    sheet._rows = stream_rows()
+    next(sheet._rows)
+    sheet.close()
+
+
+def etree_write_value_cell(xf, attributes, data_type, value):
+    """Writes a cell the same way openpyxl's cell writer does when lxml is not installed
+
+    :param dict attributes: The attributes of the cell element
+    :param str data_type: openpyxl data type of the cell, 's' (strings), 'f' (formulas), 'b' or 'n'
+    :param str value: The value as it is written
+    """
+
+    element = Element('c', attributes)
+    if value == '':
+        xf.write(element)
+        return
+    if data_type == 'f':
+        SubElement(element, 'f').text = value[1:]
+        SubElement(element, 'v')
+    elif data_type == 's':
+        text = SubElement(SubElement(element, 'is'), 't')
+        text.text = value
+        if value != value.strip():
+            text.set('{%s}space' % XML_NS, 'preserve')
+    else:
+        SubElement(element, 'v').text = value
+    xf.write(element)
+
+
+def lxml_write_value_cell(xf, attributes, data_type, value):
+    """Writes a cell the same way openpyxl's cell writer does when lxml is installed. See etree_write_value_cell"""
+
+    with xf.element('c', attributes):
+        if value == '':
+            return
+        if data_type == 'f':
+            with xf.element('f', {}):
+                xf.write(value[1:])
+            with xf.element('v'):
+                pass
+        elif data_type == 's':
+            with xf.element('is'):
+                text = Element('t', {'{%s}space' % XML_NS: 'preserve'} if value != value.strip() else {})
+                text.text = value
+                xf.write(text)
+        else:
+            with xf.element('v'):
+                xf.write(value)
+
+
+write_value_cell = lxml_write_value_cell if LXML else etree_write_value_cell
+
+
+class RowsXmlWriter(object):
+    """
+    Writes the rows of a StyleFrame to the xml of a worksheet, the same as openpyxl writes them, one column of a
+    block of rows at a time, without creating an openpyxl cell for every value. Values that have no fast path
+    (error codes, strings with characters Excel does not allow, types other than numbers, strings, booleans and dates)
+    are written by openpyxl's cell writer.
+    """
+
+    def __init__(self, sf, sheet, header, index, leading_columns, best_fit, value_format, index_header_style,
+                 style_ids, style_arrays):
+        """
+        :param StyleFrame sf:
+        :param sheet: The openpyxl WriteOnlyWorksheet object the rows are written to
+        :param dict style_ids: style -> the style id of its cells, as returned by register_styles.
+            Must contain all the written styles.
+        :param dict style_arrays: style -> openpyxl StyleArray, used by openpyxl's cell writer
+        :param tuple value_format: na_rep, float_format and inf_rep
+        See StyleFrame._iter_write_only_rows about the other arguments.
+        """
+
+        self.sf = sf
+        self.sheet = sheet
+        self.header = header
+        self.index = index
+        self.leading_columns = leading_columns
+        self.best_fit = best_fit
+        self.float_format = value_format[1]
+        self.get_value = sf._get_value_converter(*value_format)
+        self.index_header_style = index_header_style
+        self.style_ids = style_ids
+        self.style_arrays = style_arrays
+        book = sheet.parent
+        self.epoch = None if getattr(book, 'iso_dates', False) else getattr(book, 'epoch', None)
+        self._derived_styles = {}
+        self._strings = {}
+        self._rows_attributes = {row: dict(dimension) for row, dimension in sheet.row_dimensions.items()}
+
+    def _get_cell_value(self, value):
+        """Returns the openpyxl data type of a value and the value as it is written,
+        or None if openpyxl has to write it
+        """
+
+        value_type = type(value)
+        if value_type is str_type:
+            try:
+                return self._strings[value]
+            except KeyError:
+                pass
+            if len(value) > MAX_STRING_LENGTH or value in ERROR_CODES or ILLEGAL_CHARACTERS_RE.search(value):
+                return None
+            cell_value = ('f' if len(value) > 1 and value[0] == '=' else 's', value)
+            self._strings[value] = cell_value
+            return cell_value
+        if value_type is bool:
+            return 'b', '%d' % value
+        if value_type in NUMBER_TYPES:
+            if -INFINITY < value < INFINITY:
+                return 'n', '%.16g' % value
+        elif value_type in DATE_TYPES or isinstance(value, TIME_TYPES):
+            if self.epoch is not None:
+                value = to_excel(value, self.epoch)
+                if value is not None:
+                    return 'n', '%.16g' % value
+        return None
+
+    def _get_openpyxl_cell(self, row, column, value, style):
+        current_cell = WriteOnlyCell(self.sheet, value=value)
+        current_cell.row = row
+        current_cell.column = column
+        current_cell._style = copy(self.style_arrays[style])
+        return current_cell
+
+    def _get_column_cells(self, column, rows, values, styles, style_ids):
+        """Returns the cells of a column in the given rows, as the attributes, data type and value of the cell element
+        or as openpyxl cells for values that have no fast path. Missing cells are None.
+
+        :param int column: The sheet column (starts from 1)
+        :param list[int] rows: The sheet rows (start from 1)
+        :param list values: The values to write, already converted
+        :param list styles: The style of each cell
+        :param list[None|str] style_ids: The style id of each cell
+        :rtype: list
+        """
+
+        column_letter = get_column_letter(column)
+        get_cell_value = self._get_cell_value
+        cells = []
+        append = cells.append
+        for position, (row, value, style_id) in enumerate(zip(rows, values, style_ids)):
+            if value is None:
+                append(None)
+                continue
+            cell_value = get_cell_value(value)
+            if cell_value is None:
+                append(self._get_openpyxl_cell(row, column, value, styles[position]))
+                continue
+            data_type, value = cell_value
+            attributes = {'r': '%s%d' % (column_letter, row)}
+            if style_id is not None:
+                attributes['s'] = style_id
+            if data_type == 's':
+                attributes['t'] = 'inlineStr'
+            elif data_type != 'f':
+                attributes['t'] = data_type
+            append((attributes, data_type, value))
+        return cells
+
+    def _write_rows(self, xf, rows, columns_cells):
+        rows_attributes = self._rows_attributes
+        sheet = self.sheet
+        for row, cells in zip(rows, zip(*columns_cells) if columns_cells else [()] * len(rows)):
+            attributes = {'r': '%d' % row}
+            attributes.update(rows_attributes.get(row, {}))
+            with xf.element('row', attributes):
+                for cell in cells:
+                    if cell is None:
+                        continue
+                    if type(cell) is tuple:
+                        write_value_cell(xf, *cell)
+                    else:
+                        write_cell(xf, sheet, cell, cell.has_style)
+
+    def write(self, xf, first_row, startrow=0):
+        """Writes the rows, starting with the headers row if header is True, a block of rows at a time
+
+        :param xf: openpyxl xmlfile object, inside the sheetData element
+        :param int first_row: The sheet row of the first row (starts from 1)
+        :param int startrow: The number of empty rows to write before the first row
+        """
+
+        if startrow:
+            self._write_rows(xf, range(first_row - startrow, first_row), [])
+        sf = self.sf
+        data_df = sf.data_df
+        first_column = self.leading_columns + 1
+        if self.index:
+            first_column += 1
+
+        if self.header:
+            rows = [first_row]
+            columns_cells = []
+            if self.index:
+                style = self.index_header_style
+                columns_cells.append(self._get_column_cells(first_column - 1, rows, [data_df.index.name], [style],
+                                                            [self.style_ids.get(style)]))
+            for col_index, column in enumerate(data_df.columns):
+                if sf._columnar:
+                    value, style = column, sf._styles.get_header(col_index)
+                else:
+                    value, style = column.value, column.style
+                columns_cells.append(self._get_column_cells(first_column + col_index, rows, [value], [style],
+                                                            [self.style_ids[style]]))
+            self._write_rows(xf, rows, columns_cells)
+            first_row += 1
+
+        for start in range(0, len(data_df), ROWS_PER_BLOCK):
+            stop = min(start + ROWS_PER_BLOCK, len(data_df))
+            rows = list(range(first_row + start, first_row + stop))
+            # the strings of a block are usually repeated in the next ones, but the cache shouldn't grow indefinitely
+            self._strings.clear()
+            columns_cells = []
+            if self.index:
+                index_values = data_df.index[start:stop].tolist()
+                if sf._columnar:
+                    styles = [sf._styles.table[style_id] for style_id in sf._styles.index[start:stop].tolist()]
+                else:
+                    styles = [index_value.style for index_value in index_values]
+                columns_cells.append(self._get_column_cells(first_column - 1, rows,
+                                                            [self.get_value(value) for value in index_values],
+                                                            styles, [self.style_ids[style] for style in styles]))
+            for col_index in range(data_df.shape[1]):
+                columns_cells.append(self._get_column_cells(first_column + col_index, rows,
+                                                            *self._get_column_values_and_styles(start, stop,
+                                                                                                col_index)))
+            self._write_rows(xf, rows, columns_cells)
+
+    def _get_column_values(self, column_values):
+        """Returns the values of a column as they are written, calling get_value only for values it may change"""
+
+        get_value = self.get_value
+        # extension columns, such as nullable integers, may hold missing values whatever their kind
+        kind = column_values.dtype.kind if isinstance(column_values.dtype, np.dtype) else ''
+        if kind and kind in 'iub':
+            return column_values.tolist()
+        if kind == 'f':
+            if self.float_format is None and np.isfinite(column_values.values).all():
+                return column_values.tolist()
+        elif kind == 'O':
+            return [value if type(value) is str_type else get_value(value) for value in column_values.tolist()]
+        return [get_value(value) for value in column_values.tolist()]
+
+    def _get_column_values_and_styles(self, start, stop, col_index):
+        """Returns the values of a column in the given range of rows as they are written, their written styles and
+        the style ids of the cells
+        """
+
+        sf = self.sf
+        get_style_to_write = sf._get_style_to_write
+        derived_styles = self._derived_styles
+        style_ids = self.style_ids
+        column = sf.data_df.columns[col_index]
+        is_best_fit = bool(self.best_fit) and column in self.best_fit
+        column_values = sf.data_df.iloc[start:stop, col_index]
+        values = self._get_column_values(column_values)
+        if column_values.dtype.kind == 'O':
+            hyperlinks = [position for position, value in enumerate(values)
+                          if type(value) is str_type and '=HYPERLINK' in value]
+        else:
+            hyperlinks = []
+
+        if sf._columnar:
+            table_ids = sf._styles.cells[start:stop, col_index]
+            written_styles = {table_id: get_style_to_write(sf._styles.table[table_id], False, is_best_fit,
+                                                           derived_styles)
+                              for table_id in np.unique(table_ids).tolist()}
+            table_ids = table_ids.tolist()
+            styles = [written_styles[table_id] for table_id in table_ids]
+            for position in hyperlinks:
+                styles[position] = get_style_to_write(sf._styles.table[table_ids[position]], True, is_best_fit,
+                                                      derived_styles)
+            style_ids_by_table_id = {table_id: style_ids[style] for table_id, style in written_styles.items()}
+            cells_style_ids = [style_ids_by_table_id[table_id] for table_id in table_ids]
+            for position in hyperlinks:
+                cells_style_ids[position] = style_ids[styles[position]]
+        else:
+            default_style = Styler().freeze()
+            cells_styles = [container.style if isinstance(container, Container) else default_style
+                            for container in column_values.tolist()]
+            if is_best_fit:
+                styles = [get_style_to_write(style, False, True, derived_styles) for style in cells_styles]
+            else:
+                styles = list(cells_styles)
+            for position in hyperlinks:
+                styles[position] = get_style_to_write(cells_styles[position], True, is_best_fit, derived_styles)
+            cells_style_ids = [style_ids[style] for style in styles]
+        return values, styles, cells_style_ids
+
+def write_rows_xml(sf, sheet, startrow, header, index, leading_columns, best_fit, value_format, index_header_style,
+                   style_cache, style_arrays):
+    """Writes the rows of a StyleFrame to a write-only sheet that no rows were appended to, directly from the values
+    and the styles, without creating an openpyxl cell for every value. The sheet is closed afterwards.
+    Returns False without writing any row if the rows can't be written this way.
+
+    :param int startrow: The number of empty rows to write before the rows of the StyleFrame
+    :param tuple value_format: na_rep, float_format and inf_rep
+    :rtype: bool
+    """
+
+    if WorksheetWriter is None:
+        return False
+    styles = get_written_styles(sf, header, index, best_fit, sf._get_value_converter(*value_format),
+                                index_header_style)
+    if styles is None:
+        return False
+    style_ids = register_styles(sf, sheet, styles, style_cache, style_arrays)
+    rows_xml_writer = RowsXmlWriter(sf, sheet, header, index, leading_columns, best_fit, value_format,
+                                    index_header_style, style_ids, style_arrays)
+    write_sheet_rows(sheet, lambda xf: rows_xml_writer.write(xf, startrow + 1, startrow))
+    return True